@@ -0,0 +1,108 @@
+import html
+import re
+import threading
+from urllib.parse import parse_qs
+
+# 模擬 TMDB 的登入和編輯頁面，記錄每次提交的內容
+# 欄位 ID 和網址格式和 TMDBUploader / TMDBHttpUploader 使用的一樣
+EDIT_PATH = re.compile(r'^/(?P<media>tv|movie)/(?P<id>\d+)(?:/season/(?P<season>\d+))?(?:/episode/(?P<episode>\d+))?/edit$')
+# 季數頁面，列出該季已有翻譯的集數 (格式和 TMDB 的 episode_list 一樣)
+SEASON_PATH = re.compile(r'^/tv/(?P<id>\d+)/season/(?P<season>\d+)$')
+
+SESSION_COOKIE = 'tmdb_session=benchmark'
+
+class FakeTMDB:
+    # prefix 為伺服器上的路徑前綴，例如 /tmdb，TMDBUploader 的 base_url 即為 伺服器網址 + prefix
+    def __init__(self, prefix='', username='benchmark', password='benchmark'):
+        self.prefix = prefix
+        self.username = username
+        self.password = password
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.submissions = []
+        # 已提交的翻譯 {(media, id, season, episode): (title, overview)}
+        self.translations = {}
+
+    def reset(self):
+        with self.lock:
+            self.logins = 0
+            self.submissions = []
+            self.translations = {}
+
+    # 預先加入一套劇集所有集數的翻譯，模擬重新匯入 TMDB 上已經正確的劇集
+    def seed_episodes(self, tmdb_id, detail):
+        with self.lock:
+            for episode in detail.episodes:
+                key = ('tv', str(tmdb_id), episode.season_number, episode.episode_number)
+                self.translations[key] = (episode.title, episode.description)
+
+    def logged_in(self, headers):
+        return SESSION_COOKIE in (headers.get('Cookie') or '')
+
+    # 返回 (狀態碼, 額外標頭, 內容)
+    def handle_get(self, path, headers):
+        if path == '/login':
+            return 200, {}, (f'<html><body><form action="{self.prefix}/login" method="post">'
+                             '<input type="hidden" name="authenticity_token" value="benchmark">'
+                             '<input name="username"><input type="password" name="password">'
+                             '<input type="submit" value="Login"></form></body></html>')
+        if not self.logged_in(headers):
+            return 302, {'Location': f'{self.prefix}/login'}, ''
+        if path in ('', '/', '/settings/account'):
+            return 200, {}, '<html><body>TMDB</body></html>'
+        match = EDIT_PATH.match(path)
+        if match:
+            return 200, {}, self.edit_page(path, match)
+        match = SEASON_PATH.match(path)
+        if match:
+            return 200, {}, self.season_page(match.group('id'), int(match.group('season')))
+        return 404, {}, 'not found'
+
+    def handle_post(self, path, headers, body):
+        data = parse_qs(body)
+        if path == '/login':
+            if data.get('username') == [self.username] and data.get('password') == [self.password]:
+                with self.lock:
+                    self.logins += 1
+                return 302, {'Location': f'{self.prefix}/', 'Set-Cookie': f'{SESSION_COOKIE}; Path=/'}, ''
+            return self.handle_get('/login', headers)
+        match = EDIT_PATH.match(path)
+        if match and self.logged_in(headers):
+            key = self.item_key(match)
+            title = next((values[0] for name, values in data.items() if name.endswith('[name]')), '')
+            overview = next((values[0] for name, values in data.items() if name.endswith('[overview]')), '')
+            with self.lock:
+                self.submissions.append(key)
+                self.translations[key] = (title, overview)
+            # 和 TMDB 一樣提交後返回編輯頁面
+            return 302, {'Location': f'{self.prefix}{path}?language=zh-HK'}, ''
+        return 403, {}, 'forbidden'
+
+    @staticmethod
+    def item_key(match):
+        season = match.group('season')
+        episode = match.group('episode')
+        return (match.group('media'), match.group('id'), int(season) if season else None, int(episode) if episode else None)
+
+    def edit_page(self, path, match):
+        key = self.item_key(match)
+        title, overview = self.translations.get(key, ('', ''))
+        title_field_id = 'zh_HK_translated_title' if key[0] == 'movie' else 'zh_HK_name'
+        return ('<html><body>'
+                f'<form action="{html.escape(self.prefix + path)}" method="post">'
+                '<input type="hidden" name="_method" value="put"><input type="hidden" name="authenticity_token" value="benchmark">'
+                f'<input id="{title_field_id}" name="translations[zh-HK][name]" value="{html.escape(title)}">'
+                f'<textarea id="zh_HK_overview" name="translations[zh-HK][overview]">{html.escape(overview)}</textarea>'
+                '<input id="submit" type="submit" value="Save"></form></body></html>')
+
+    def season_page(self, tmdb_id, season_number):
+        with self.lock:
+            episodes = sorted((key[3], value) for key, value in self.translations.items()
+                              if key[:3] == ('tv', tmdb_id, season_number) and key[3] is not None)
+        cards = ''.join(
+            '<div class="card"><div class="info"><div class="episode_title">'
+            f'<span class="episode_number">{episode_number}</span>'
+            f'<h3><a href="{self.prefix}/tv/{tmdb_id}/season/{season_number}/episode/{episode_number}">{html.escape(title)}</a></h3>'
+            f'</div><div class="overview"><p>{html.escape(overview)}</p></div></div></div>'
+            for episode_number, (title, overview) in episodes)
+        return f'<html><body><div class="episode_list">{cards}</div></body></html>'
@@ -0,0 +1,136 @@
+import json
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from benchmarks.fixtures import (scenario_detail, scenario_for_id, load_recorded_fixture, netflix_page, appletv_page,
+                                 disneyplus_page, disneyplus_page_json, disneyplus_season_json, primevideo_page, SCENARIO_IDS)
+from benchmarks.fake_tmdb import FakeTMDB
+
+# 在本機提供各平台的標題頁和模擬的 TMDB，網址格式:
+#   /netflix/hk/title/<ID>
+#   /appletv/hk/show/<情境>/umc.cmc.<ID>
+#   /disneyplus/zh-hk/series/<情境>/<ID>       (API: /disneyplus/explore/v1/<ID>/...)
+#   /primevideo/detail/<ID>[/season/<季數>]
+#   /tmdb/...                                   (見 benchmarks/fake_tmdb.py)
+ROUTES = [
+    ('netflix', re.compile(r'^/netflix/hk/title/(?P<id>\d+)$')),
+    ('appletv', re.compile(r'^/appletv/hk/show/[^/]+/umc\.cmc\.(?P<id>\d+)$')),
+    ('disneyplus', re.compile(r'^/disneyplus/zh-hk/series/[^/]+/(?P<id>\d+)$')),
+    ('disneyplus_api', re.compile(r'^/disneyplus/explore/v1/(?P<id>\d+)/(?:page|season/(?P<season>\d+))$')),
+    ('primevideo', re.compile(r'^/primevideo/detail/(?P<id>\d+)(?:/season/(?P<season>\d+))?$')),
+]
+
+class FixtureServer:
+    def __init__(self, host='127.0.0.1', port=0):
+        self.tmdb = FakeTMDB('/tmdb')
+        self.lock = threading.Lock()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.count_request()
+                url = urlparse(self.path)
+                if url.path == '/tmdb' or url.path.startswith('/tmdb/'):
+                    self.reply(*server.tmdb.handle_get(url.path[len('/tmdb'):], self.headers))
+                else:
+                    self.reply(*server.handle_fixture(url.path, parse_qs(url.query), self.headers.get('Host')))
+
+            def do_POST(self):
+                server.count_request()
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+                if url.path.startswith('/tmdb/'):
+                    self.reply(*server.tmdb.handle_post(url.path[len('/tmdb'):], self.headers, body))
+                else:
+                    self.reply(405, {}, 'method not allowed')
+
+            def reply(self, status, headers, body):
+                content = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+                content_type = 'text/html; charset=utf-8' if isinstance(body, str) else 'application/json; charset=utf-8'
+                data = content.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.base_url = f'http://{host}:{self.httpd.server_port}'
+        self.thread = None
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # 各平台的標題頁網址
+    def title_url(self, platform, scenario):
+        video_id = SCENARIO_IDS[scenario]
+        return {
+            'netflix': f'{self.base_url}/netflix/hk/title/{video_id}',
+            'appletv': f'{self.base_url}/appletv/hk/show/{scenario}/umc.cmc.{video_id}',
+            'disneyplus': f'{self.base_url}/disneyplus/zh-hk/series/{scenario}/{video_id}',
+            'primevideo': f'{self.base_url}/primevideo/detail/{video_id}',
+        }[platform]
+
+    def handle_fixture(self, path, query, host):
+        for platform, pattern in ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+            scenario = scenario_for_id(match.group('id'))
+            if scenario is None:
+                return 404, {}, 'unknown title'
+            detail = scenario_detail(scenario)
+            if platform == 'disneyplus_api':
+                if match.group('season') is None:
+                    return 200, {}, disneyplus_page_json(detail)
+                offset = int(query.get('offset', ['0'])[0])
+                return 200, {}, disneyplus_season_json(detail, int(match.group('season')), offset)
+
+            recorded = load_recorded_fixture(platform, scenario)
+            if recorded is not None:
+                return 200, {}, recorded
+            page_url = f'http://{host}{path}'
+            if platform == 'netflix':
+                return 200, {}, netflix_page(detail)
+            if platform == 'appletv':
+                return 200, {}, appletv_page(detail, page_url)
+            if platform == 'disneyplus':
+                return 200, {}, disneyplus_page(detail, f'http://{host}/disneyplus/explore/v1/{match.group("id")}')
+            if platform == 'primevideo':
+                season = int(match.group('season') or 1)
+                base_page_url = f'http://{host}/primevideo/detail/{match.group("id")}'
+                return 200, {}, primevideo_page(detail, base_page_url, season)
+        return 404, {}, 'not found'
+
+# 啟動伺服器讓用家在瀏覽器查看頁面
+# python -m benchmarks.fixture_server
+if __name__ == "__main__":
+    with FixtureServer(port=8765) as fixture_server:
+        for platform in ('netflix', 'appletv', 'disneyplus', 'primevideo'):
+            for scenario in SCENARIO_IDS:
+                print(fixture_server.title_url(platform, scenario))
+        print(f"TMDB: {fixture_server.base_url}/tmdb/login")
+        input("按 Enter 停止伺服器...")
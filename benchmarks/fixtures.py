@@ -0,0 +1,222 @@
+import html
+import json
+import os
+from others.video_models import VideoDetail, Season, Episode
+
+# 基準測試的情境：(季數, 每季集數)，季數為 0 即電影
+SCENARIOS = {
+    'movie': (0, 0),
+    'one_season': (1, 12),
+    'ten_seasons': (10, 50),
+}
+
+# 每個情境在各平台使用的影片 ID
+SCENARIO_IDS = {
+    'movie': '81000001',
+    'one_season': '81000002',
+    'ten_seasons': '81000003',
+}
+
+# 如果 benchmarks/fixtures/<平台>/<情境>.html 存在 (例如從真實網站保存的頁面)，會使用該檔案代替產生的頁面
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Disney+ API 每次返回的集數，和網站一樣需要滾動才會載入下一頁
+DISNEYPLUS_PAGE_SIZE = 15
+
+def scenario_for_id(video_id):
+    return next((name for name, scenario_id in SCENARIO_IDS.items() if scenario_id == video_id), None)
+
+# 每個情境應該抓取到的資料，頁面由這份資料產生，亦用來檢查抓取結果是否正確
+def scenario_detail(scenario):
+    season_count, episode_count = SCENARIOS[scenario]
+    if season_count == 0:
+        return VideoDetail('基準測試電影', '電影的簡介。', True)
+    detail = VideoDetail('基準測試劇集', '劇集的簡介。', False)
+    for season_number in range(1, season_count + 1):
+        detail.seasons.append(Season(f'第 {season_number} 季', season_number, f'第 {season_number} 季的簡介。'))
+        for episode_number in range(1, episode_count + 1):
+            detail.episodes.append(Episode(season_number, episode_number, f'標題 {season_number}-{episode_number}',
+                                           f'第 {season_number} 季第 {episode_number} 集的簡介。'))
+    return detail
+
+def load_recorded_fixture(platform, scenario):
+    path = os.path.join(FIXTURES_DIR, platform, f'{scenario}.html')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as fixture_file:
+            return fixture_file.read()
+    return None
+
+def episodes_of(detail, season_number):
+    return [episode for episode in detail.episodes if episode.season_number == season_number]
+
+def script_json(data):
+    # 避免 JSON 內的 </script> 提早結束 script 標籤
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+def netflix_page(detail):
+    e = html.escape
+    parts = [f'<html><head><meta charset="utf-8"></head><body><h1 class="title-title">{e(detail.title)}</h1>',
+             f'<div class="title-info-synopsis">{e(detail.description)}</div>']
+    if not detail.is_movie:
+        parts.append('<select data-uia="season-selector">' + ''.join(f'<option>{e(s.name)}</option>' for s in detail.seasons) + '</select>')
+        parts.append('<div class="episode-metadata"></div>')
+        for season in detail.seasons:
+            parts.append(f'<div class="season"><p class="season-synopsis">{e(season.description)}</p><ol>')
+            for episode in episodes_of(detail, season.number):
+                parts.append(f'<li class="episode"><h3>第 {episode.episode_number} 集。{e(episode.title)}</h3><p>{e(episode.description)}</p></li>')
+            parts.append('</ol></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+# 首頁只顯示第一季的第一頁集數，所有集數放在頁面內嵌的 serialized-server-data
+def appletv_page(detail, page_url):
+    e = html.escape
+    breadcrumb = {'itemListElement': [{'item': {'name': 'Apple TV+'}}, {'item': {'name': detail.title}}]}
+    parts = [f'<html><head><meta charset="utf-8"><script id="schema:breadcrumb-list" type="application/ld+json">{script_json(breadcrumb)}</script></head><body>',
+             f'<div class="product-header__content__details__synopsis">{e(detail.description)}</div>']
+    if not detail.is_movie:
+        season_summaries = [{'title': season.name, 'seasonNumber': season.number, 'url': f'{page_url}?season={season.number}'} for season in detail.seasons]
+        episodes = [{'id': f'umc.cmc.ep{episode.season_number}x{episode.episode_number}', 'seasonNumber': episode.season_number,
+                     'episodeNumber': episode.episode_number, 'title': episode.title, 'description': episode.description}
+                    for episode in detail.episodes]
+        server_data = [{'data': {'seasonSummaries': season_summaries, 'selectedEpisodeIndex': 0, 'shelves': [{'items': episodes}]}}]
+        parts.append(f'<script type="application/json" id="serialized-server-data">{script_json(server_data)}</script>')
+        parts.append('<div class="shelf-grid">')
+        for episode in episodes_of(detail, detail.seasons[0].number)[:10]:
+            parts.append('<div class="episode-lockup__content">'
+                         f'<div class="episode-lockup__content__episode-number"><span>第 {episode.episode_number}集</span></div>'
+                         f'<div class="typ-subhead text-truncate episode-lockup__content__title">{e(episode.title)}</div>'
+                         f'<div class="episode-lockup__description clr-secondary-text">{e(episode.description)}</div></div>')
+        parts.append('</div><button class="shelf-grid-nav__arrow shelf-grid-nav__arrow--next" disabled>›</button>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+# 集數由網頁的 JavaScript 向 /explore/ API 取得後顯示，和真實網站一樣需要選擇季數和滾動載入
+DISNEYPLUS_SCRIPT = '''
+const apiBase = %s;
+let currentSeason = 0, nextOffset = 0, hasMore = false, loading = false;
+function render(items, append) {
+    const list = document.getElementById('episodes');
+    if (!append) list.innerHTML = '';
+    for (const item of items) {
+        const v = item.visuals;
+        const div = document.createElement('div');
+        div.setAttribute('data-testid', 'set-item');
+        div.style.height = '120px';
+        div.innerHTML = '<div data-testid="standard-regular-list-item-title"></div><div data-testid="standard-regular-list-item-description"></div>';
+        div.children[0].textContent = v.episodeNumber + '. ' + v.episodeTitle;
+        div.children[1].textContent = v.description.medium;
+        list.appendChild(div);
+    }
+}
+function loadSeason(seasonNumber, offset) {
+    loading = true;
+    fetch(apiBase + '/season/' + seasonNumber + '?offset=' + offset).then(r => r.json()).then(data => {
+        const season = data.data.season;
+        currentSeason = seasonNumber;
+        nextOffset = offset + season.items.length;
+        hasMore = season.pagination.hasMore;
+        render(season.items, offset > 0);
+        loading = false;
+    });
+}
+document.querySelector('[aria-controls="episodes"]')?.addEventListener('click', () => {
+    document.getElementById('episodes-panel').style.display = 'block';
+    loadSeason(1, 0);
+});
+document.querySelector('[aria-controls="details"]').addEventListener('click', () => {
+    document.getElementById('details-panel').style.display = 'block';
+});
+const dropdown = document.querySelector('[data-testid="dropdown-button"]:not([disabled])');
+if (dropdown) {
+    dropdown.addEventListener('click', () => {
+        const list = document.querySelector('[data-testid="dropdown-list"]');
+        list.style.display = list.style.display === 'none' ? 'block' : 'none';
+    });
+    document.querySelectorAll('[data-testid="dropdown-list"] li').forEach((li, index) => li.addEventListener('click', () => {
+        document.querySelector('[data-testid="dropdown-list"]').style.display = 'none';
+        dropdown.textContent = li.textContent;
+        loadSeason(index + 1, 0);
+    }));
+}
+window.addEventListener('scroll', () => {
+    if (hasMore && !loading && window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {
+        loadSeason(currentSeason, nextOffset);
+    }
+});
+fetch(apiBase + '/page').then(r => r.json());
+'''
+
+def disneyplus_page(detail, api_base):
+    e = html.escape
+    parts = ['<html><head><meta charset="utf-8"></head><body><ul>',
+             '<li data-testid="details-page-tab" aria-controls="details">簡介</li>']
+    if not detail.is_movie:
+        parts.append('<li data-testid="details-page-tab" aria-controls="episodes">集數</li>')
+    parts.append('</ul><div id="details-panel" style="display:none">'
+                 f'<h2 data-testid="details-tab-title">{e(detail.title)}</h2>'
+                 f'<p data-testid="details-tab-description">{e(detail.description)} 部分閃光片段或圖案可能會影響對光敏感的觀眾。</p></div>')
+    if not detail.is_movie:
+        parts.append('<div id="episodes-panel" style="display:none">')
+        if len(detail.seasons) > 1:
+            parts.append(f'<button data-testid="dropdown-button">{e(detail.seasons[0].name)}</button><ul data-testid="dropdown-list" style="display:none">')
+            parts += [f'<li>{e(season.name)}</li>' for season in detail.seasons]
+            parts.append('</ul>')
+        else:
+            parts.append(f'<button data-testid="dropdown-button" disabled><span>{e(detail.seasons[0].name)}</span></button>')
+        parts.append('<div id="episodes"></div></div>')
+    parts.append(f'<script>{DISNEYPLUS_SCRIPT % json.dumps(api_base)}</script></body></html>')
+    return ''.join(parts)
+
+def disneyplus_page_json(detail):
+    return {'data': {'page': {'containers': [{'type': 'episodes', 'seasons': [
+        {'type': 'season', 'id': f'season-{season.number}', 'visuals': {'name': season.name}} for season in detail.seasons]}]}}}
+
+def disneyplus_season_json(detail, season_number, offset):
+    season_episodes = episodes_of(detail, season_number)
+    page = season_episodes[offset:offset + DISNEYPLUS_PAGE_SIZE]
+    items = [{'type': 'episode', 'visuals': {'seasonNumber': episode.season_number, 'episodeNumber': episode.episode_number,
+                                             'episodeTitle': episode.title, 'description': {'medium': episode.description, 'full': episode.description}}}
+             for episode in page]
+    return {'data': {'season': {'items': items, 'pagination': {'hasMore': offset + len(page) < len(season_episodes)}}}}
+
+# 每一季是獨立的頁面，季數選單是指向各季頁面的連結
+def primevideo_page(detail, page_url, season_number=1):
+    e = html.escape
+    parts = ['<html><head><meta charset="utf-8"></head><body><span class="QDmWMz">ZH</span>',
+             f'<h1 data-automation-id="title">{e(detail.title)}</h1>']
+    if detail.is_movie:
+        parts.append(f'<span class="_1H6ABQ">{e(detail.description)}</span></body></html>')
+        return ''.join(parts)
+    season = detail.seasons[season_number - 1]
+    parts.append(f'<span class="_1H6ABQ">{e(detail.description if season_number == 1 else season.description)}</span>')
+    parts.append(f'<span class="_36qUej">{e(season.name)}</span>')
+    if len(detail.seasons) > 1:
+        parts.append('<div class="_3R4jka"><ul>' + ''.join(f'<li><a href="{e(page_url)}/season/{s.number}">{e(s.name)}</a></li>' for s in detail.seasons) + '</ul></div>')
+    parts.append('<div id="tab-content-episodes"><button data-testid="btf-episodes-tab">劇集</button><ul>')
+    for episode in episodes_of(detail, season_number):
+        parts.append(f'<li id="av-ep-episodes-{episode.episode_number}"><span class="_36qUej">第 {season_number} 季第 {episode.episode_number} 集{episode.episode_number}</span>'
+                     f'<span class="P1uAb6">{e(episode.title)}</span><div class="_3qsVvm e8yjMf"><div dir="auto">{e(episode.description)}</div></div></li>')
+    parts.append('</ul></div></body></html>')
+    return ''.join(parts)
+
+# 將產生的頁面寫到指定的資料夾方便檢查，改為真實網站保存的頁面後可以複製到 benchmarks/fixtures 使用
+# python -m benchmarks.fixtures [資料夾]
+if __name__ == "__main__":
+    import sys
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else 'benchmark_fixtures'
+    for scenario in SCENARIOS:
+        detail = scenario_detail(scenario)
+        video_id = SCENARIO_IDS[scenario]
+        pages = {
+            'netflix': netflix_page(detail),
+            'appletv': appletv_page(detail, f'/appletv/hk/show/{scenario}/umc.cmc.{video_id}'),
+            'disneyplus': disneyplus_page(detail, f'/disneyplus/explore/v1/{video_id}'),
+            'primevideo': primevideo_page(detail, f'/primevideo/detail/{video_id}'),
+        }
+        for platform, page in pages.items():
+            os.makedirs(os.path.join(output_dir, platform), exist_ok=True)
+            path = os.path.join(output_dir, platform, f'{scenario}.html')
+            with open(path, 'w', encoding='utf-8') as fixture_file:
+                fixture_file.write(page)
+            print(path)
@@ -0,0 +1,90 @@
+import threading
+import time
+from contextlib import contextmanager
+from selenium.webdriver.remote.command import Command
+
+# 計算一次執行內的 WebDriver 指令、頁面載入、HTTP 請求和 sleep 時間
+# WebDriverWait 輪詢時亦是調用 time.sleep，所以 sleep 時間包括所有等待
+class RunCounters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = 0
+        self.command_seconds = 0.0
+        self.page_loads = 0
+        self.http_requests = 0
+        self.sleeps = 0
+        self.sleep_seconds = 0.0
+
+    def as_dict(self):
+        return {'commands': self.commands, 'command_seconds': round(self.command_seconds, 3),
+                'page_loads': self.page_loads, 'http_requests': self.http_requests,
+                'sleeps': self.sleeps, 'sleep_seconds': round(self.sleep_seconds, 3)}
+
+@contextmanager
+def instrument(drivers=()):
+    counters = RunCounters()
+    original_sleep = time.sleep
+
+    def counting_sleep(seconds):
+        with counters.lock:
+            counters.sleeps += 1
+            counters.sleep_seconds += seconds
+        original_sleep(seconds)
+
+    def wrap_driver(driver):
+        original_execute = driver.execute
+
+        # 所有 WebDriver 指令 (包括元素的 find_element、text 等) 都經 driver.execute 發出
+        def counting_execute(driver_command, params=None):
+            start_time = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                with counters.lock:
+                    counters.commands += 1
+                    counters.command_seconds += time.perf_counter() - start_time
+                    if driver_command == Command.GET:
+                        counters.page_loads += 1
+
+        driver.execute = counting_execute
+
+    patched_http = []
+    try:
+        import requests
+        original_request = requests.Session.request
+
+        def counting_request(session, method, url, *args, **kwargs):
+            with counters.lock:
+                counters.http_requests += 1
+            return original_request(session, method, url, *args, **kwargs)
+
+        requests.Session.request = counting_request
+        patched_http.append((requests.Session, 'request', original_request))
+    except ImportError:
+        pass
+    try:
+        import httpx
+        original_send = httpx.AsyncClient.send
+
+        async def counting_send(client, request, *args, **kwargs):
+            with counters.lock:
+                counters.http_requests += 1
+            return await original_send(client, request, *args, **kwargs)
+
+        httpx.AsyncClient.send = counting_send
+        patched_http.append((httpx.AsyncClient, 'send', original_send))
+    except ImportError:
+        pass
+
+    time.sleep = counting_sleep
+    for driver in drivers:
+        wrap_driver(driver)
+    try:
+        yield counters
+    finally:
+        time.sleep = original_sleep
+        for driver in drivers:
+            if 'execute' in vars(driver):
+                del driver.execute
+        for owner, name, original in patched_http:
+            setattr(owner, name, original)
@@ -0,0 +1,51 @@
+import argparse
+import logging
+import time
+from benchmarks.fixtures import SCENARIOS, scenario_detail, load_recorded_fixture, netflix_page
+from extractors.page_snapshot import PageSnapshot, HTML_PARSER
+from extractors.netflix_extractor import parse_title_page, NETFLIX_PARSE_TARGETS
+
+# Netflix 標題頁解析的微基準測試：比較整頁 html.parser (舊做法)、整頁 lxml 及只解析需要部分的 lxml
+# 有 benchmarks/fixtures/netflix/<情境>.html (從真實網站保存的頁面) 時使用該頁面，否則使用產生的頁面
+# python -m benchmarks.parse_benchmark --scenarios ten_seasons --repeat 20
+
+VARIANTS = [
+    ('html.parser', 'html.parser', None),
+    (f'{HTML_PARSER}', HTML_PARSER, None),
+    (f'{HTML_PARSER}+targets', HTML_PARSER, NETFLIX_PARSE_TARGETS),
+]
+
+def parse_once(html, parser, parse_targets):
+    snapshot = PageSnapshot(html, parse_targets=parse_targets, parser=parser)
+    start_time = time.perf_counter()
+    detail = parse_title_page(snapshot)
+    return time.perf_counter() - start_time, detail
+
+def run(scenarios, repeat):
+    print(f"{'情境':<13}{'頁面(KB)':>9}  {'解析方式':<22}{'中位數(毫秒)':>12}{'倍數':>8}")
+    for scenario in scenarios:
+        html = load_recorded_fixture('netflix', scenario) or netflix_page(scenario_detail(scenario))
+        baseline_seconds = None
+        expected = None
+        for label, parser, parse_targets in VARIANTS:
+            timings = []
+            for _ in range(repeat):
+                seconds, detail = parse_once(html, parser, parse_targets)
+                timings.append(seconds)
+            timings.sort()
+            median = timings[len(timings) // 2]
+            if baseline_seconds is None:
+                baseline_seconds, expected = median, detail
+            status = '' if detail == expected else '  結果不同!'
+            print(f"{scenario:<13}{len(html.encode('utf-8')) / 1024:>9.0f}  {label:<22}{median * 1000:>12.2f}{baseline_seconds / median:>7.1f}x{status}")
+
+def main(argv=None):
+    logging.getLogger().setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Netflix 標題頁解析的微基準測試")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=10, help="每種解析方式執行的次數，取中位數 (預設 10)")
+    args = parser.parse_args(argv)
+    run(args.scenarios, max(1, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.fixtures import SCENARIOS, SCENARIO_IDS, scenario_detail
+from benchmarks.instrumentation import instrument
+from others.metrics import METRICS
+
+# 離線基準測試：在本機伺服器上執行各個 extractor 和 TMDB 上載，記錄時間和次數，並可以和基準比較
+# python -m benchmarks.run                                   執行所有測試
+# python -m benchmarks.run --save-baseline baseline.json     保存結果作為基準
+# python -m benchmarks.run --baseline baseline.json          和基準比較，變慢會返回 exit code 1
+
+EXTRACT_TARGETS = ['netflix', 'netflix_http', 'appletv', 'disneyplus', 'primevideo']
+# tmdb_reimport 模擬重新匯入 TMDB 上所有集數已經正確的劇集 (HTTP 上載)，集數應全部跳過
+UPLOAD_TARGETS = ['tmdb_browser', 'tmdb_http', 'tmdb_reimport']
+BROWSER_TARGETS = {'netflix', 'appletv', 'disneyplus', 'primevideo', 'tmdb_browser'}
+# 由啟動 tmdb_importer.py 至顯示第一個問題的時間，和情境無關
+STARTUP_TARGET = 'startup'
+STARTUP_SCENARIO = 'first_prompt'
+HEAVY_MODULES = ['selenium', 'pandas', 'bs4', 'httpx', 'requests']
+
+# 在子程序執行互動模式，第一次調用 input 時列出已載入的重型模組並立即結束
+STARTUP_SCRIPT = f'''
+import builtins, os, sys
+def first_prompt(prompt=''):
+    loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+    sys.stdout.write('FIRST_PROMPT ' + ','.join(loaded) + '\\n')
+    sys.stdout.flush()
+    os._exit(0)
+builtins.input = first_prompt
+import tmdb_importer
+tmdb_importer.main(tmdb_importer.parse_args(['--metrics-dir', '']))
+'''
+
+# 比較基準時容許的差距：次數多於基準的 20% 或時間多於基準的 25% (再加 0.5 秒) 即視為退步
+COUNT_TOLERANCE = 0.2
+TIME_TOLERANCE = 0.25
+TIME_SLACK = 0.5
+COMPARED_COUNTS = ['page_loads', 'commands', 'http_requests']
+
+def detail_signature(detail):
+    return (detail.is_movie, detail.title, len(detail.seasons),
+            [(episode.season_number, episode.episode_number, episode.title) for episode in detail.episodes])
+
+def tmdb_url(server, scenario):
+    media_type = 'movie' if scenario_detail(scenario).is_movie else 'tv'
+    return f'{server.base_url}/tmdb/{media_type}/{SCENARIO_IDS[scenario]}'
+
+def expected_submissions(detail, target=None):
+    if detail.is_movie:
+        return 1
+    return 1 + len(detail.seasons) + (0 if target == 'tmdb_reimport' else len(detail.episodes))
+
+def run_extract(target, scenario, server, driver):
+    from extractors.netflix_extractor import extract_netflix_episodes
+    from extractors.netflix_http import extract_netflix_episodes_http
+    from extractors.appletv_extractor import extract_appletv_data
+    from extractors.disneyplus_extractor import extract_disneyplus_data
+    from extractors.primevideo_extractor import extract_primevideo_data
+    netflix_base_url = f'{server.base_url}/netflix'
+    if target == 'netflix':
+        return extract_netflix_episodes(driver, server.title_url('netflix', scenario), base_url=netflix_base_url)
+    if target == 'netflix_http':
+        return extract_netflix_episodes_http(server.title_url('netflix', scenario), netflix_base_url)
+    extractor = {'appletv': extract_appletv_data, 'disneyplus': extract_disneyplus_data, 'primevideo': extract_primevideo_data}[target]
+    return extractor(driver, server.title_url(target, scenario))
+
+def run_upload(target, scenario, server, driver):
+    from importors.tmdb_uploader import TMDBUploader
+    from importors.tmdb_http_uploader import TMDBHttpUploader
+    detail = scenario_detail(scenario)
+    base_url = f'{server.base_url}/tmdb'
+    if target in ('tmdb_http', 'tmdb_reimport'):
+        uploader = TMDBHttpUploader(server.tmdb.username, server.tmdb.password, base_url=base_url)
+    else:
+        # 每次重新登入，和每次啟動程式的情況一樣
+        driver.delete_all_cookies()
+        uploader = TMDBUploader(driver, server.tmdb.username, server.tmdb.password, base_url=base_url)
+    uploader.upload_to_tmdb(tmdb_url(server, scenario), detail, detail.is_movie)
+    if target in ('tmdb_http', 'tmdb_reimport'):
+        uploader.close()
+
+def run_case(target, scenario, server, driver):
+    drivers = [driver] if target in BROWSER_TARGETS else []
+    server.tmdb.reset()
+    if target == 'tmdb_reimport' and not scenario_detail(scenario).is_movie:
+        server.tmdb.seed_episodes(SCENARIO_IDS[scenario], scenario_detail(scenario))
+    METRICS.reset()
+    error = ''
+    with instrument(drivers) as counters:
+        start_time = time.perf_counter()
+        try:
+            if target in UPLOAD_TARGETS:
+                run_upload(target, scenario, server, driver)
+            else:
+                result = run_extract(target, scenario, server, driver)
+        except Exception as e:
+            error = str(e)
+        wall_seconds = time.perf_counter() - start_time
+
+    expected = scenario_detail(scenario)
+    if error:
+        ok = False
+    elif target in UPLOAD_TARGETS:
+        ok = len(server.tmdb.submissions) == expected_submissions(expected, target)
+        if not ok:
+            error = f"提交了 {len(server.tmdb.submissions)} 項，應為 {expected_submissions(expected, target)} 項"
+    else:
+        ok = result is not None and detail_signature(result) == detail_signature(expected)
+        if not ok:
+            error = "抓取結果和 fixture 不符"
+    # 各階段的耗時 (others.metrics 記錄)，階段之間可能重疊，例如 tmdb_submit 包括其中的 wait
+    phases = {name: round(seconds, 3) for (_, name), (_, seconds) in METRICS.totals(by_title=False).items()}
+    return dict(target=target, scenario=scenario, ok=ok, error=error, wall_seconds=round(wall_seconds, 3), **counters.as_dict(), phases=phases)
+
+# 在空白的工作目錄執行 (不讀取 configs.json)，耗時包括 Python 本身的啟動時間
+def run_startup():
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_root, os.environ.get('PYTHONPATH')])))
+    error = ''
+    loaded = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        start_time = time.perf_counter()
+        try:
+            completed = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=work_dir, env=env, capture_output=True, text=True, timeout=120)
+            wall_seconds = time.perf_counter() - start_time
+            marker = next((line for line in completed.stdout.splitlines() if line.startswith('FIRST_PROMPT')), None)
+            if marker is None:
+                error = (completed.stderr.strip().splitlines() or ["沒有顯示問題"])[-1]
+            else:
+                loaded = [name for name in marker[len('FIRST_PROMPT'):].strip().split(',') if name]
+        except subprocess.TimeoutExpired:
+            wall_seconds = time.perf_counter() - start_time
+            error = "等待第一個問題逾時"
+    return dict(target=STARTUP_TARGET, scenario=STARTUP_SCENARIO, ok=not error, error=error, wall_seconds=round(wall_seconds, 3),
+                commands=0, command_seconds=0.0, page_loads=0, http_requests=0, sleeps=0, sleep_seconds=0.0,
+                phases={}, loaded_modules=loaded)
+
+def median_run(runs):
+    # 取耗時的中位數那一次
+    runs.sort(key=lambda run: run['wall_seconds'])
+    result = runs[len(runs) // 2]
+    result['ok'] = all(run['ok'] for run in runs)
+    return result
+
+def run_benchmarks(targets, scenarios, repeat=1, headless=True, show_phases=False):
+    from others.browser_profile import load_browser_profile, create_driver
+    results = []
+    driver = None
+    with FixtureServer() as server:
+        if any(target in BROWSER_TARGETS for target in targets):
+            try:
+                driver = create_driver(load_browser_profile({'browser': {'headless': headless}}))
+            except Exception as e:
+                logging.error(f"無法開啟 Chrome，略過需要瀏覽器的測試: {e}")
+                targets = [target for target in targets if target not in BROWSER_TARGETS]
+        try:
+            for target in targets:
+                if target == STARTUP_TARGET:
+                    result = median_run([run_startup() for _ in range(repeat)])
+                    results.append(result)
+                    print_result(result, show_phases)
+                    continue
+                for scenario in scenarios:
+                    result = median_run([run_case(target, scenario, server, driver) for _ in range(repeat)])
+                    results.append(result)
+                    print_result(result, show_phases)
+        finally:
+            if driver is not None:
+                driver.quit()
+    return results
+
+def print_header():
+    print(f"{'測試':<14}{'情境':<13}{'結果':<6}{'耗時(秒)':>9}{'頁面載入':>9}{'WebDriver指令':>14}{'HTTP請求':>9}{'sleep(秒)':>10}")
+
+def print_result(result, show_phases=False):
+    status = "OK" if result['ok'] else "錯誤"
+    print(f"{result['target']:<14}{result['scenario']:<13}{status:<6}{result['wall_seconds']:>9.2f}{result['page_loads']:>9}"
+          f"{result['commands']:>14}{result['http_requests']:>9}{result['sleep_seconds']:>10.2f}")
+    if result['error']:
+        print(f"{'':<14}{result['error']}")
+    if result.get('loaded_modules'):
+        print(f"{'':<14}顯示問題前已載入: {', '.join(result['loaded_modules'])}")
+    if show_phases:
+        for name, seconds in sorted(result['phases'].items(), key=lambda item: -item[1]):
+            print(f"{'':<14}{name:<26}{seconds:>9.2f}")
+
+# 返回所有比基準差的項目
+def compare_with_baseline(results, baseline):
+    baseline_by_case = {(result['target'], result['scenario']): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_case.get((result['target'], result['scenario']))
+        if base is None:
+            continue
+        case = f"{result['target']}/{result['scenario']}"
+        if base['ok'] and not result['ok']:
+            regressions.append(f"{case}: 結果錯誤 ({result['error']})")
+        for counter in COMPARED_COUNTS:
+            if result[counter] > base[counter] * (1 + COUNT_TOLERANCE) and result[counter] > base[counter] + 1:
+                regressions.append(f"{case}: {counter} {base[counter]} -> {result[counter]}")
+        if result['wall_seconds'] > base['wall_seconds'] * (1 + TIME_TOLERANCE) + TIME_SLACK:
+            regressions.append(f"{case}: 耗時 {base['wall_seconds']:.2f} -> {result['wall_seconds']:.2f} 秒")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="離線基準測試")
+    parser.add_argument('--targets', nargs='+', choices=[STARTUP_TARGET] + EXTRACT_TARGETS + UPLOAD_TARGETS, default=[STARTUP_TARGET] + EXTRACT_TARGETS + UPLOAD_TARGETS)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=1, help="每個測試執行的次數，取耗時的中位數 (預設 1)")
+    parser.add_argument('--show-browser', action='store_true', help="顯示 Chrome 視窗")
+    parser.add_argument('--phases', action='store_true', help="列出每個測試各階段的耗時")
+    parser.add_argument('--output', help="將結果寫成 JSON")
+    parser.add_argument('--save-baseline', metavar='PATH', help="將結果保存為基準")
+    parser.add_argument('--baseline', metavar='PATH', help="和基準比較，有退步時返回 exit code 1")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    print_header()
+    results = run_benchmarks(args.targets, args.scenarios, max(1, args.repeat), headless=not args.show_browser, show_phases=args.phases)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as output_file:
+                json.dump(results, output_file, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            regressions = compare_with_baseline(results, json.load(baseline_file))
+        if regressions:
+            print("\n比基準差的項目:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\n沒有比基準差的項目")
+    return 0 if all(result['ok'] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
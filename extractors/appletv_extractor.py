@@ -1,132 +1,216 @@
-import time
-import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from bs4 import BeautifulSoup
 import json
 import re
 import logging
-
-# 設置日誌
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-def extract_appletv_data(driver, url, output_path):
-    driver.get(url)
-    time.sleep(1)  # 等待頁面加載
-
+from others.wait_utils import wait_for_page_ready, wait_for_element, wait_for_clickable, wait_quietly
+from others.browser_profile import apply_site_profile
+from others.video_models import VideoDetail, Season, Episode
+from others.excel_export import save_video_detail
+from others.metrics import timed
+from extractors.dom_batch import extract_page, extract_texts
+
+# 逐頁抓取時每頁用一次 extract_page 讀取所有集數和下一頁按鈕 (見 extractors.dom_batch)
+EPISODE_PAGE_SELECTORS = {
+    'episodes': {'items': '.episode-lockup__content',
+                 'fields': {'title': '.typ-subhead.text-truncate.episode-lockup__content__title',
+                            'number': '.episode-lockup__content__episode-number span',
+                            'description': '.episode-lockup__description.clr-secondary-text'}},
+    'next_buttons': {'items': 'button.shelf-grid-nav__arrow.shelf-grid-nav__arrow--next',
+                     'fields': {'disabled': (None, 'disabled'), 'aria_disabled': (None, 'aria-disabled')}},
+}
+
+# output_path 不為 None 時會另外將資料儲存成 Excel
+def extract_appletv_data(driver, url, output_path=None):
+    detail = VideoDetail()
     try:
-        # 提取劇名
-        title_tag = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'script#schema\\:breadcrumb-list')))
-        title_json = json.loads(title_tag.get_attribute('innerHTML'))
-        tv_show_title = title_json['itemListElement'][-1]['item']['name']
-
-        # 提取簡介
-        description_tag = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.product-header__content__details__synopsis')))
-        tv_show_description = description_tag.text.strip()
-
-        logging.info(f"劇集名稱: {tv_show_title}")
-        logging.info(f"劇集簡介: {tv_show_description}")
-
-        # 檢查是否為電影
-        if not driver.find_elements(By.CSS_SELECTOR, '.episode-lockup__content'):
-            save_movie_info_to_excel(tv_show_title, tv_show_description, output_path)
-            logging.info("識別為電影，已保存到 Movie 頁面")
-            return
-
-        # 提取季數信息
-        page_source = driver.page_source
-        season_data_match = re.search(r'"seasonSummaries":\[(.*?)\],"selectedEpisodeIndex"', page_source)
-        if season_data_match:
-            season_data_json = '[' + season_data_match.group(1).replace('},{', '}|{') + ']'
-            season_data_json = season_data_json.replace('|', ',')
-            season_data = json.loads(season_data_json)
-        else:
-            season_data = []
-
-        seasons = []
-        all_episodes = []
-        seen_titles = set()  # 存儲已抓取的集數標題，避免重複
-        current_episode_number = 0
-
-        for season in season_data:
-            season_name = season['title']
-            season_number = season['seasonNumber']
-            seasons.append((season_name, season_number, ""))  # 目前沒有季數簡介
-
-            logging.info(f"季數: {season_name} (第 {season_number} 季)")
-
-            # 抓取每季的集數信息
-            while True:
-                try:
-                    episodes = driver.find_elements(By.CSS_SELECTOR, '.episode-lockup__content')
-                    for episode in episodes:
-                        try:
-                            title = episode.find_element(By.CSS_SELECTOR, '.typ-subhead.text-truncate.episode-lockup__content__title').text
-                            if title not in seen_titles:
-                                episode_number_text = episode.find_element(By.CSS_SELECTOR, '.episode-lockup__content__episode-number span').text.strip()
-                                episode_number = int(episode_number_text.split(" ")[1].strip("集"))
-
-                                if episode_number < current_episode_number:
-                                    # 假定這是新的季數
-                                    season_number += 1
-
-                                current_episode_number = episode_number
-
-                                description = episode.find_element(By.CSS_SELECTOR, '.episode-lockup__description.clr-secondary-text').text
-                                all_episodes.append((season_number, episode_number, title, description))
-                                seen_titles.add(title)
-
-                                logging.info(f"  集數: {episode_number_text} - 標題: {title}")
-                                logging.info(f"    簡介: {description}")
-                        except Exception as e:
-                            logging.error(f"抓取集數資料時發生錯誤: {e}")
-
-                    # 查找“下一頁”按鈕並點擊
-                    next_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.shelf-grid-nav__arrow.shelf-grid-nav__arrow--next'))
-                    )
-                    next_button.click()
-                    time.sleep(1)  # 等待新內容加載
-
-                except Exception as e:
-                    logging.info(f"沒有更多頁面或發生錯誤: {e}")
-                    break
-
-        logging.info(f"所有集數信息: {all_episodes}")
-
-        # 保存到 Excel
-        save_to_excel(tv_show_title, tv_show_description, seasons, all_episodes, output_path)
-
+        scrape_appletv_data(driver, url, detail)
     except Exception as e:
         logging.error(f"抓取 Apple TV 資料時發生錯誤: {e}")
 
-def save_movie_info_to_excel(movie_title, movie_description, output_path):
-    movie_data = {'Movie Title': [movie_title], 'Movie Description': [movie_description]}
-    movie_df = pd.DataFrame(movie_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        movie_df.to_excel(writer, sheet_name='Movie', index=False)
-
-def save_to_excel(tv_show_title, tv_show_description, seasons, episodes, output_path):
-    # 保存劇集信息到 Title
-    title_data = {'TV Show Title': [tv_show_title], 'TV Show Description': [tv_show_description]}
-    title_df = pd.DataFrame(title_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        title_df.to_excel(writer, sheet_name='Title', index=False)
-
-    # 保存季數信息到 Seasons
-    seasons_df = pd.DataFrame(seasons, columns=['Season Name', 'Season Number', 'Season Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        seasons_df.to_excel(writer, sheet_name='Seasons', index=False)
+    if output_path:
+        save_video_detail(detail, output_path)
+    return detail
 
-    # 保存集數信息到 Episodes
-    episodes_df = pd.DataFrame(episodes, columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        episodes_df.to_excel(writer, sheet_name='Episodes', index=False)
-
-    logging.info(f"資料已保存到 {output_path}")
+def scrape_appletv_data(driver, url, detail):
+    apply_site_profile(driver, 'appletv')
+    driver.get(url)
+    wait_for_page_ready(driver)
+
+    # 提取劇名
+    title_tag = wait_for_element(driver, (By.CSS_SELECTOR, 'script#schema\\:breadcrumb-list'))
+    title_json = json.loads(title_tag.get_attribute('innerHTML'))
+    tv_show_title = title_json['itemListElement'][-1]['item']['name']
+
+    # 提取簡介
+    description_tag = wait_for_element(driver, (By.CSS_SELECTOR, 'div.product-header__content__details__synopsis'))
+    tv_show_description = description_tag.text.strip()
+
+    logging.info(f"劇集名稱: {tv_show_title}")
+    logging.info(f"劇集簡介: {tv_show_description}")
+    detail.title = tv_show_title
+    detail.description = tv_show_description
+
+    # 檢查是否為電影
+    if not driver.find_elements(By.CSS_SELECTOR, '.episode-lockup__content'):
+        detail.is_movie = True
+        logging.info("識別為電影")
+        return
+
+    # 提取季數信息
+    page_source = driver.page_source
+    season_data_match = re.search(r'"seasonSummaries":\[(.*?)\],"selectedEpisodeIndex"', page_source)
+    if season_data_match:
+        season_data_json = '[' + season_data_match.group(1).replace('},{', '}|{') + ']'
+        season_data_json = season_data_json.replace('|', ',')
+        season_data = json.loads(season_data_json)
+    else:
+        season_data = []
+
+    seasons = [Season(season['title'], season['seasonNumber'], "") for season in season_data]  # 目前沒有季數簡介
+    detail.seasons = seasons
+
+    # 先從頁面內嵌的資料讀取所有集數，讀不齊才逐頁點擊
+    json_episodes = extract_episodes_from_page_data(driver, page_source, season_data)
+    if json_episodes is not None:
+        detail.episodes = json_episodes
+        if not seasons:
+            detail.seasons = [Season(f"第 {season_number} 季", season_number, "") for season_number in sorted({e.season_number for e in json_episodes})]
+        logging.info(f"從頁面資料取得 {len(json_episodes)} 集")
+        return
+
+    all_episodes = []
+    seen_titles = set()  # 存儲已抓取的集數標題，避免重複
+    current_episode_number = 0
+
+    for season in season_data:
+        season_name = season['title']
+        season_number = season['seasonNumber']
+
+        logging.info(f"季數: {season_name} (第 {season_number} 季)")
+
+        # 抓取每季的集數信息
+        while True:
+            try:
+                page = extract_page(driver, EPISODE_PAGE_SELECTORS)
+                for episode in page['episodes']:
+                    try:
+                        title = episode['title']
+                        if title is not None and title not in seen_titles:
+                            episode_number_text = episode['number']
+                            episode_number = int(episode_number_text.split(" ")[1].strip("集"))
+
+                            if episode_number < current_episode_number:
+                                # 假定這是新的季數
+                                season_number += 1
+
+                            current_episode_number = episode_number
+
+                            description = episode['description'] or ''
+                            all_episodes.append(Episode(season_number, episode_number, title, description))
+                            seen_titles.add(title)
+
+                            logging.info(f"  集數: {episode_number_text} - 標題: {title}")
+                            logging.info(f"    簡介: {description}")
+                    except Exception as e:
+                        logging.error(f"抓取集數資料時發生錯誤: {e}")
+
+                # 查找“下一頁”按鈕並點擊，按鈕不存在或已停用即表示是最後一頁
+                next_buttons = page['next_buttons']
+                if not next_buttons or next_buttons[0]['disabled'] is not None or next_buttons[0]['aria_disabled'] == 'true':
+                    logging.info("沒有更多頁面")
+                    break
+                next_button = wait_for_clickable(driver, (By.CSS_SELECTOR, 'button.shelf-grid-nav__arrow.shelf-grid-nav__arrow--next'), 'appletv_next_page')
+                next_button.click()
+                # 等待新一頁出現未抓取過的集數標題
+                wait_quietly(driver, lambda d: has_new_episode_title(d, seen_titles), 'appletv_next_page')
+
+            except Exception as e:
+                logging.info(f"沒有更多頁面或發生錯誤: {e}")
+                break
+
+    logging.info(f"所有集數信息: {all_episodes}")
+    detail.episodes = all_episodes
+
+# 頁面內嵌的伺服器資料 (serialized-server-data / shoebox)，JSON 字串內可能再包含 JSON 字串
+@timed('parse')
+def load_embedded_json(page_source):
+    documents = []
+    soup = BeautifulSoup(page_source, 'html.parser')
+    for script in soup.find_all('script', {'type': ['application/json', 'fastboot/shoebox']}):
+        text = script.string or script.get_text()
+        try:
+            documents.append(json.loads(text))
+        except (TypeError, ValueError):
+            continue
+    return documents
+
+def iter_json_dicts(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from iter_json_dicts(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_json_dicts(value)
+    elif isinstance(node, str) and node[:1] in ('{', '['):
+        try:
+            yield from iter_json_dicts(json.loads(node))
+        except ValueError:
+            pass
+
+def json_text(value):
+    if isinstance(value, dict):
+        value = next((value[key] for key in ('standard', 'full', 'medium', 'short') if isinstance(value.get(key), str)), '')
+    return value.strip() if isinstance(value, str) else ''
+
+# 找出資料內所有集數 (同時有季數、集數和標題的物件)，返回 {(季數, 集數): Episode}
+def collect_json_episodes(documents):
+    episodes = {}
+    for document in documents:
+        for item in iter_json_dicts(document):
+            season_number = item.get('seasonNumber')
+            episode_number = item.get('episodeNumber')
+            title = json_text(item.get('title'))
+            if not isinstance(season_number, int) or not isinstance(episode_number, int) or not title:
+                continue
+            key = (season_number, episode_number)
+            if key not in episodes:
+                episodes[key] = Episode(season_number, episode_number, title, json_text(item.get('description')))
+    return episodes
+
+# 返回所有季數的集數；如果內嵌資料缺少某些季數，會載入該季的網址再讀取，仍然不齊則返回 None
+def extract_episodes_from_page_data(driver, page_source, season_data):
+    episodes = collect_json_episodes(load_embedded_json(page_source))
+    found_seasons = {season_number for season_number, _ in episodes}
+    wanted_seasons = [season['seasonNumber'] for season in season_data] or sorted(found_seasons)
+    original_url = driver.current_url
+
+    for season in season_data:
+        if season['seasonNumber'] in found_seasons or not isinstance(season.get('url'), str):
+            continue
+        logging.info(f"載入第 {season['seasonNumber']} 季的資料: {season['url']}")
+        driver.get(season['url'])
+        wait_for_page_ready(driver)
+        for key, episode in collect_json_episodes(load_embedded_json(driver.page_source)).items():
+            episodes.setdefault(key, episode)
+        found_seasons = {season_number for season_number, _ in episodes}
+
+    if not episodes or any(season_number not in found_seasons for season_number in wanted_seasons):
+        logging.info("頁面資料缺少部分季數的集數，改為逐頁抓取")
+        if driver.current_url != original_url:
+            driver.get(original_url)
+            wait_for_page_ready(driver)
+        return None
+    return [episodes[key] for key in sorted(episodes) if key[0] in wanted_seasons]
+
+def has_new_episode_title(driver, seen_titles):
+    titles = extract_texts(driver, EPISODE_PAGE_SELECTORS['episodes']['fields']['title'])
+    return any(title and title not in seen_titles for title in titles)
 
 if __name__ == "__main__":
-    import logging
+    from selenium import webdriver
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     logging.getLogger('page_load_metrics_update_dispatcher').setLevel(logging.ERROR)
 
     apple_tv_url = input("請輸入 Apple TV 劇集 URL: ")
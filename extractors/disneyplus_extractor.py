@@ -1,57 +1,90 @@
-import time
-import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import logging
-from selenium.common.exceptions import NoSuchElementException
+import re
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from others.wait_utils import wait_for_page_ready, wait_for_element, wait_for_clickable, wait_for_staleness, wait_quietly, wait_for_scroll_height_change
+from others.browser_profile import apply_site_profile
+from others.network_capture import network_capture_enabled, clear_network_log, capture_json_responses, wait_for_json_responses
+from others.video_models import VideoDetail, Season, Episode
+from others.excel_export import save_video_detail
+from extractors.dom_batch import extract_page, extract_texts
 
-# 設置日誌
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Disney+ 網頁向這些網址取得季數和集數的 JSON
+DISNEYPLUS_API_KEYWORDS = ('bamgrid.com', 'disneyplus.com/api', '/explore/')
+
+DISNEYPLUS_HOME_URL = "https://www.disneyplus.com/zh-hk/home"
+
+UNWANTED_TEXT = '部分閃光片段或圖案可能會影響對光敏感的觀眾。'
+
+# 一季的所有集數用一次 extract_page 讀取 (見 extractors.dom_batch)
+EPISODE_LIST_SELECTORS = {
+    'episodes': {'items': '[data-testid="set-item"]',
+                 'fields': {'title': '[data-testid="standard-regular-list-item-title"]',
+                            'description': '[data-testid="standard-regular-list-item-description"]'}},
+}
 
 def login_to_disneyplus(driver, email, password):
+    apply_site_profile(driver, 'disneyplus_login')
     driver.get("https://www.disneyplus.com/zh-hk/identity/login")
-    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.NAME, "email"))).send_keys(email)
+    wait_for_element(driver, (By.NAME, "email"), 'login').send_keys(email)
     driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.NAME, "password"))).send_keys(password)
+    wait_for_element(driver, (By.NAME, "password"), 'login').send_keys(password)
     driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
     
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[role="button"][data-testid^="profile-avatar-"]')))
+    wait_for_element(driver, (By.CSS_SELECTOR, 'div[role="button"][data-testid^="profile-avatar-"]'), 'disneyplus_profile')
     profiles = driver.find_elements(By.CSS_SELECTOR, 'div[role="button"][data-testid^="profile-avatar-"]')
     profiles[0].click()  # 隨機選擇第一個 Profile
-    time.sleep(3)  # 等待 3 秒
+    # 等待離開選擇 Profile 的頁面
+    wait_for_staleness(driver, profiles[0], 'disneyplus_profile')
+
+# 打開首頁確認還原的登入狀態，未登入會被轉到登入頁或介紹頁；需要選擇 Profile 時選擇第一個
+def check_disneyplus_login(driver):
+    apply_site_profile(driver, 'disneyplus')
+    driver.get(DISNEYPLUS_HOME_URL)
+    wait_for_page_ready(driver)
+    profile_locator = (By.CSS_SELECTOR, 'div[role="button"][data-testid^="profile-avatar-"]')
+    state = wait_quietly(driver, lambda d: 'logged_out' if '/home' not in d.current_url
+                         else 'profile' if d.find_elements(*profile_locator)
+                         else 'home' if d.find_elements(By.CSS_SELECTOR, '[data-testid="set-item"], a[href*="/browse/"]')
+                         else False, 'disneyplus_profile')
+    if state == 'profile':
+        profiles = driver.find_elements(*profile_locator)
+        profiles[0].click()
+        wait_for_staleness(driver, profiles[0], 'disneyplus_profile')
+    return state in ('home', 'profile')
 
 def click_details_button(driver):
     logging.info("開始尋找「簡介」按鈕")
-    details_button = WebDriverWait(driver, 10).until(
-        EC.element_to_be_clickable((By.CSS_SELECTOR, 'li[data-testid="details-page-tab"][aria-controls="details"]'))
-    )
+    details_button = wait_for_clickable(driver, (By.CSS_SELECTOR, 'li[data-testid="details-page-tab"][aria-controls="details"]'), 'disneyplus_tab')
     details_button.click()
     logging.info("已點擊「簡介」按鈕")
-    time.sleep(2)  # 等待 5 秒以確保頁面完全加載
+    # 等待簡介內容出現
+    wait_for_element(driver, (By.CSS_SELECTOR, '[data-testid="details-tab-title"]'), 'disneyplus_tab')
 
 def click_episodes_button(driver):
     logging.info("開始尋找「集數」按鈕")
-    episodes_button = WebDriverWait(driver, 10).until(
-        EC.element_to_be_clickable((By.CSS_SELECTOR, 'li[data-testid="details-page-tab"][aria-controls="episodes"]'))
-    )
+    episodes_button = wait_for_clickable(driver, (By.CSS_SELECTOR, 'li[data-testid="details-page-tab"][aria-controls="episodes"]'), 'disneyplus_tab')
     episodes_button.click()
     logging.info("已點擊「集數」按鈕")
-    time.sleep(2)  # 等待 5 秒以確保頁面完全加載
+    # 等待集數列表出現
+    wait_for_set_items(driver)
 
 def scroll_to_bottom(driver):
     last_height = driver.execute_script("return document.body.scrollHeight")
     while True:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        # 等待載入更多集數令頁面變高，等不到即表示已經到底
+        new_height = wait_for_scroll_height_change(driver, last_height, 'disneyplus_scroll')
         if new_height == last_height:
             break
         last_height = new_height
 
 def scroll_to_top(driver):
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
+    wait_quietly(driver, lambda d: d.execute_script("return window.pageYOffset") == 0, 'disneyplus_scroll')
+
+def wait_for_set_items(driver):
+    return wait_quietly(driver, lambda d: d.find_elements(By.CSS_SELECTOR, '[data-testid="set-item"]'), 'disneyplus_season')
 
 def click_using_js(driver, element):
     driver.execute_script("arguments[0].click();", element)
@@ -64,46 +97,40 @@ def extract_season_info(driver):
 
     # 檢查是否有多季
     try:
-        dropdown_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="dropdown-button"]'))
-        )
+        dropdown_button = wait_for_clickable(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-button"]'), 'disneyplus_season')
         click_using_js(driver, dropdown_button)
         logging.info("已點擊下拉菜單按鈕")
-        time.sleep(2)  # 等待 3 秒
-
-        season_dropdown = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="dropdown-list"]'))
-        )
-        season_elements = season_dropdown.find_elements(By.TAG_NAME, 'li')
-        logging.info(f"找到多季，共有 {len(season_elements)} 季")
-        for i in range(len(season_elements)):
-            season_dropdown = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="dropdown-list"]'))
-            )
-            season_elements = season_dropdown.find_elements(By.TAG_NAME, 'li')
-            season_name = season_elements[i].text
+
+        wait_for_element(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-list"]'), 'disneyplus_season')
+        # 所有季數名稱一次讀取，只有點擊時才需要取得元素
+        dropdown_names = extract_texts(driver, '[data-testid="dropdown-list"] li')
+        logging.info(f"找到多季，共有 {len(dropdown_names)} 季")
+        for i, season_name in enumerate(dropdown_names):
             if season_name in season_names:
                 continue
+            season_dropdown = wait_for_element(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-list"]'), 'disneyplus_season')
+            season_elements = season_dropdown.find_elements(By.TAG_NAME, 'li')
             season_names.add(season_name)
             current_season_number = int(season_name.split(' ')[1])
-            seasons.append([season_name, current_season_number, ''])
+            seasons.append(Season(season_name, current_season_number, ''))
+            old_items = driver.find_elements(By.CSS_SELECTOR, '[data-testid="set-item"]')
             season_elements[i].click()
-            time.sleep(2)  # 等待 5 秒以確保頁面完全加載
+            # 等待舊一季的集數被替換
+            if old_items:
+                wait_for_staleness(driver, old_items[0], 'disneyplus_season')
+            wait_for_set_items(driver)
             grab_episodes(driver, current_season_number, all_episodes)
             scroll_to_top(driver)  # 滾動到頂部以避免點擊被阻擋
-            dropdown_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="dropdown-button"]'))
-            )
-            click_using_js(driver, dropdown_button)
-            time.sleep(1)  # 再次打開下拉菜單
-    except NoSuchElementException as e:
+            dropdown_button = wait_for_clickable(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-button"]'), 'disneyplus_season')
+            click_using_js(driver, dropdown_button)  # 再次打開下拉菜單
+    except (NoSuchElementException, TimeoutException) as e:
         logging.info("找不到多季資訊: %s", e)
         # 如果只有一季，抓取單一季數資訊
         try:
             disabled_dropdown = driver.find_element(By.CSS_SELECTOR, '[data-testid="dropdown-button"][disabled]')
             season_name = disabled_dropdown.find_element(By.TAG_NAME, 'span').text
             current_season_number = int(season_name.split(' ')[1])
-            seasons.append([season_name, current_season_number, ''])
+            seasons.append(Season(season_name, current_season_number, ''))
             grab_episodes(driver, current_season_number, all_episodes)
         except NoSuchElementException as ex:
             logging.info("找不到單一季數資訊: %s", ex)
@@ -113,11 +140,13 @@ def extract_season_info(driver):
 def grab_episodes(driver, season_number, all_episodes):
     logging.info(f"開始抓取第 {season_number} 季的集數")
     scroll_to_bottom(driver)
-    episodes = driver.find_elements(By.CSS_SELECTOR, '[data-testid="set-item"]')
+    episodes = extract_page(driver, EPISODE_LIST_SELECTORS)['episodes']
     episode_numbers = set()
     for episode in episodes:
-        episode_title = episode.find_element(By.CSS_SELECTOR, '[data-testid="standard-regular-list-item-title"]').text
-        episode_description = episode.find_element(By.CSS_SELECTOR, '[data-testid="standard-regular-list-item-description"]').text
+        episode_title = episode['title']
+        episode_description = episode['description']
+        if episode_title is None or episode_description is None:
+            continue
         episode_number = int(episode_title.split('.')[0])
         if episode_number in episode_numbers:
             continue
@@ -125,16 +154,138 @@ def grab_episodes(driver, season_number, all_episodes):
         episode_title = episode_title.split('.')[1].strip()
 
         # 去除不需要的段落
-        unwanted_text = '部分閃光片段或圖案可能會影響對光敏感的觀眾。'
-        if unwanted_text in episode_description:
-            episode_description = episode_description.replace(unwanted_text, '').strip()
+        if UNWANTED_TEXT in episode_description:
+            episode_description = episode_description.replace(UNWANTED_TEXT, '').strip()
 
-        all_episodes.append([season_number, episode_number, episode_title, episode_description])
+        all_episodes.append(Episode(season_number, episode_number, episode_title, episode_description))
     logging.info(f"完成抓取第 {season_number} 季的集數")
 
-def extract_disneyplus_data(driver, url, output_path):
+def iter_json_dicts(data):
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from iter_json_dicts(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_json_dicts(value)
+
+# 舊版 API (DmcEpisodes 等) 的文字放在 text.title.full.program.default.content
+def dmc_text(text, field):
+    for size in ('full', 'medium', 'brief'):
+        try:
+            return text[field][size]['program']['default']['content']
+        except (KeyError, TypeError):
+            continue
+    return ''
+
+def season_number_from_name(name):
+    match = re.search(r'\d+', name or '')
+    return int(match.group()) if match else None
+
+# 從一個 JSON 物件讀取集數資料 (季數, 集數, 標題, 簡介)，不是集數返回 None
+def json_episode(item):
+    visuals = item.get('visuals')
+    if isinstance(visuals, dict) and visuals.get('seasonNumber') is not None and visuals.get('episodeNumber') is not None:
+        description = visuals.get('description') or ''
+        if isinstance(description, dict):
+            description = description.get('full') or description.get('medium') or description.get('brief') or ''
+        title = visuals.get('episodeTitle') or ''
+        return int(visuals['seasonNumber']), int(visuals['episodeNumber']), title, description
+    if item.get('seasonSequenceNumber') is not None and item.get('episodeSequenceNumber') is not None:
+        text = item.get('text') or {}
+        return int(item['seasonSequenceNumber']), int(item['episodeSequenceNumber']), dmc_text(text, 'title'), dmc_text(text, 'description')
+    return None
+
+# 從一個 JSON 物件讀取季數資料 (季數, 名稱)，不是季數返回 None
+def json_season(item):
+    visuals = item.get('visuals')
+    if item.get('type') == 'season' and isinstance(visuals, dict) and visuals.get('name'):
+        number = season_number_from_name(visuals['name'])
+        return (number, visuals['name']) if number is not None else None
+    if item.get('seasonSequenceNumber') is not None and item.get('episodeSequenceNumber') is None and 'seasonId' in item:
+        number = int(item['seasonSequenceNumber'])
+        return number, f"第 {number} 季"
+    return None
+
+# 將 API 回應加入 episodes {(季數, 集數): Episode} 和 season_names {季數: 名稱}
+# 返回是否還有下一頁集數
+def collect_network_episodes(responses, episodes, season_names):
+    has_more = False
+    for url, data in responses:
+        for item in iter_json_dicts(data):
+            episode = json_episode(item)
+            if episode:
+                season_number, episode_number, title, description = episode
+                description = description.replace(UNWANTED_TEXT, '').strip()
+                episodes.setdefault((season_number, episode_number), Episode(season_number, episode_number, title.strip(), description))
+                continue
+            season = json_season(item)
+            if season:
+                season_names.setdefault(*season)
+            if item.get('hasMore') is True or item.get('has_more') is True:
+                has_more = True
+    return has_more
+
+# 滾動到底觸發下一頁的請求，直到沒有下一頁或等不到新的回應
+def load_more_network_episodes(driver, episodes, season_names):
+    while True:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        responses = wait_for_json_responses(driver, DISNEYPLUS_API_KEYWORDS, 'disneyplus_season')
+        if not responses or not collect_network_episodes(responses, episodes, season_names):
+            return
+
+# 由網頁自己取得的 API 回應建立季數和集數，每季只需要在下拉菜單選擇一次，不用滾動讀取每一集
+# 回應不完整 (例如沒有開啟 capture_network) 返回 None，改用 extract_season_info 讀取網頁
+def extract_season_info_from_network(driver):
+    if not network_capture_enabled(driver):
+        return None
+    logging.info("從網絡回應抓取季數資訊")
+    episodes = {}
+    season_names = {}
+    try:
+        if collect_network_episodes(capture_json_responses(driver, DISNEYPLUS_API_KEYWORDS), episodes, season_names):
+            load_more_network_episodes(driver, episodes, season_names)
+
+        dropdown_locator = (By.CSS_SELECTOR, '[data-testid="dropdown-button"]:not([disabled])')
+        if driver.find_elements(*dropdown_locator):
+            click_using_js(driver, wait_for_clickable(driver, dropdown_locator, 'disneyplus_season'))
+            season_dropdown = wait_for_element(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-list"]'), 'disneyplus_season')
+            season_labels = [element.text for element in season_dropdown.find_elements(By.TAG_NAME, 'li')]
+            click_using_js(driver, driver.find_element(*dropdown_locator))  # 關閉下拉菜單
+            logging.info(f"找到多季，共有 {len(season_labels)} 季")
+            for index, label in enumerate(season_labels):
+                season_number = season_number_from_name(label)
+                if season_number is None:
+                    continue
+                season_names.setdefault(season_number, label)
+                if any(key[0] == season_number for key in episodes):
+                    continue
+                scroll_to_top(driver)  # 滾動到頂部以避免點擊被阻擋
+                click_using_js(driver, wait_for_clickable(driver, dropdown_locator, 'disneyplus_season'))
+                season_dropdown = wait_for_element(driver, (By.CSS_SELECTOR, '[data-testid="dropdown-list"]'), 'disneyplus_season')
+                season_dropdown.find_elements(By.TAG_NAME, 'li')[index].click()
+                responses = wait_for_json_responses(driver, DISNEYPLUS_API_KEYWORDS, 'disneyplus_season')
+                if collect_network_episodes(responses, episodes, season_names):
+                    load_more_network_episodes(driver, episodes, season_names)
+    except Exception as e:
+        logging.warning(f"從網絡回應抓取集數失敗，改為讀取網頁: {e}")
+        return None
+
+    season_numbers = sorted(set(season_names) | {key[0] for key in episodes})
+    if not episodes or any(not any(key[0] == number for key in episodes) for number in season_numbers):
+        logging.info("網絡回應沒有包含所有季數的集數，改為讀取網頁")
+        return None
+    seasons = [Season(season_names.get(number, f"第 {number} 季"), number, '') for number in season_numbers]
+    logging.info(f"從網絡回應取得 {len(seasons)} 季共 {len(episodes)} 集")
+    return seasons, [episodes[key] for key in sorted(episodes)]
+
+# output_path 不為 None 時會另外將資料儲存成 Excel
+def extract_disneyplus_data(driver, url, output_path=None):
+    detail = VideoDetail()
+    apply_site_profile(driver, 'disneyplus')
+    clear_network_log(driver)
     driver.get(url)
-    time.sleep(2)  # 等待頁面加載
+    wait_for_page_ready(driver)
 
     try:
         click_details_button(driver)
@@ -146,55 +297,35 @@ def extract_disneyplus_data(driver, url, output_path):
         description = description_element.text
 
         # 去除不需要的段落
-        unwanted_text = '部分閃光片段或圖案可能會影響對光敏感的觀眾。'
-        if unwanted_text in description:
-            description = description.replace(unwanted_text, '').strip()
+        if UNWANTED_TEXT in description:
+            description = description.replace(UNWANTED_TEXT, '').strip()
 
         logging.info(f"名稱: {title}")
         logging.info(f"簡介: {description}")
+        detail.title = title
+        detail.description = description
 
         # 檢查是否為電影
-        is_movie = not driver.find_elements(By.CSS_SELECTOR, '[aria-controls="episodes"]')
+        detail.is_movie = not driver.find_elements(By.CSS_SELECTOR, '[aria-controls="episodes"]')
 
-        if is_movie:
-            save_movie_info_to_excel(title, description, output_path)
-        else:
-            save_series_info_to_excel(title, description, output_path)
+        if not detail.is_movie:
             click_episodes_button(driver)
-            seasons, episodes = extract_season_info(driver)
-            save_to_excel(seasons, episodes, output_path)
+            season_info = extract_season_info_from_network(driver)
+            if season_info is None:
+                scroll_to_top(driver)
+                season_info = extract_season_info(driver)
+            detail.seasons, detail.episodes = season_info
 
     except Exception as e:
         logging.error(f"抓取 Disney+ 資料時發生錯誤: {e}")
 
-def save_movie_info_to_excel(movie_title, movie_description, output_path):
-    movie_data = {'Movie Title': [movie_title], 'Movie Description': [movie_description]}
-    movie_df = pd.DataFrame(movie_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        movie_df.to_excel(writer, sheet_name='Movies', index=False)
-
-def save_series_info_to_excel(tv_show_title, tv_show_description, output_path):
-    title_data = {'TV Show Title': [tv_show_title], 'TV Show Description': [tv_show_description]}
-    title_df = pd.DataFrame(title_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        title_df.to_excel(writer, sheet_name='Title', index=False)
-
-def save_to_excel(seasons, episodes, output_path):
-    logging.info("保存資料到 Excel")
-    # 為每季信息建立 DataFrame
-    seasons_df = pd.DataFrame(seasons, columns=['Season Name', 'Season Number', 'Season Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        seasons_df.to_excel(writer, sheet_name='Seasons', index=False)
-
-    # 保存集數信息到 Episodes
-    episodes_df = pd.DataFrame(episodes, columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        episodes_df.to_excel(writer, sheet_name='Episodes', index=False)
-
-    logging.info(f"資料已保存到 {output_path}")
+    if output_path:
+        save_video_detail(detail, output_path)
+    return detail
 
 if __name__ == "__main__":
     from selenium import webdriver
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     driver = webdriver.Chrome()
     email = 'YOUR_EMAIL'
     password = 'YOUR_PASSWORD'
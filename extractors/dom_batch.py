@@ -0,0 +1,54 @@
+from others.metrics import METRICS
+
+# 用一次 execute_script 讀取整個頁面需要的資料，代替逐個元素 find_element(...).text 的 WebDriver 請求
+# selector_map 為 {組別: {'items': CSS selector, 'fields': {欄位: 欄位設定}}}，每組返回一個列表，每個符合 items 的元素一行
+# 欄位設定可以是:
+#   CSS selector        元素內第一個符合的子元素的文字 (innerText，和 WebElement.text 一樣去除前後空白)
+#   (selector, 屬性)    子元素的屬性值，selector 為 None 表示 items 元素本身
+#                       屬性以 . 開頭時讀取 DOM property，例如 '.href' 為完整網址 (和 WebElement.get_attribute 相同)
+#   None                items 元素本身的文字
+# 找不到的子元素或屬性為 None，例如
+#   extract_page(driver, {'episodes': {'items': 'li.episode', 'fields': {'title': 'h3', 'link': ('a', 'href')}}})
+#   -> {'episodes': [{'title': '...', 'link': '...'}, ...]}
+DOM_BATCH_SCRIPT = '''
+const selectorMap = arguments[0];
+const readField = (item, spec) => {
+    const [selector, attribute] = spec;
+    const element = selector ? item.querySelector(selector) : item;
+    if (!element) return null;
+    if (attribute && attribute.startsWith('.')) {
+        const value = element[attribute.slice(1)];
+        return value === undefined || value === null ? null : String(value);
+    }
+    if (attribute) return element.getAttribute(attribute);
+    return (element.innerText || element.textContent || '').trim();
+};
+const result = {};
+for (const [group, config] of Object.entries(selectorMap)) {
+    result[group] = Array.from(document.querySelectorAll(config.items)).map(item => {
+        const row = {};
+        for (const [name, spec] of Object.entries(config.fields)) {
+            row[name] = readField(item, spec);
+        }
+        return row;
+    });
+}
+return result;
+'''
+
+def _field_spec(spec):
+    if isinstance(spec, (tuple, list)):
+        return [spec[0], spec[1]]
+    return [spec, None]
+
+def extract_page(driver, selector_map):
+    script_map = {group: {'items': config['items'], 'fields': {name: _field_spec(spec) for name, spec in config['fields'].items()}}
+                  for group, config in selector_map.items()}
+    METRICS.count('dom_batch_calls')
+    with METRICS.phase('dom_batch'):
+        result = driver.execute_script(DOM_BATCH_SCRIPT, script_map) or {}
+    return {group: result.get(group) or [] for group in selector_map}
+
+# 只讀取一組元素的文字，例如季數名稱列表
+def extract_texts(driver, selector):
+    return [row['text'] for row in extract_page(driver, {'texts': {'items': selector, 'fields': {'text': None}}})['texts']]
@@ -1,14 +1,10 @@
-import time
-import pandas as pd
-from selenium import webdriver
-from bs4 import BeautifulSoup
 import re
-import urllib.parse
 import logging
-import os
-
-# 設置日誌
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from extractors.page_snapshot import load_page_snapshot
+from others.browser_profile import apply_site_profile
+from others.video_models import VideoDetail, Season, Episode
+from others.excel_export import save_video_detail
+from extractors.video_keys import extract_netflix_video_id as extract_video_id
 
 def clean_title(title):
     # 清理標題，去除 "第 x 集" 或 "第 x 話"
@@ -16,23 +12,8 @@ def clean_title(title):
     title = re.sub(r'^第\d+話', '', title).strip()
     return title
 
-def extract_video_id(url):
-    parsed_url = urllib.parse.urlparse(url)
-    query_params = urllib.parse.parse_qs(parsed_url.query)
-    path_segments = parsed_url.path.split('/')
-    if 'jbv' in query_params:
-        return query_params['jbv'][0]
-    for segment in path_segments:
-        if segment.isdigit():
-            return segment
-    return None
-
-def get_series_info(driver, url):
-    driver.get(url)
-    time.sleep(1)
-    html_content = driver.page_source
-
-    soup = BeautifulSoup(html_content, 'html.parser')
+def get_series_info(snapshot):
+    soup = snapshot.soup
 
     title = soup.find('h1', {'class': 'title-title'})
     if title:
@@ -50,12 +31,11 @@ def get_series_info(driver, url):
 
     return title, description
 
-def get_season_info(driver, url, series_description):
-    driver.get(url)
-    time.sleep(1)
-    html_content = driver.page_source
+def is_series(snapshot):
+    return snapshot.soup.find('div', {'class': 'episode-metadata'}) is not None
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+def get_season_info(snapshot, series_description):
+    soup = snapshot.soup
     season_data = []
 
     season_select = soup.find('select', {'data-uia': 'season-selector'})
@@ -65,7 +45,7 @@ def get_season_info(driver, url, series_description):
 
     if not seasons:
         # 如果沒有季數資料，用劇集簡介作為第一季的簡介
-        season_data.append(('第 1 季', 1, series_description))
+        season_data.append(Season('第 1 季', 1, series_description))
     else:
         for i, season in enumerate(seasons):
             if i < len(season_names):
@@ -78,17 +58,13 @@ def get_season_info(driver, url, series_description):
                 season_description = season_description_element.get_text(strip=True)
             else:
                 season_description = series_description
-            season_data.append((season_name, season_number, season_description))
+            season_data.append(Season(season_name, season_number, season_description))
             logging.info(f"季度 {season_name} - 描述: {season_description}")
 
     return season_data
 
-def get_episode_info(driver, url):
-    driver.get(url)
-    time.sleep(1)
-    html_content = driver.page_source
-
-    soup = BeautifulSoup(html_content, 'html.parser')
+def get_episode_info(snapshot):
+    soup = snapshot.soup
     all_episode_data = []
     seasons = soup.find_all('div', class_='season')
     logging.info(f"找到 {len(seasons)} 個季數")
@@ -106,7 +82,7 @@ def get_episode_info(driver, url):
             try:
                 episode_title = clean_title(episode_element.find('h3').get_text(strip=True))
                 episode_description = episode_element.find('p').get_text(strip=True)
-                all_episode_data.append((season_number, episode_number, episode_title, episode_description))
+                all_episode_data.append(Episode(season_number, episode_number, episode_title, episode_description))
                 logging.info(f"第 {episode_number} 集 - 標題: {episode_title}, 描述: {episode_description}")
                 episode_number += 1
             except Exception as e:
@@ -115,55 +91,50 @@ def get_episode_info(driver, url):
         season_number += 1
     return all_episode_data
 
-def save_to_excel(data, filename='video_detail.xlsx', sheet_name='Episodes'):
-    with pd.ExcelWriter(filename, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        df = pd.DataFrame(data, columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description'])
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-    logging.info(f"資料已保存到 {filename}")
-
-def save_season_info_to_excel(data, filename='video_detail.xlsx', sheet_name='Seasons'):
-    with pd.ExcelWriter(filename, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        df = pd.DataFrame(data, columns=['Season Name', 'Season Number', 'Season Description'])
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-    logging.info(f"季度信息已保存到 {filename}")
-
-def save_series_info_to_excel(title, description, filename='video_detail.xlsx', sheet_name='Title'):
-    with pd.ExcelWriter(filename, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        df = pd.DataFrame([(title, description)], columns=['Title', 'Description'])
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-    logging.info(f"劇集信息已保存到 {filename}")
-
-def save_movie_info_to_excel(title, description, filename='video_detail.xlsx', sheet_name='Movies'):
-    with pd.ExcelWriter(filename, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        df = pd.DataFrame([(title, description)], columns=['Movie Title', 'Movie Description'])
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-    logging.info(f"電影信息已保存到 {filename}")
-
-def extract_netflix_episodes(driver, url, output_path):
+NETFLIX_BASE_URL = 'https://www.netflix.com'
+
+# 標題頁只需要解析以下部分 (見 extractors.page_snapshot.TargetStrainer)，其餘的導覽列、推薦及 script 都會略過
+NETFLIX_PARSE_TARGETS = [
+    ('h1', 'class', 'title-title'),
+    ('div', 'class', 'title-info-synopsis'),
+    ('div', 'class', 'episode-metadata'),
+    ('select', 'data-uia', 'season-selector'),
+    ('div', 'class', 'season'),
+]
+
+def standardize_url(video_id, base_url=NETFLIX_BASE_URL):
+    return f"{base_url}/hk/title/{video_id}"
+
+# 從已載入的標題頁解析出所有資料，Selenium 和 HTTP 兩種載入方式共用
+def parse_title_page(snapshot):
+    detail = VideoDetail()
+    detail.title, detail.description = get_series_info(snapshot)
+
+    if is_series(snapshot):
+        # 是劇集
+        detail.seasons = get_season_info(snapshot, detail.description)
+        detail.episodes = get_episode_info(snapshot)
+        if not detail.episodes:
+            logging.error("無法從該網址取得資料")
+    else:
+        # 是電影
+        detail.is_movie = True
+    return detail
+
+# output_path 不為 None 時會另外將資料儲存成 Excel
+def extract_netflix_episodes(driver, url, output_path=None, base_url=NETFLIX_BASE_URL):
+    detail = VideoDetail()
+    apply_site_profile(driver, 'netflix')
     video_id = extract_video_id(url)
     if video_id:
-        standardized_url = f"https://www.netflix.com/hk/title/{video_id}"
+        standardized_url = standardize_url(video_id, base_url)
         logging.info(f"標準化URL: {standardized_url}")
-        title, description = get_series_info(driver, standardized_url)
-
-        driver.get(standardized_url)
-        time.sleep(1)
-        html_content = driver.page_source
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        if soup.find('div', {'class': 'episode-metadata'}):
-            # 是劇集
-            save_series_info_to_excel(title, description, output_path)
-            season_data = get_season_info(driver, standardized_url, description)
-            save_season_info_to_excel(season_data, output_path)
-            episode_data = get_episode_info(driver, standardized_url)
-            if not episode_data:
-                logging.error("無法從該網址取得資料")
-            else:
-                save_to_excel(episode_data, output_path)
-        else:
-            # 是電影
-            save_movie_info_to_excel(title, description, output_path)
+        # 整個標題頁只載入一次，以下的解析都使用同一份頁面
+        snapshot = load_page_snapshot(driver, standardized_url, NETFLIX_PARSE_TARGETS)
+        detail = parse_title_page(snapshot)
     else:
         logging.error("無法提取影片ID，請檢查輸入的URL")
 
+    if output_path:
+        save_video_detail(detail, output_path)
+    return detail
@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+import logging
+from extractors.page_snapshot import PageSnapshot
+from extractors.netflix_extractor import extract_video_id, standardize_url, parse_title_page, NETFLIX_BASE_URL, NETFLIX_PARSE_TARGETS
+from others.metrics import METRICS
+
+# Netflix 香港的標題頁是伺服器端產生的，不需要瀏覽器，直接用 HTTP 取得再交給原有的解析函數
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'zh-HK,zh;q=0.9',
+}
+
+async def fetch_title_page(client, url):
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError as e:
+        logging.warning(f"HTTP 取得 {url} 失敗: {e}")
+        return None
+    if response.status_code != 200:
+        logging.warning(f"HTTP 取得 {url} 失敗: {response.status_code}")
+        return None
+    snapshot = PageSnapshot(response.text, str(response.url), NETFLIX_PARSE_TARGETS)
+    # 被導向登入頁或其他地區時沒有標題，交由 Selenium 處理
+    if snapshot.soup.find('h1', {'class': 'title-title'}) is None:
+        logging.warning(f"{url} 沒有標題資料，改用瀏覽器")
+        return None
+    return snapshot
+
+# 同時取得多個標題頁，返回 {影片網址: PageSnapshot 或 None}
+async def fetch_title_pages(urls, base_url=NETFLIX_BASE_URL, concurrency=8, timeout=20):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=timeout, follow_redirects=True) as client:
+        async def fetch(url):
+            video_id = extract_video_id(url)
+            if not video_id:
+                return url, None
+            async with semaphore:
+                return url, await fetch_title_page(client, standardize_url(video_id, base_url))
+        results = await asyncio.gather(*(fetch(url) for url in urls))
+    return dict(results)
+
+# 劇集頁面有標題但沒有集數 (例如未登入或其他地區的版本沒有集數列表) 亦視為失敗，交由 Selenium 處理
+def parse_fetched_page(url, snapshot):
+    if snapshot is None:
+        return None
+    detail = parse_title_page(snapshot)
+    if not detail.is_movie and not detail.episodes:
+        logging.warning(f"{url} 沒有集數資料，改用瀏覽器")
+        return None
+    return detail
+
+# 用 HTTP 抓取多個 Netflix 標題，返回 {影片網址: VideoDetail}，失敗的網址返回 None，需改用 Selenium
+def extract_netflix_titles_http(urls, base_url=NETFLIX_BASE_URL, concurrency=8):
+    METRICS.count('http_page_loads', len(urls))
+    with METRICS.phase('http_fetch', pages=len(urls)):
+        snapshots = asyncio.run(fetch_title_pages(urls, base_url, concurrency))
+    return {url: parse_fetched_page(url, snapshot) for url, snapshot in snapshots.items()}
+
+def extract_netflix_episodes_http(url, base_url=NETFLIX_BASE_URL):
+    return extract_netflix_titles_http([url], base_url)[url]
@@ -0,0 +1,64 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from others.wait_utils import wait_for_page_ready
+from others.metrics import METRICS
+
+# 有安裝 lxml 時使用 C 實作的 lxml 解析器，否則使用 Python 內建的 html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# 只保留符合 targets 的元素 (連同其所有子元素)，其他部分在解析時直接略過，不會建立節點
+# targets 為 [(標籤, 屬性, 值)]，例如 ('div', 'class', 'season')；class 只要其中一個符合即可，標籤為 None 表示任何標籤
+class TargetStrainer(SoupStrainer):
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets
+
+    def wants(self, name, attrs):
+        attrs = dict(attrs or {})
+        for tag_name, attribute, value in self.targets:
+            if tag_name is not None and tag_name != name:
+                continue
+            actual = attrs.get(attribute)
+            if actual is None:
+                continue
+            values = actual.split() if isinstance(actual, str) and attribute == 'class' else actual
+            if value == actual or (isinstance(values, (list, tuple)) and value in values):
+                return True
+        return False
+
+    # bs4 4.13 之後的介面
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.wants(name, attrs)
+
+    # bs4 4.13 之前的介面
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self.wants(markup_name, markup_attrs) else None
+
+# 一個頁面只載入及解析一次，同一頁面的多個解析函數共用同一棵 BeautifulSoup 樹
+# parse_targets 不為 None 時只解析需要的部分 (見 TargetStrainer)，parser 預設為 HTML_PARSER
+class PageSnapshot:
+    def __init__(self, html, url=None, parse_targets=None, parser=None):
+        self.html = html
+        self.url = url
+        self.parse_targets = parse_targets
+        self.parser = parser
+        self._soup = None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            with METRICS.phase('parse'):
+                self._soup = parse_html(self.html, self.parse_targets, self.parser)
+        return self._soup
+
+def parse_html(html, parse_targets=None, parser=None):
+    parse_only = TargetStrainer(parse_targets) if parse_targets else None
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
+
+def load_page_snapshot(driver, url, parse_targets=None):
+    driver.get(url)
+    wait_for_page_ready(driver)
+    return PageSnapshot(driver.page_source, url, parse_targets)
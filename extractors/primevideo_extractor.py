@@ -1,97 +1,121 @@
-import time
-import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import logging
 import re
-
-# 設置日誌
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-def extract_primevideo_data(driver, url, output_path):
+from others.wait_utils import wait_for_page_ready, wait_for_clickable, wait_for_staleness, wait_quietly
+from others.browser_profile import apply_site_profile, apply_profile_to_current_tab, DEFAULT_BROWSER_PROFILE
+from others.video_models import VideoDetail, Season, Episode
+from others.excel_export import save_video_detail
+from extractors.dom_batch import extract_page
+
+# 已經確認語言為繁體中文的 driver session
+LANGUAGE_CHECKED_SESSIONS = set()
+
+# 標題頁和季數頁的資料，每頁用一次 extract_page 讀取 (見 extractors.dom_batch)
+TITLE_PAGE_SELECTORS = {
+    'title': {'items': 'h1[data-automation-id="title"]', 'fields': {'text': None}},
+    'description': {'items': 'span._1H6ABQ', 'fields': {'text': None}},
+    'episodes_tab': {'items': '#tab-content-episodes', 'fields': {}},
+}
+SEASON_PAGE_SELECTORS = {
+    'season_names': {'items': 'span._36qUej', 'fields': {'text': None}},
+    'descriptions': {'items': 'span._1H6ABQ', 'fields': {'text': None}},
+    'episodes': {'items': 'li[id^="av-ep-episodes-"]',
+                 'fields': {'info': 'span._36qUej', 'title': 'span.P1uAb6', 'description': 'div._3qsVvm.e8yjMf > div[dir="auto"]'}},
+}
+
+# output_path 不為 None 時會另外將資料儲存成 Excel
+def extract_primevideo_data(driver, url, output_path=None):
+    detail = VideoDetail()
+    apply_site_profile(driver, 'primevideo')
     driver.get(url)
-    time.sleep(5)  # 等待頁面加載
+    wait_for_title(driver)
 
-    # 確認語言是否為繁體中文
-    try:
-        current_language = driver.find_element(By.CLASS_NAME, 'QDmWMz').text
-        if current_language != 'ZH':
-            # 點擊語言選擇器
-            language_selector = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, 'bBPMYR'))
-            )
-            language_selector.click()
-            # 點擊繁體中文選項
-            traditional_chinese_option = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, 'form[action*="zh_TW"] input[type="submit"]'))
-            )
-            traditional_chinese_option.click()
-            time.sleep(5)  # 等待頁面重新加載
-    except Exception as e:
-        logging.error(f"設置語言為繁體中文時發生錯誤: {e}")
+    # 確認語言是否為繁體中文，語言設定保存在 cookie，同一個 session 只需要確認一次
+    if driver.session_id not in LANGUAGE_CHECKED_SESSIONS:
+        ensure_traditional_chinese(driver)
 
     try:
-        # 獲取劇集或電影名稱
-        title_element = driver.find_element(By.CSS_SELECTOR, 'h1[data-automation-id="title"]')
-        title = title_element.text
-
-        # 獲取劇集或電影簡介
-        description_element = driver.find_element(By.CSS_SELECTOR, 'span._1H6ABQ')
-        description = description_element.text.strip()
+        page = extract_page(driver, TITLE_PAGE_SELECTORS)
+        if not page['title'] or not page['description']:
+            raise ValueError("找不到名稱或簡介")
+        # 獲取劇集或電影名稱及簡介
+        title = page['title'][0]['text']
+        description = page['description'][0]['text']
 
         logging.info(f"名稱: {title}")
         logging.info(f"簡介: {description}")
+        detail.title = title
+        detail.description = description
 
         # 檢查是否為劇集
-        if driver.find_elements(By.ID, 'tab-content-episodes'):
+        if page['episodes_tab']:
             click_episodes_button(driver)
-            save_series_info_to_excel(title, description, output_path)
-            extract_primevideo_seasons_and_episodes(driver, output_path, title, description)
+            detail.seasons, detail.episodes = extract_primevideo_seasons_and_episodes(driver, title, description)
         else:
-            save_movie_info_to_excel(title, description, output_path)
+            detail.is_movie = True
 
     except Exception as e:
         logging.error(f"抓取 Prime Video 資料時發生錯誤: {e}")
 
+    if output_path:
+        save_video_detail(detail, output_path)
+    return detail
+
+def ensure_traditional_chinese(driver):
+    try:
+        current_language = driver.find_element(By.CLASS_NAME, 'QDmWMz').text
+        if current_language != 'ZH':
+            # 點擊語言選擇器
+            language_selector = wait_for_clickable(driver, (By.CLASS_NAME, 'bBPMYR'))
+            language_selector.click()
+            # 點擊繁體中文選項
+            traditional_chinese_option = wait_for_clickable(driver, (By.CSS_SELECTOR, 'form[action*="zh_TW"] input[type="submit"]'))
+            old_page = driver.find_element(By.TAG_NAME, 'html')
+            traditional_chinese_option.click()
+            # 等待頁面重新加載
+            wait_for_staleness(driver, old_page, 'primevideo_language')
+            wait_for_title(driver)
+        LANGUAGE_CHECKED_SESSIONS.add(driver.session_id)
+    except Exception as e:
+        logging.error(f"設置語言為繁體中文時發生錯誤: {e}")
+
 def click_episodes_button(driver):
     logging.info("開始尋找「劇集」按鈕")
     try:
-        episodes_tab_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, '//button[@data-testid="btf-episodes-tab"]'))
-        )
+        episodes_tab_button = wait_for_clickable(driver, (By.XPATH, '//button[@data-testid="btf-episodes-tab"]'))
         logging.info("找到「劇集」按鈕")
         episodes_tab_button.click()
         logging.info("成功點擊了「劇集」按鈕")
-        time.sleep(3)  # 等待頁面加載
+        wait_for_episodes(driver)
     except Exception as e:
         logging.error(f"尋找或點擊「劇集」按鈕時發生錯誤: {e}")
 
-def extract_season_info(driver, season_number, title, description):
-    # 獲取季數名稱
-    season_name_element = driver.find_elements(By.CSS_SELECTOR, 'span._36qUej')
-    if season_name_element:
-        season_name = next((elem.text for elem in season_name_element if '第' in elem.text and '季' in elem.text), f'第 {season_number} 季')
-    else:
-        season_name = f'第 {season_number} 季'
+def wait_for_title(driver):
+    wait_for_page_ready(driver)
+    wait_quietly(driver, lambda d: d.find_elements(By.CSS_SELECTOR, 'h1[data-automation-id="title"]'), 'primevideo_title')
 
-    season_description_element = driver.find_elements(By.CSS_SELECTOR, 'span._1H6ABQ')
-    season_description = season_description_element[0].text.strip() if season_description_element else description
+def wait_for_episodes(driver):
+    wait_quietly(driver, lambda d: d.find_elements(By.CSS_SELECTOR, 'li[id^="av-ep-episodes-"]'), 'primevideo_episodes')
+
+def extract_season_info(page, season_number, description):
+    # 獲取季數名稱
+    season_name = next((row['text'] for row in page['season_names'] if '第' in row['text'] and '季' in row['text']), f'第 {season_number} 季')
+    season_description = page['descriptions'][0]['text'] if page['descriptions'] else description
 
     logging.info(f"找到季數: {season_name}")
     logging.info(f"季數描述: {season_description}")
 
-    return season_number, season_name, season_description
+    return season_name, season_description
 
-def extract_primevideo_seasons_and_episodes(driver, output_path, title, description):
+def extract_primevideo_seasons_and_episodes(driver, title, description):
     episodes = []
     seasons = []
 
     try:
         # 檢查是否有下拉式季數選單
-        season_elements = driver.find_elements(By.CSS_SELECTOR, 'div._3R4jka ul li a')
-        if season_elements:
-            season_links = [elem.get_attribute('href') for elem in season_elements if elem.get_attribute('href')]
+        season_rows = extract_page(driver, {'links': {'items': 'div._3R4jka ul li a', 'fields': {'href': (None, '.href')}}})['links']
+        if season_rows:
+            season_links = [row['href'] for row in season_rows if row['href']]
         else:
             # 處理只有一季的情況
             season_links = [driver.current_url]
@@ -99,84 +123,87 @@ def extract_primevideo_seasons_and_episodes(driver, output_path, title, descript
         if not season_links:
             logging.error("未找到任何季數連結")
             # 直接抓取當前頁面的劇集資料
-            season_number = 1
-            season_number, season_name, season_description = extract_season_info(driver, season_number, title, description)
-            extract_single_season_episodes(driver, output_path, season_number, season_name, season_description)
+            season, season_episodes = extract_season_page(driver, 1, title, description)
+            return [season], season_episodes
         else:
-            for idx, season_link in enumerate(season_links):
-                logging.info(f"正在處理季數連結: {season_link}")
-                season_number = idx + 1
-                driver.get(season_link)
-                time.sleep(3)  # 等待頁面加載
-                season_number, season_name, season_description = extract_season_info(driver, season_number, title, description)
-                seasons.append([season_number, season_name, season_description])
-
-                # 獲取每一集的資料
-                episode_elements = driver.find_elements(By.CSS_SELECTOR, 'li[id^="av-ep-episodes-"]')
-                logging.info(f"季數 {season_number} 找到 {len(episode_elements)} 集")
-                for episode_element in episode_elements:
-                    try:
-                        episode_info = episode_element.find_element(By.CSS_SELECTOR, 'span._36qUej').text
-                        episode_number_match = re.search(r'季第 \d+ 集(\d+)', episode_info)
-                        episode_number = int(episode_number_match.group(1)) if episode_number_match else None
-                        episode_title = episode_element.find_element(By.CSS_SELECTOR, 'span.P1uAb6').text
-                        episode_description = episode_element.find_element(By.CSS_SELECTOR, 'div._3qsVvm.e8yjMf > div[dir="auto"]').text
-
-                        episodes.append([season_number, episode_number, episode_title, episode_description])
-                        logging.info(f"季數 {season_number} 第 {episode_number} 集 - 標題: {episode_title}")
-                    except Exception as e:
-                        logging.error(f"抓取劇集資料時發生錯誤: {e}")
-
-        # 無論是否找到季數連結，都嘗試保存資料
-        save_seasons_info_to_excel(seasons, output_path)
-        save_episodes_info_to_excel(episodes, output_path)
+            for season, season_episodes in iter_season_pages(driver, season_links, title, description):
+                seasons.append(season)
+                episodes.extend(season_episodes)
 
     except Exception as e:
         logging.error(f"抓取季數資料時發生錯誤: {e}")
 
-def extract_single_season_episodes(driver, output_path, season_number, season_name, season_description):
+    # 無論是否找到季數連結，都返回已抓取的資料
+    return seasons, episodes
+
+# 讀取目前分頁的一季，返回 (Season, 集數列表)
+def extract_season_page(driver, season_number, title, description):
+    page = extract_page(driver, SEASON_PAGE_SELECTORS)
+    season_name, season_description = extract_season_info(page, season_number, description)
     episodes = []
+    # 獲取每一集的資料
+    logging.info(f"季數 {season_number} 找到 {len(page['episodes'])} 集")
+    for row in page['episodes']:
+        if row['info'] is None or row['title'] is None or row['description'] is None:
+            logging.error(f"抓取劇集資料時發生錯誤: 缺少集數資料 {row}")
+            continue
+        episode_number_match = re.search(r'季第 \d+ 集(\d+)', row['info'])
+        episode_number = int(episode_number_match.group(1)) if episode_number_match else None
+        episodes.append(Episode(season_number, episode_number, row['title'], row['description']))
+        logging.info(f"季數 {season_number} 第 {episode_number} 集 - 標題: {row['title']}")
+    return Season(season_name, season_number, season_description), episodes
+
+def get_parallel_tabs(driver):
+    profile = getattr(driver, 'browser_profile', None) or DEFAULT_BROWSER_PROFILE
+    return max(1, int(profile.get('parallel_tabs', 1)))
+
+# 按季數順序逐季返回 (Season, 集數列表)
+# 季數頁面會同時在最多 parallel_tabs 個分頁載入 (見 open_tab，不會等待載入完成)，
+# 再逐個切換到分頁讀取，讀完即關閉分頁並開啟下一季
+def iter_season_pages(driver, season_links, title, description):
+    max_tabs = get_parallel_tabs(driver)
+    if max_tabs == 1 or len(season_links) == 1:
+        for season_number, season_link in enumerate(season_links, 1):
+            logging.info(f"正在處理季數連結: {season_link}")
+            driver.get(season_link)
+            wait_for_page_ready(driver)
+            wait_for_episodes(driver)
+            yield extract_season_page(driver, season_number, title, description)
+        return
+
+    original_handle = driver.current_window_handle
+    pending = list(enumerate(season_links, 1))
+    open_tabs = []
     try:
-        # 獲取每一集的資料
-        episode_elements = driver.find_elements(By.CSS_SELECTOR, 'li[id^="av-ep-episodes-"]')
-        logging.info(f"找到 {len(episode_elements)} 集")
-        for episode_element in episode_elements:
+        while pending or open_tabs:
+            while pending and len(open_tabs) < max_tabs:
+                season_number, season_link = pending.pop(0)
+                open_tabs.append((season_number, season_link, open_tab(driver, season_link)))
+            season_number, season_link, handle = open_tabs.pop(0)
+            logging.info(f"正在處理季數連結: {season_link}")
+            driver.switch_to.window(handle)
             try:
-                episode_info = episode_element.find_element(By.CSS_SELECTOR, 'span._36qUej').text
-                episode_number_match = re.search(r'季第 \d+ 集(\d+)', episode_info)
-                episode_number = int(episode_number_match.group(1)) if episode_number_match else None
-                episode_title = episode_element.find_element(By.CSS_SELECTOR, 'span.P1uAb6').text
-                episode_description = episode_element.find_element(By.CSS_SELECTOR, 'div._3qsVvm.e8yjMf > div[dir="auto"]').text
-
-                episodes.append([season_number, episode_number, episode_title, episode_description])
-                logging.info(f"季數 {season_number} 第 {episode_number} 集 - 標題: {episode_title}")
-            except Exception as e:
-                logging.error(f"抓取劇集資料時發生錯誤: {e}")
-
-        save_episodes_info_to_excel(episodes, output_path)
-        save_seasons_info_to_excel([[season_number, season_name, season_description]], output_path)
-
-    except Exception as e:
-        logging.error(f"抓取劇集資料時發生錯誤: {e}")
-
-def save_movie_info_to_excel(movie_title, movie_description, output_path):
-    movie_data = {'Movie Title': [movie_title], 'Movie Description': [movie_description]}
-    movie_df = pd.DataFrame(movie_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        movie_df.to_excel(writer, sheet_name='Movies', index=False)
-
-def save_series_info_to_excel(tv_show_title, tv_show_description, output_path):
-    title_data = {'Series Title': [tv_show_title], 'Series Description': [tv_show_description]}
-    title_df = pd.DataFrame(title_data)
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        title_df.to_excel(writer, sheet_name='Title', index=False)
-
-def save_seasons_info_to_excel(seasons, output_path):
-    seasons_df = pd.DataFrame(seasons, columns=['Season Number', 'Season Name', 'Season Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        seasons_df.to_excel(writer, sheet_name='Seasons', index=False)
-
-def save_episodes_info_to_excel(episodes, output_path):
-    episodes_df = pd.DataFrame(episodes, columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description'])
-    with pd.ExcelWriter(output_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        episodes_df.to_excel(writer, sheet_name='Episodes', index=False)
+                wait_for_page_ready(driver)
+                wait_for_episodes(driver)
+                season_page = extract_season_page(driver, season_number, title, description)
+            finally:
+                driver.close()
+                driver.switch_to.window(original_handle)
+            yield season_page
+    finally:
+        # 出錯時關閉剩下的分頁
+        for _, _, handle in open_tabs:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(original_handle)
+
+# 先開啟空白分頁並套用精簡設定 (封鎖圖片、字型及追蹤等)，再設定網址開始載入，然後切換回原本的分頁
+def open_tab(driver, url):
+    current_handle = driver.current_window_handle
+    # Selenium 4 的 new_window 會開啟空白分頁並切換過去
+    driver.switch_to.new_window('tab')
+    handle = driver.current_window_handle
+    apply_profile_to_current_tab(driver)
+    driver.execute_script("window.location.href = arguments[0];", url)
+    driver.switch_to.window(current_handle)
+    return handle
@@ -0,0 +1,50 @@
+import importlib
+import re
+from dataclasses import dataclass
+from extractors.video_keys import extract_netflix_video_id, extract_appletv_video_id, extract_disneyplus_video_id, extract_primevideo_video_id
+
+# 影音網站的 extractor 登記表：網址符合 pattern 的平台由 module 內的 function(driver, url) 抓取
+# module 在第一次處理該平台的網址時才會 import，selenium、pandas 等依賴亦會在那時才載入
+# 新增平台只需調用 register_extractor，例如
+#   register_extractor('viu', r'viu\.com/', 'extractors.viu_extractor', 'extract_viu_data', video_id=extract_viu_video_id)
+@dataclass(slots=True)
+class ExtractorEntry:
+    platform: str
+    pattern: re.Pattern
+    module: str
+    function: str
+    # 抓取資料所用的語言
+    locale: str = 'zh-HK'
+    # video_id(url) 返回影片 ID，用於資料庫和暫存的索引
+    video_id: object = None
+    loaded: object = None
+
+    def load(self):
+        if self.loaded is None:
+            self.loaded = getattr(importlib.import_module(self.module), self.function)
+        return self.loaded
+
+EXTRACTORS = []
+
+# 同一平台再次登記會取代原有的設定
+def register_extractor(platform, pattern, module, function, locale='zh-HK', video_id=None):
+    entry = ExtractorEntry(platform, re.compile(pattern), module, function, locale, video_id)
+    EXTRACTORS[:] = [existing for existing in EXTRACTORS if existing.platform != platform]
+    EXTRACTORS.append(entry)
+    return entry
+
+def find_extractor(url):
+    return next((entry for entry in EXTRACTORS if entry.pattern.search(url)), None)
+
+# 從影音網址取得 (平台, 影片 ID, 語言)，不支援的網址返回 None
+def identify_video(url):
+    entry = find_extractor(url)
+    video_id = entry.video_id(url) if entry is not None and entry.video_id is not None else None
+    if not video_id:
+        return None
+    return entry.platform, video_id, entry.locale
+
+register_extractor('netflix', r'netflix\.com', 'extractors.netflix_extractor', 'extract_netflix_episodes', 'zh-HK', extract_netflix_video_id)
+register_extractor('appletv', r'tv\.apple\.com', 'extractors.appletv_extractor', 'extract_appletv_data', 'zh-HK', extract_appletv_video_id)
+register_extractor('disneyplus', r'disneyplus\.com', 'extractors.disneyplus_extractor', 'extract_disneyplus_data', 'zh-HK', extract_disneyplus_video_id)
+register_extractor('primevideo', r'primevideo\.com', 'extractors.primevideo_extractor', 'extract_primevideo_data', 'zh-TW', extract_primevideo_video_id)
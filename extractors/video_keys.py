@@ -0,0 +1,28 @@
+import re
+import urllib.parse
+
+# 從各平台的網址取得影片 ID，只用標準庫，不會載入 extractor 模組 (見 extractors.registry)
+
+def extract_netflix_video_id(url):
+    parsed_url = urllib.parse.urlparse(url)
+    query_params = urllib.parse.parse_qs(parsed_url.query)
+    path_segments = parsed_url.path.split('/')
+    if 'jbv' in query_params:
+        return query_params['jbv'][0]
+    for segment in path_segments:
+        if segment.isdigit():
+            return segment
+    return None
+
+def extract_appletv_video_id(url):
+    match = re.search(r'(umc\.cmc\.[a-z0-9]+)', url)
+    return match.group(1) if match else None
+
+def extract_disneyplus_video_id(url):
+    # 例如 /zh-hk/series/name/6kbOrabvD3ZO 或 /zh-hk/browse/entity-xxxx，取最後一段
+    path_segments = [segment for segment in urllib.parse.urlparse(url).path.split('/') if segment]
+    return path_segments[-1] if path_segments else None
+
+def extract_primevideo_video_id(url):
+    match = re.search(r'/(?:detail|dp)/(?:[^/]+/)?([A-Za-z0-9]{10,})', url)
+    return match.group(1) if match else None
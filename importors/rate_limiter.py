@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from others.metrics import METRICS
+
+# TMDB 提交速率的 token bucket，以 AIMD 方式調整速率 (每秒提交次數)：
+#   成功且耗時正常    每次加 increase，最多 max_rate
+#   成功但耗時過長    乘以 slow_factor (耗時超過 slow_ratio 倍的最佳耗時，且超過 slow_seconds 秒)
+#   TMDB 限流或出錯   乘以 backoff_factor，最少 min_rate；有 Retry-After 時該段時間內不會再提交
+# 多個 TMDB session (分流上載、批次模式) 共用同一個 limiter，合計的速率不會超過限制
+class AdaptiveRateLimiter:
+    def __init__(self, rate=2.0, min_rate=0.2, max_rate=10.0, burst=2, increase=0.1,
+                 backoff_factor=0.5, slow_factor=0.8, slow_ratio=3.0, slow_seconds=5.0, log_every=20):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.burst = burst
+        self.increase = increase
+        self.backoff_factor = backoff_factor
+        self.slow_factor = slow_factor
+        self.slow_ratio = slow_ratio
+        self.slow_seconds = slow_seconds
+        self.log_every = log_every
+        self.lock = threading.Lock()
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        # TMDB 的 Retry-After 要求暫停至這個時間
+        self.paused_until = 0.0
+        # 最快一次成功提交的耗時，作為判斷變慢的基準
+        self.best_latency = None
+        self.submissions = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    # 每次提交前調用，沒有 token 時等待
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            METRICS.count('rate_limit_waits')
+            with METRICS.phase('rate_limit'):
+                time.sleep(wait_seconds)
+
+    # 提交完成後調用；throttled 表示 TMDB 限流或伺服器出錯 (和表單本身的問題無關)，retry_after 為 TMDB 要求等待的秒數
+    def record(self, ok, latency, throttled=False, retry_after=None):
+        with self.lock:
+            self.submissions += 1
+            self.total_latency += latency
+            previous_rate = self.rate
+            if throttled:
+                self.errors += 1
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                if retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+                reason = f"TMDB 限流或出錯，{retry_after} 秒後再提交" if retry_after else "TMDB 限流或出錯"
+            elif ok:
+                if self.best_latency is None or latency < self.best_latency:
+                    self.best_latency = latency
+                if latency > self.slow_seconds and latency > self.best_latency * self.slow_ratio:
+                    self.rate = max(self.min_rate, self.rate * self.slow_factor)
+                    reason = f"提交耗時 {latency:.1f} 秒"
+                else:
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                    reason = ''
+            else:
+                reason = ''
+            rate = self.rate
+            report = self.log_every and self.submissions % self.log_every == 0
+            status = self.status()
+        if rate < previous_rate:
+            METRICS.count('rate_limit_backoffs')
+            logging.warning(f"TMDB 提交速率由每秒 {previous_rate:.2f} 次降至 {rate:.2f} 次 ({reason})")
+        elif report:
+            logging.info(status)
+
+    def status(self):
+        average = self.total_latency / self.submissions if self.submissions else 0.0
+        return (f"TMDB 提交速率: 每秒 {self.rate:.2f} 次 (上限 {self.max_rate:.2f})，"
+                f"已提交 {self.submissions} 次，平均耗時 {average:.2f} 秒，限流或出錯 {self.errors} 次")
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from others.video_models import VideoDetail
+from others.excel_export import load_video_detail
+
+# 同時登入 TMDB 的 session 數量上限，避免對 TMDB 造成太大壓力
+MAX_TMDB_SESSIONS = 4
+
+# 將季數和集數平均分配到各個 session (輪流分配，令每個 session 的工作量接近)
+def shard_rows(items, num_shards):
+    return [items[i::num_shards] for i in range(num_shards)]
+
+# 返回合併各 session 結果後的總結 (由調用者顯示，見 tmdb_importer.print_upload_summary)，失敗的項目逐項以 WARNING 記錄
+# 有 rate_limiter (importors.rate_limiter.AdaptiveRateLimiter) 時一併返回目前的提交速率
+def summarize_results(results, rate_limiter=None):
+    skipped = sum(1 for result in results if result.get('skipped'))
+    succeeded = sum(1 for result in results if result['ok']) - skipped
+    failed = [result for result in results if not result['ok']]
+    # matched 為和 TMDB 季數頁面現有資料相同而沒有提交的集數 (見 TMDBUploader.filter_episodes)
+    matched = sum(1 for result in results if result.get('matched'))
+    lines = [f"上載完成: 共 {len(results)} 項，成功 {succeeded} 項，沒有改變或已上載而跳過 {skipped - matched} 項，"
+             f"和 TMDB 現有資料相同而跳過 {matched} 項，失敗 {len(failed)} 項"]
+    if rate_limiter is not None:
+        lines.append(rate_limiter.status())
+    for result in failed:
+        if result['item'] == 'series':
+            logging.warning("劇集資料上載失敗")
+        elif result['item'] == 'movie':
+            logging.warning("電影資料上載失敗")
+        elif result['item'] == 'season':
+            logging.warning(f"第 {result['season']} 季上載失敗")
+        else:
+            logging.warning(f"第 {result['season']} 季第 {result['episode']} 集上載失敗")
+    return lines
+
+# 用多個已登入的 TMDBUploader 同時上載一套劇集的季數和集數資料
+# primary_uploader 是已經登入的 session，另外的 session 會用 create_uploader 建立並登入，完成後會關閉
+# data 可以是 VideoDetail 或 Excel 路徑
+def upload_series_sharded(primary_uploader, url, data, create_uploader, sessions=2):
+    detail = data if isinstance(data, VideoDetail) else load_video_detail(data)
+    sessions = max(1, min(sessions, MAX_TMDB_SESSIONS))
+
+    # 劇集資料只有一項，由第一個 session 先處理
+    info_results = primary_uploader.update_info(url, detail)
+    # 和 TMDB 現有資料比較亦由第一個 session 先處理，每季的頁面只載入一次，各 session 只會分到需要提交的集數
+    episodes, skipped_results = primary_uploader.filter_episodes(url, detail.episodes)
+
+    sessions = max(1, min(sessions, len(detail.seasons) + len(episodes)))
+    season_shards = shard_rows(detail.seasons, sessions)
+    episode_shards = shard_rows(episodes, sessions)
+    logging.info(f"使用 {sessions} 個 TMDB session 上載 {len(detail.seasons)} 季、{len(episodes)} 集")
+
+    extra_uploaders = []
+
+    def run_shard(shard_index):
+        if shard_index == 0:
+            uploader = primary_uploader
+        else:
+            try:
+                uploader = create_uploader()
+                uploader.journal = primary_uploader.journal
+                uploader.rate_limiter = primary_uploader.rate_limiter
+                extra_uploaders.append(uploader)
+            except Exception as e:
+                # 登入失敗時，這個 session 負責的項目全部記為失敗
+                logging.error(f"第 {shard_index + 1} 個 TMDB session 登入失敗: {e}")
+                return [{'item': 'season', 'season': season.number, 'episode': None, 'ok': False, 'skipped': False}
+                        for season in season_shards[shard_index]] + \
+                       [{'item': 'episode', 'season': episode.season_number, 'episode': episode.episode_number, 'ok': False, 'skipped': False}
+                        for episode in episode_shards[shard_index]]
+        results = uploader.update_seasons(url, detail, season_shards[shard_index])
+        results += uploader.submit_episodes(url, episode_shards[shard_index])
+        return results
+
+    results = list(skipped_results)
+    try:
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            for shard_results in executor.map(run_shard, range(sessions)):
+                results.extend(shard_results)
+    finally:
+        for uploader in extra_uploaders:
+            uploader.close()
+
+    # 合併各 session 的結果，按季數和集數排序
+    results.sort(key=lambda result: (result['item'] != 'season', result['season'] or 0, result['episode'] or 0))
+    # 失敗的項目由第一個 session 再上載一次
+    return primary_uploader.retry_failed(url, detail, info_results + results)
@@ -0,0 +1,173 @@
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlparse
+import logging
+from importors.tmdb_uploader import TMDBUploader, TMDB_BASE_URL
+from others.metrics import timed, METRICS
+
+# 視為 TMDB 限流或伺服器出錯的狀態碼
+THROTTLE_STATUS = {429, 500, 502, 503, 504}
+
+# Retry-After 標頭的秒數，沒有或為日期格式時返回 None
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.strip().isdigit() else None
+
+# 提交後的頁面有這些元素表示 TMDB 重新顯示表單並列出錯誤，提交沒有成功
+FORM_ERROR_SELECTORS = '.errors, .error_explanation, .field_with_errors, .alert-danger, .k-notification-error'
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+
+# 不經瀏覽器，直接用 HTTP 提交 TMDB 的編輯表單
+# 登入一次後重用同一個 session 的連線和 cookies，用法和 TMDBUploader 相同
+class TMDBHttpUploader(TMDBUploader):
+    def __init__(self, username, password, ledger=None, base_url=TMDB_BASE_URL, pool_size=4, timeout=30, session_store=None, compare_with_tmdb=True):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'zh-HK,zh;q=0.9'})
+        self.page_url = None
+        self.page = None
+        super().__init__(None, username, password, ledger, base_url, session_store, compare_with_tmdb)
+
+    def login(self):
+        if self.restore_session():
+            return
+        response = self.session.get(f"{self.base_url}/login", timeout=self.timeout)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+        username_field = soup.find('input', {'name': 'username'})
+        if username_field is None or username_field.find_parent('form') is None:
+            raise RuntimeError("找不到 TMDB 登入表單")
+        form = username_field.find_parent('form')
+        data = self.form_fields(form)
+        data['username'] = self.username
+        data['password'] = self.password
+
+        response = self.session.post(self.form_action(form, response.url), data=data, timeout=self.timeout)
+        response.raise_for_status()
+        # 登入失敗會停留在登入頁面並再次顯示登入表單
+        if BeautifulSoup(response.text, 'html.parser').find('input', {'name': 'password'}):
+            raise RuntimeError("TMDB 登入失敗，請檢查 username 和 password")
+        logging.info("Logged in to TMDB via HTTP.")
+        if self.session_store is not None:
+            self.session_store.save_requests(self.session, 'tmdb', self.base_url)
+
+    def restore_session(self):
+        if self.session_store is None or not self.session_store.restore_requests(self.session, 'tmdb'):
+            return False
+        response = self.session.get(f"{self.base_url}/settings/account", timeout=self.timeout)
+        if response.ok and '/login' not in response.url:
+            logging.info("Restored TMDB session via HTTP.")
+            return True
+        logging.info("Saved TMDB session expired, logging in again.")
+        self.session.cookies.clear()
+        self.session_store.forget('tmdb')
+        return False
+
+    def accept_cookies(self):
+        pass
+
+    def is_throttled(self, error, page_load=False):
+        if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            return True
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code in THROTTLE_STATUS:
+            self.retry_after = retry_after_seconds(response)
+            return True
+        return False
+
+    def check_and_add_translation(self):
+        # 新增翻譯需要執行頁面上的 JavaScript，HTTP 模式無法處理
+        logging.warning("zh-HK translation is missing, please add it on TMDB or use the browser backend.")
+        return False
+
+    def load_page_html(self, url):
+        METRICS.count('page_loads')
+        with METRICS.phase('page_load', url=url):
+            response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def open_edit_page(self, url):
+        METRICS.count('page_loads')
+        with METRICS.phase('page_load', url=url):
+            response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self.page_url = response.url
+        with METRICS.phase('parse'):
+            self.page = BeautifulSoup(response.text, 'html.parser')
+
+    def close(self):
+        if self.ledger is not None:
+            self.ledger.close()
+        self.session.close()
+
+    @staticmethod
+    def form_action(form, page_url):
+        return urljoin(page_url, form.get('action') or page_url)
+
+    # 收集表單內所有欄位目前的值 (包括 CSRF token 等隱藏欄位)
+    @staticmethod
+    def form_fields(form):
+        data = {}
+        for field in form.find_all(['input', 'textarea', 'select']):
+            name = field.get('name')
+            if not name or field.has_attr('disabled'):
+                continue
+            if field.name == 'textarea':
+                data[name] = field.get_text()
+            elif field.name == 'select':
+                option = field.find('option', selected=True) or field.find('option')
+                data[name] = option.get('value', option.get_text()) if option else ''
+            else:
+                field_type = field.get('type', 'text').lower()
+                if field_type in ('submit', 'button', 'image', 'file', 'reset'):
+                    continue
+                if field_type in ('checkbox', 'radio') and not field.has_attr('checked'):
+                    continue
+                data[name] = field.get('value', '')
+        return data
+
+    # 狀態碼正常亦可能未成功：登入狀態失效會轉到登入頁，內容有問題時 TMDB 會重新顯示編輯表單及錯誤訊息
+    @staticmethod
+    def check_submit_response(response):
+        if urlparse(response.url).path.rstrip('/').endswith('/login'):
+            raise RuntimeError("TMDB session expired, redirected to login page")
+        soup = BeautifulSoup(response.text, 'html.parser')
+        if soup.find('input', {'name': 'password'}):
+            raise RuntimeError("TMDB session expired, redirected to login page")
+        error = soup.select_one(FORM_ERROR_SELECTORS)
+        if error is not None:
+            raise RuntimeError(f"TMDB rejected the form: {error.get_text(' ', strip=True)}")
+
+    @timed('tmdb_submit')
+    def check_and_fill_form(self, title_field_id, overview_field_id, title, description, skip_empty_overview=False):
+        try:
+            name_field = self.page.find(id=title_field_id) if self.page else None
+            if name_field is None:
+                raise ValueError(f"field {title_field_id} not found")
+            overview_field = self.page.find(id=overview_field_id)
+            form = name_field.find_parent('form')
+
+            data = self.form_fields(form)
+            data[name_field['name']] = str(title)
+            logging.info(f"Updated title: {title}")
+
+            if not skip_empty_overview or (description and str(description).strip() != 'nan'):
+                logging.info("Updating description...")
+                data[overview_field['name']] = str(description)
+
+            response = self.session.post(self.form_action(form, self.page_url), data=data, timeout=self.timeout)
+            response.raise_for_status()
+            self.check_submit_response(response)
+            logging.info("Successfully updated the information.")
+            self.last_error = ''
+            return True
+        except Exception as e:
+            self.record_failure(e)
+            logging.warning(f"No translation found or other issue: {e}")
+            return False
@@ -1,33 +1,124 @@
-import os
-import pandas as pd
-from selenium import webdriver
+import re
+import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import time
+from selenium.common.exceptions import TimeoutException
 import logging
+from others.wait_utils import wait_for_element, wait_for_staleness, wait_for_invisibility, wait_quietly, wait_for_page_ready
+from others.browser_profile import apply_site_profile
+from others.video_models import VideoDetail
+from others.excel_export import load_video_detail
+from others.metrics import timed
+from extractors.page_snapshot import parse_html
+
+# 上載到 TMDB 的語言
+LANGUAGE = 'zh-HK'
+
+TMDB_BASE_URL = 'https://www.themoviedb.org'
+
+# TMDB 季數頁面只需要解析集數列表
+SEASON_PAGE_TARGETS = [('div', 'class', 'episode_list')]
+EPISODE_LINK = re.compile(r'/season/\d+/episode/(\d+)')
+
+# TMDB 限流或伺服器出錯時錯誤頁面的標題
+THROTTLE_PAGE_TITLES = ('Too Many Requests', 'Service Unavailable', 'Bad Gateway', 'Gateway Timeout', 'Internal Server Error')
+
+# 解析 TMDB 季數頁面 (/tv/<ID>/season/<季數>?language=zh-HK)，返回 {集數: (標題, 簡介)}
+# 沒有 zh-HK 翻譯的集數 TMDB 會顯示其他語言的標題，和抓取的資料比較時自然不同，仍然會提交
+def parse_season_page(html):
+    soup = parse_html(html, SEASON_PAGE_TARGETS)
+    episodes = {}
+    for card in soup.select('div.episode_list div.card'):
+        link = card.select_one('div.episode_title a') or card.select_one('h3 a')
+        match = EPISODE_LINK.search(link.get('href', '')) if link is not None else None
+        number_element = card.select_one('span.episode_number')
+        if match:
+            episode_number = int(match.group(1))
+        elif number_element is not None and number_element.get_text(strip=True).isdigit():
+            episode_number = int(number_element.get_text(strip=True))
+        else:
+            continue
+        title_element = card.select_one('div.episode_title h3') or link
+        overview_element = card.select_one('div.overview')
+        episodes[episode_number] = (title_element.get_text(' ', strip=True) if title_element is not None else '',
+                                    overview_element.get_text(' ', strip=True) if overview_element is not None else '')
+    return episodes
+
+# 季數或集數的整數值，None、NaN 或不是數字時返回 None
+def parse_number(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def normalize_text(value):
+    value = '' if value is None else ' '.join(str(value).split())
+    return '' if value == 'nan' else value
+
+# 抓取的標題和簡介和 TMDB 現有的是否相同；沒有簡介的集數不會提交簡介 (skip_empty_overview)，只比較標題
+def matches_current(current, title, description):
+    if current is None:
+        return False
+    current_title, current_overview = current
+    if normalize_text(title) != normalize_text(current_title):
+        return False
+    return not normalize_text(description) or normalize_text(description) == normalize_text(current_overview)
 
 class TMDBUploader:
-    def __init__(self, driver, username, password):
+    # session_store 為 others.session_store.SessionStore，有保存的登入狀態時會先嘗試還原
+    # compare_with_tmdb=True 時，上載集數前會先載入每季的 TMDB 頁面，和現有 zh-HK 資料相同的集數不會提交
+    def __init__(self, driver, username, password, ledger=None, base_url=TMDB_BASE_URL, session_store=None, compare_with_tmdb=True):
         self.driver = driver
         self.username = username
         self.password = password
+        self.ledger = ledger
+        self.base_url = base_url.rstrip('/')
+        self.session_store = session_store
+        self.compare_with_tmdb = compare_with_tmdb
+        # 由調用者設定 (importors.upload_journal.UploadJournal)，記錄每個編輯頁面的提交結果
+        self.journal = None
+        # 由調用者設定 (importors.rate_limiter.AdaptiveRateLimiter)，每次提交前取得 token，並回報耗時及是否被限流
+        self.rate_limiter = None
+        # 最近一次提交失敗的原因，throttled 表示失敗是因為 TMDB 限流或出錯，retry_after 為 TMDB 要求等待的秒數
+        self.last_error = ''
+        self.throttled = False
+        self.retry_after = None
         self.login()
 
     def login(self):
-        self.driver.get("https://www.themoviedb.org/login")
-        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.NAME, "username"))).send_keys(self.username)
+        if self.restore_session():
+            return
+        apply_site_profile(self.driver, 'tmdb_login')
+        self.driver.get(f"{self.base_url}/login")
+        wait_for_element(self.driver, (By.NAME, "username"), 'tmdb_login').send_keys(self.username)
         self.driver.find_element(By.NAME, "password").send_keys(self.password, Keys.RETURN)
-        time.sleep(1)
+        # 等待登入後離開登入頁面
+        wait_quietly(self.driver, lambda d: '/login' not in d.current_url, 'tmdb_login')
         logging.info("Logged in to TMDB.")
         self.accept_cookies()
+        apply_site_profile(self.driver, 'tmdb')
+        if self.session_store is not None:
+            self.session_store.save(self.driver, 'tmdb')
+
+    # 還原保存的登入狀態，再打開需要登入的設定頁確認，未登入時 TMDB 會轉到登入頁
+    def restore_session(self):
+        if self.session_store is None or not self.session_store.restore(self.driver, 'tmdb'):
+            return False
+        apply_site_profile(self.driver, 'tmdb')
+        self.driver.get(f"{self.base_url}/settings/account")
+        wait_for_page_ready(self.driver)
+        if '/login' in self.driver.current_url:
+            logging.info("Saved TMDB session expired, logging in again.")
+            self.session_store.forget('tmdb')
+            return False
+        logging.info("Restored TMDB session.")
+        return True
 
     def accept_cookies(self):
         try:
             accept_button = self.driver.find_element(By.ID, "onetrust-accept-btn-handler")
             accept_button.click()
-            time.sleep(1)
+            wait_for_invisibility(self.driver, (By.ID, "onetrust-accept-btn-handler"), 'tmdb_cookies')
             logging.info("Accepted cookies.")
         except:
             logging.info("No cookies to accept or already accepted.")
@@ -37,80 +128,286 @@ class TMDBUploader:
             add_translation_button = self.driver.find_element(By.CSS_SELECTOR, "button.k-button.k-primary.pad_top.background_color.light_blue.translate")
             if add_translation_button:
                 add_translation_button.click()
-                time.sleep(3)  # 按下新增翻譯後等待 3 秒
+                # 按下新增翻譯後等待按鈕消失
+                wait_for_staleness(self.driver, add_translation_button, 'tmdb_translation')
                 logging.info("Added translation for zh-HK.")
                 return True
         except:
             logging.info("No translation needed or already present.")
         return False
 
+    def open_edit_page(self, url):
+        apply_site_profile(self.driver, 'tmdb')
+        self.driver.get(url)
+
+    # 返回頁面載入完成後的 HTML
+    def load_page_html(self, url):
+        apply_site_profile(self.driver, 'tmdb')
+        self.driver.get(url)
+        wait_for_page_ready(self.driver)
+        return self.driver.page_source
+
+    # 打開編輯頁面並提交表單，載入頁面失敗 (例如斷線) 亦只會返回 False，原因記在 last_error
+    def submit_edit_page(self, edit_url, title_field_id, overview_field_id, title, description, skip_empty_overview=False):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.throttled = False
+        self.retry_after = None
+        start_time = time.monotonic()
+        try:
+            self.open_edit_page(edit_url)
+        except Exception as e:
+            self.record_failure(e, page_load=True)
+            logging.warning(f"Failed to open {edit_url}: {e}")
+            ok = False
+        else:
+            ok = self.check_and_fill_form(title_field_id, overview_field_id, title, description, skip_empty_overview)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(ok, time.monotonic() - start_time, self.throttled, self.retry_after)
+        return ok
+
+    # page_load=True 表示載入編輯頁面時出錯
+    def record_failure(self, error, page_load=False):
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.throttled = self.is_throttled(error, page_load)
+
+    # 載入頁面超時或顯示 TMDB 的錯誤頁面才視為 TMDB 限流或變慢
+    # 等待表單欄位超時通常是該項目未有 zh-HK 翻譯，只記為一般失敗，不會降低提交速率
+    def is_throttled(self, error, page_load=False):
+        if page_load and isinstance(error, TimeoutException):
+            return True
+        try:
+            page_title = self.driver.title or ''
+        except Exception:
+            return False
+        return any(marker in page_title for marker in THROTTLE_PAGE_TITLES)
+
+    def close(self):
+        if self.ledger is not None:
+            self.ledger.close()
+        self.driver.quit()
+
     def extract_tv_show_id(self, url):
         return url.split('/tv/')[1].split('?')[0].split('/')[0]
 
     def extract_movie_id(self, url):
         return url.split('/movie/')[1].split('?')[0].split('/')[0]
 
-    def update_series_info(self, url, excel_path):
+    def is_unchanged(self, media_type, tmdb_id, season, episode, title, description):
+        return self.ledger is not None and self.ledger.is_unchanged(media_type, tmdb_id, season, episode, LANGUAGE, title, description)
+
+    def record_upload(self, media_type, tmdb_id, season, episode, title, description):
+        if self.ledger is not None:
+            self.ledger.record(media_type, tmdb_id, season, episode, LANGUAGE, title, description)
+
+    def edit_url(self, media_type, tmdb_id, season=None, episode=None):
+        url = f"{self.base_url}/{media_type}/{tmdb_id}"
+        if season is not None:
+            url += f"/season/{season}"
+        if episode is not None:
+            url += f"/episode/{episode}"
+        return f"{url}/edit?language={LANGUAGE}"
+
+    def season_url(self, tv_show_id, season_number):
+        return f"{self.base_url}/tv/{tv_show_id}/season/{season_number}?language={LANGUAGE}"
+
+    # 一季所有集數在 TMDB 現有的 zh-HK 標題和簡介，載入失敗時返回 None
+    def fetch_season_episodes(self, tv_show_id, season_number):
+        url = self.season_url(tv_show_id, season_number)
+        try:
+            return parse_season_page(self.load_page_html(url))
+        except Exception as e:
+            logging.warning(f"Failed to load {url}, all episodes of season {season_number} will be submitted: {e}")
+            return None
+
+    # resume 模式下，journal 內已成功提交的編輯頁面不會再上載
+    def is_journaled(self, edit_url):
+        return self.journal is not None and self.journal.is_done(edit_url)
+
+    def record_journal(self, edit_url, item, season, episode, ok):
+        if self.journal is not None:
+            self.journal.record(edit_url, item, season, episode, ok, self.last_error)
+
+    # 返回 (是否成功, 是否因已提交或沒有改變而跳過)，和 filter_episodes 一樣分開計算跳過的項目
+    def update_series_info(self, url, detail):
         tv_show_id = self.extract_tv_show_id(url)
-        self.driver.get(f"https://www.themoviedb.org/tv/{tv_show_id}/edit?language=zh-HK")
-        logging.info(f"Updating series info for URL: https://www.themoviedb.org/tv/{tv_show_id}/edit?language=zh-HK")
+        title, description = detail.title, detail.description
+        if not title:
+            logging.warning("No series title to upload.")
+            return False, False
+        edit_url = self.edit_url('tv', tv_show_id)
+        if self.is_journaled(edit_url):
+            logging.info(f"Series info of {tv_show_id} already submitted, skipped.")
+            return True, True
+        if self.is_unchanged('tv', tv_show_id, None, None, title, description):
+            logging.info(f"Series info of {tv_show_id} unchanged since last upload, skipped.")
+            return True, True
 
-        if not self.check_and_fill_form('zh_HK_name', 'zh_HK_overview', excel_path, 'Title'):
+        logging.info(f"Updating series info for URL: {edit_url}")
+        ok = self.submit_edit_page(edit_url, 'zh_HK_name', 'zh_HK_overview', title, description)
+        if not ok:
             if self.check_and_add_translation():
-                self.driver.get(f"https://www.themoviedb.org/tv/{tv_show_id}/edit?language=zh-HK")
-                self.check_and_fill_form('zh_HK_name', 'zh_HK_overview', excel_path, 'Title')
+                ok = self.submit_edit_page(edit_url, 'zh_HK_name', 'zh_HK_overview', title, description)
+        if ok:
+            self.record_upload('tv', tv_show_id, None, None, title, description)
+        self.record_journal(edit_url, 'series', None, None, ok)
+        return ok, False
 
-    def update_seasons(self, url, excel_path):
+    def update_seasons(self, url, detail, seasons=None):
         tv_show_id = self.extract_tv_show_id(url)
+        results = []
 
-        df = pd.read_excel(excel_path, sheet_name='Seasons')
+        for season in detail.seasons if seasons is None else seasons:
+            season_name = season.name
+            season_number = season.number
+            season_description = season.description
+            edit_url = self.edit_url('tv', tv_show_id, season_number)
 
-        for index, row in df.iterrows():
-            season_name = row['Season Name']
-            season_number = row['Season Number']
-            season_description = row['Season Description']
+            if self.is_journaled(edit_url):
+                logging.info(f"Season {season_number} already submitted, skipped.")
+                results.append({'item': 'season', 'season': season_number, 'episode': None, 'ok': True, 'skipped': True})
+                continue
+            if self.is_unchanged('tv', tv_show_id, season_number, None, season_name, season_description):
+                logging.info(f"Season {season_number} unchanged since last upload, skipped.")
+                results.append({'item': 'season', 'season': season_number, 'episode': None, 'ok': True, 'skipped': True})
+                continue
             
-            self.driver.get(f"https://www.themoviedb.org/tv/{tv_show_id}/season/{season_number}/edit?language=zh-HK")
-            logging.info(f"Updating season info for URL: https://www.themoviedb.org/tv/{tv_show_id}/season/{season_number}/edit?language=zh-HK")
+            logging.info(f"Updating season info for URL: {edit_url}")
+            ok = self.submit_edit_page(edit_url, 'zh_HK_name', 'zh_HK_overview', season_name, season_description, skip_empty_overview=True)
+            if ok:
+                self.record_upload('tv', tv_show_id, season_number, None, season_name, season_description)
+            self.record_journal(edit_url, 'season', season_number, None, ok)
+            results.append({'item': 'season', 'season': season_number, 'episode': None, 'ok': ok, 'skipped': False})
+        return results
 
-            self.check_and_fill_form('zh_HK_name', 'zh_HK_overview', excel_path, 'Seasons', season_name, season_description, skip_empty_overview=True)
+    # 返回 (需要提交的集數, 跳過的集數的結果)
+    # 先跳過 journal 內已提交及上次上載後沒有改變的集數，其餘的每季只載入一次 TMDB 季數頁面，和現有資料相同的亦會跳過
+    def filter_episodes(self, url, episodes, compare=True):
+        tv_show_id = self.extract_tv_show_id(url)
+        pending = []
+        results = []
+
+        for episode in episodes:
+            season = episode.season_number
+            episode_number = episode.episode_number
+            # 沒有季數或集數的集數無法組成編輯頁面網址 (集數為 None 時會變成季數的編輯頁面)，記為失敗
+            if parse_number(season) is None or parse_number(episode_number) is None:
+                logging.warning(f"Season {season} episode {episode_number} ({episode.title}) has no usable season or episode number, not submitted.")
+                results.append({'item': 'episode', 'season': season, 'episode': episode_number, 'ok': False, 'skipped': False})
+                continue
+            edit_url = self.edit_url('tv', tv_show_id, season, episode_number)
+
+            if self.is_journaled(edit_url):
+                logging.info(f"Season {season} episode {episode_number} already submitted, skipped.")
+                results.append({'item': 'episode', 'season': season, 'episode': episode_number, 'ok': True, 'skipped': True})
+                continue
+            if self.is_unchanged('tv', tv_show_id, season, episode_number, episode.title, episode.description):
+                logging.info(f"Season {season} episode {episode_number} unchanged since last upload, skipped.")
+                results.append({'item': 'episode', 'season': season, 'episode': episode_number, 'ok': True, 'skipped': True})
+                continue
+            pending.append(episode)
 
-    def update_episodes(self, url, excel_path):
+        if not compare or not self.compare_with_tmdb or not pending:
+            return pending, results
+
+        by_season = {}
+        for episode in pending:
+            by_season.setdefault(episode.season_number, []).append(episode)
+        pending = []
+        for season, season_episodes in by_season.items():
+            current = self.fetch_season_episodes(tv_show_id, season)
+            if current is None:
+                pending += season_episodes
+                continue
+            matched = 0
+            for episode in season_episodes:
+                if matches_current(current.get(parse_number(episode.episode_number)), episode.title, episode.description):
+                    self.record_upload('tv', tv_show_id, season, episode.episode_number, episode.title, episode.description)
+                    results.append({'item': 'episode', 'season': season, 'episode': episode.episode_number, 'ok': True, 'skipped': True, 'matched': True})
+                    matched += 1
+                else:
+                    pending.append(episode)
+            logging.info(f"Season {season}: {matched} of {len(season_episodes)} episodes already match TMDB, skipped.")
+        return pending, results
+
+    def submit_episodes(self, url, episodes):
         tv_show_id = self.extract_tv_show_id(url)
+        results = []
 
-        df = pd.read_excel(excel_path, sheet_name='Episodes')
+        for episode in episodes:
+            season = episode.season_number
+            episode_number = episode.episode_number
+            episode_title = episode.title
+            episode_description = episode.description
+            edit_url = self.edit_url('tv', tv_show_id, season, episode_number)
 
-        for index, row in df.iterrows():
-            season = row['Season Number']
-            episode_number = row['Episode Number']
-            episode_title = row['Episode Title']
-            episode_description = row['Episode Description']
-            
-            self.driver.get(f"https://www.themoviedb.org/tv/{tv_show_id}/season/{season}/episode/{episode_number}/edit?language=zh-HK")
-            logging.info(f"Updating episode info for URL: https://www.themoviedb.org/tv/{tv_show_id}/season/{season}/episode/{episode_number}/edit?language=zh-HK")
+            logging.info(f"Updating episode info for URL: {edit_url}")
+            ok = self.submit_edit_page(edit_url, 'zh_HK_name', 'zh_HK_overview', episode_title, episode_description, skip_empty_overview=True)
+            if ok:
+                self.record_upload('tv', tv_show_id, season, episode_number, episode_title, episode_description)
+            self.record_journal(edit_url, 'episode', season, episode_number, ok)
+            results.append({'item': 'episode', 'season': season, 'episode': episode_number, 'ok': ok, 'skipped': False})
+        return results
 
-            self.check_and_fill_form('zh_HK_name', 'zh_HK_overview', excel_path, 'Episodes', episode_title, episode_description, skip_empty_overview=True)
+    def update_episodes(self, url, detail, episodes=None, compare=True):
+        pending, results = self.filter_episodes(url, detail.episodes if episodes is None else episodes, compare)
+        return results + self.submit_episodes(url, pending)
 
-    def update_movie_info(self, url, excel_path):
+    # 返回值和 update_series_info 相同
+    def update_movie_info(self, url, detail):
         movie_id = self.extract_movie_id(url)
-        self.driver.get(f"https://www.themoviedb.org/movie/{movie_id}/edit?language=zh-HK")
-        logging.info(f"Updating movie info for URL: https://www.themoviedb.org/movie/{movie_id}/edit?language=zh-HK")
+        title, description = detail.title, detail.description
+        if not title:
+            logging.warning("No movie title to upload.")
+            return False, False
+        edit_url = self.edit_url('movie', movie_id)
+        if self.is_journaled(edit_url):
+            logging.info(f"Movie info of {movie_id} already submitted, skipped.")
+            return True, True
+        if self.is_unchanged('movie', movie_id, None, None, title, description):
+            logging.info(f"Movie info of {movie_id} unchanged since last upload, skipped.")
+            return True, True
 
-        if not self.check_and_fill_form('zh_HK_translated_title', 'zh_HK_overview', excel_path, 'Movies'):
+        logging.info(f"Updating movie info for URL: {edit_url}")
+        ok = self.submit_edit_page(edit_url, 'zh_HK_translated_title', 'zh_HK_overview', title, description)
+        if not ok:
             if self.check_and_add_translation():
-                self.driver.get(f"https://www.themoviedb.org/movie/{movie_id}/edit?language=zh-HK")
-                self.check_and_fill_form('zh_HK_translated_title', 'zh_HK_overview', excel_path, 'Movies')
+                ok = self.submit_edit_page(edit_url, 'zh_HK_translated_title', 'zh_HK_overview', title, description)
+        if ok:
+            self.record_upload('movie', movie_id, None, None, title, description)
+        self.record_journal(edit_url, 'movie', None, None, ok)
+        return ok, False
 
-    def check_and_fill_form(self, title_field_id, overview_field_id, excel_path, sheet_name, title=None, description=None, skip_empty_overview=False):
+    # 劇集或電影資料本身的結果，格式和 update_seasons / update_episodes 相同
+    def update_info(self, url, detail, is_movie=False):
+        if is_movie:
+            ok, skipped = self.update_movie_info(url, detail)
+            return [{'item': 'movie', 'season': None, 'episode': None, 'ok': ok, 'skipped': skipped}]
+        ok, skipped = self.update_series_info(url, detail)
+        return [{'item': 'series', 'season': None, 'episode': None, 'ok': ok, 'skipped': skipped}]
+
+    # 全部項目完成後，將失敗的項目再上載一次；仍然失敗的會留在 journal 的重試清單，之後可以用 resume 模式再上載
+    def retry_failed(self, url, detail, results, is_movie=False):
+        failed = {(result['item'], result['season'], result['episode']) for result in results if not result['ok']}
+        if not failed:
+            return results
+        logging.info(f"Retrying {len(failed)} failed items.")
+        retried = {}
+        if ('movie' if is_movie else 'series', None, None) in failed:
+            for result in self.update_info(url, detail, is_movie):
+                retried[(result['item'], None, None)] = result
+        seasons = [season for season in detail.seasons if ('season', season.number, None) in failed]
+        episodes = [episode for episode in detail.episodes if ('episode', episode.season_number, episode.episode_number) in failed]
+        for result in self.update_seasons(url, detail, seasons) + self.update_episodes(url, detail, episodes):
+            retried[(result['item'], result['season'], result['episode'])] = result
+        return [retried.get((result['item'], result['season'], result['episode']), result) for result in results]
+
+    @timed('tmdb_submit')
+    def check_and_fill_form(self, title_field_id, overview_field_id, title, description, skip_empty_overview=False):
         try:
-            name_field = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.ID, title_field_id)))
+            name_field = wait_for_element(self.driver, (By.ID, title_field_id), 'tmdb_form')
             overview_field = self.driver.find_element(By.ID, overview_field_id)
 
-            if title is None or description is None:
-                df = pd.read_excel(excel_path, sheet_name=sheet_name)
-                title = df.iloc[0, 0]
-                description = df.iloc[0, 1]
-
             name_field.clear()
             name_field.send_keys(title)
             logging.info(f"Updated title: {title}")
@@ -123,17 +420,21 @@ class TMDBUploader:
             submit_button = self.driver.find_element(By.ID, "submit")
             self.driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
             submit_button.click()
-            time.sleep(1)
+            # 等待提交後頁面更新
+            wait_for_staleness(self.driver, submit_button, 'tmdb_submit')
             logging.info("Successfully updated the information.")
+            self.last_error = ''
             return True
         except Exception as e:
+            self.record_failure(e)
             logging.warning(f"No translation found or other issue: {e}")
             return False
 
-    def upload_to_tmdb(self, url, excel_path, is_movie=False):
-        if is_movie:
-            self.update_movie_info(url, excel_path)
-        else:
-            self.update_series_info(url, excel_path)
-            self.update_seasons(url, excel_path)
-            self.update_episodes(url, excel_path)
+    # data 可以是 VideoDetail 或 Excel 路徑，返回每個項目的結果 (見 update_seasons)
+    def upload_to_tmdb(self, url, data, is_movie=False):
+        detail = data if isinstance(data, VideoDetail) else load_video_detail(data)
+        results = self.update_info(url, detail, is_movie)
+        if not is_movie:
+            results += self.update_seasons(url, detail)
+            results += self.update_episodes(url, detail)
+        return self.retry_failed(url, detail, results, is_movie)
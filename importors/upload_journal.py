@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+# 每個 TMDB 項目 (劇集或電影) 一個 JSON lines 檔案，逐行記錄每個編輯頁面的提交結果
+# 每寫一行都會 fsync，即使 Chrome 當機或斷線，已成功提交的項目亦不會遺失，可以用 resume 模式從未完成的項目繼續
+class UploadJournal:
+    # resume=False 時會清空舊的記錄，重新開始上載
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        # {編輯頁網址: 最後一次的記錄}
+        self.entries = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume:
+            self.entries = self._read()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _read(self):
+        entries = {}
+        try:
+            with open(self.path, encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 寫到一半中斷的最後一行
+                        continue
+                    entries[entry['edit_url']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def record(self, edit_url, item, season, episode, ok, error=''):
+        entry = {'edit_url': edit_url, 'item': item, 'season': season, 'episode': episode,
+                 'status': 'ok' if ok else 'failed', 'error': '' if ok else error, 'at': time.time()}
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.entries[edit_url] = entry
+
+    def is_done(self, edit_url):
+        with self.lock:
+            entry = self.entries.get(edit_url)
+        return entry is not None and entry['status'] == 'ok'
+
+    def completed_count(self):
+        with self.lock:
+            return sum(1 for entry in self.entries.values() if entry['status'] == 'ok')
+
+    # 最後一次提交仍然失敗的項目
+    def failed(self):
+        with self.lock:
+            return [entry for entry in self.entries.values() if entry['status'] == 'failed']
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+# journal_dir/tv-<ID>.jsonl 或 journal_dir/movie-<ID>.jsonl
+def journal_path(journal_dir, tmdb_url):
+    match = re.search(r'/(tv|movie)/(\d+)', tmdb_url)
+    name = f"{match.group(1)}-{match.group(2)}" if match else re.sub(r'[^\w.-]+', '_', tmdb_url)
+    return os.path.join(journal_dir, f"{name}.jsonl")
+
+def log_failed_entries(journal):
+    failed = journal.failed()
+    if not failed:
+        return
+    logging.warning(f"{len(failed)} 個項目上載失敗，已記錄在 {journal.path}，可以使用 --resume 重新上載:")
+    for entry in failed:
+        logging.warning(f"  {entry['edit_url']} ({entry['error']})")
@@ -0,0 +1,72 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+# 沒有季數或集數的項目 (劇集、電影、季數本身) 用 -1 代替
+NO_NUMBER = -1
+
+# 記錄每個項目上次上載到 TMDB 的標題和簡介，內容沒有改變的項目可以直接跳過
+class UploadLedger:
+    # skip_unchanged=False 時仍然會記錄上載內容，但每個項目都會重新上載
+    def __init__(self, db_path='upload_ledger.db', skip_unchanged=True):
+        self.db_path = db_path
+        self.skip_unchanged = skip_unchanged
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS uploads (
+                    media_type TEXT NOT NULL,
+                    tmdb_id TEXT NOT NULL,
+                    season INTEGER NOT NULL,
+                    episode INTEGER NOT NULL,
+                    language TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    uploaded_at REAL NOT NULL,
+                    PRIMARY KEY (media_type, tmdb_id, season, episode, language)
+                )
+            ''')
+
+    @staticmethod
+    def content_hash(title, description):
+        def normalize(value):
+            value = '' if value is None else str(value).strip()
+            return '' if value == 'nan' else value
+        content = f"{normalize(title)}\x1f{normalize(description)}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    # 不是數字的季數或集數 (例如 NaN) 按原文字記錄，不會和其他項目混淆
+    @staticmethod
+    def _number(value):
+        if value is None:
+            return NO_NUMBER
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return str(value)
+
+    @staticmethod
+    def _key(media_type, tmdb_id, season, episode, language):
+        return (media_type, str(tmdb_id), UploadLedger._number(season), UploadLedger._number(episode), language)
+
+    def is_unchanged(self, media_type, tmdb_id, season, episode, language, title, description):
+        if not self.skip_unchanged:
+            return False
+        key = self._key(media_type, tmdb_id, season, episode, language)
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content_hash FROM uploads WHERE media_type = ? AND tmdb_id = ? AND season = ? AND episode = ? AND language = ?',
+                key).fetchone()
+        return row is not None and row[0] == self.content_hash(title, description)
+
+    def record(self, media_type, tmdb_id, season, episode, language, title, description):
+        key = self._key(media_type, tmdb_id, season, episode, language)
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO uploads (media_type, tmdb_id, season, episode, language, content_hash, uploaded_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                key + (self.content_hash(title, description), time.time()))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -1,4 +1,9 @@
+import os
 import pandas as pd
+import re
+from others.excel_export import load_video_detail, save_video_detail, read_catalog_frames, write_catalog_frames
+
+SEASON_NAME_PATTERN = re.compile(r'第 (\d+) 季|第 (\d+) 輯')
 
 def update_season_numbers(seasons_df):
     # 提取 Season Number 從 Season Name 中的 "第 x 季" 或 "第 x 輯"
@@ -9,34 +14,87 @@ def update_season_numbers(seasons_df):
     seasons_df.loc[mask, 'Season Number'] = season_numbers[mask].astype(int)
     return seasons_df
 
-def update_episodes_numbers(episodes_df, seasons_df):
-    # 創建 Season Name 到 Season Number 的映射
-    season_mapping = dict(zip(seasons_df['Season Name'], seasons_df['Season Number']))
-    # 創建舊的 Season Number 到新的 Season Number 的映射
-    old_to_new_season_number = {index + 1: season_mapping.get(row['Season Name'], row['Season Number']) for index, row in seasons_df.iterrows()}
+# key_columns 為分辨不同影音的欄位 (例如目錄工作簿的 Title Key)，每套影音內第幾個季數 (由 1 開始) 就是舊的 Season Number
+# 用 merge 一次過對應所有影音的集數，找不到對應季數的集數保留原有的 Season Number
+# previous_season_numbers 為 update_season_numbers 之前的 Season Number，只有季數有改變的影音才會更新集數，
+# 已經處理過的影音 (例如從 catalog.db 匯出的資料) 再處理一次不會改變
+def update_episodes_numbers(episodes_df, seasons_df, key_columns=(), previous_season_numbers=None):
+    key_columns = list(key_columns)
+    mapping = seasons_df[key_columns].copy()
+    if key_columns:
+        mapping['Old Season Number'] = seasons_df.groupby(key_columns, sort=False).cumcount() + 1
+    else:
+        mapping['Old Season Number'] = range(1, len(seasons_df) + 1)
+    mapping['New Season Number'] = pd.to_numeric(seasons_df['Season Number'], errors='coerce')
+    if previous_season_numbers is not None:
+        previous = pd.to_numeric(previous_season_numbers, errors='coerce')
+        changed = ~(previous.eq(mapping['New Season Number']) | (previous.isna() & mapping['New Season Number'].isna()))
+        if key_columns:
+            changed = changed.groupby([seasons_df[column] for column in key_columns], sort=False).transform('any')
+        else:
+            changed = pd.Series(changed.any(), index=seasons_df.index)
+        mapping = mapping[changed.to_numpy()]
+    old_season_numbers = pd.to_numeric(episodes_df['Season Number'], errors='coerce')
+    merged = episodes_df[key_columns].assign(**{'Old Season Number': old_season_numbers}).merge(
+        mapping, how='left', on=key_columns + ['Old Season Number'])
+    new_season_numbers = merged['New Season Number'].fillna(merged['Old Season Number'])
     # 更新 Episodes 中的 Season Number
-    episodes_df['Season Number'] = episodes_df['Season Number'].map(old_to_new_season_number)
+    episodes_df['Season Number'] = new_season_numbers.astype('Int64').to_numpy()
     return episodes_df
 
+# 目錄工作簿 (見 others.excel_export.save_catalog_workbook) 內所有影音的季數和集數一次過處理
+def process_catalog_frames(frames):
+    previous_season_numbers = frames['Seasons']['Season Number'].copy()
+    update_season_numbers(frames['Seasons'])
+    update_episodes_numbers(frames['Episodes'], frames['Seasons'], ['Title Key'], previous_season_numbers)
+    return frames
+
+# 沒有指定 output_file 時寫入 <原檔名>_processed.xlsx，不會覆蓋原本的工作簿
+def process_catalog_workbook(input_file, output_file=None):
+    output_file = output_file or f"{os.path.splitext(input_file)[0]}_processed.xlsx"
+    write_catalog_frames(process_catalog_frames(read_catalog_frames(input_file)), output_file)
+    return output_file
+
+# 直接處理記憶體中的 VideoDetail，規則和 update_season_numbers / update_episodes_numbers 相同
+def process_video_detail(detail):
+    # 舊的 Season Number (第幾個季數) 到新的 Season Number 的映射
+    old_to_new_season_number = {}
+    changed = False
+    for index, season in enumerate(detail.seasons):
+        # 從 Season Name 中的 "第 x 季" 或 "第 x 輯" 提取 Season Number
+        match = SEASON_NAME_PATTERN.search(season.name or '')
+        if match and season.number != int(match.group(1) or match.group(2)):
+            season.number = int(match.group(1) or match.group(2))
+            changed = True
+        old_to_new_season_number[index + 1] = season.number
+
+    # 季數沒有改變 (例如已經處理過) 時集數亦不用更新
+    if not changed:
+        return detail
+
+    # 更新 Episodes 中的 Season Number
+    for episode in detail.episodes:
+        episode.season_number = old_to_new_season_number.get(episode.season_number, episode.season_number)
+    return detail
+
 def process_excel(input_file, output_file):
     # 讀取輸入文件
-    excel_file = pd.ExcelFile(input_file)
-    titles_df = excel_file.parse('Title')
-    seasons_df = excel_file.parse('Seasons')
-    episodes_df = excel_file.parse('Episodes')
+    detail = load_video_detail(input_file)
 
     # 更新 Season Number
-    updated_seasons_df = update_season_numbers(seasons_df.copy())
-    updated_episodes_df = update_episodes_numbers(episodes_df.copy(), updated_seasons_df)
+    process_video_detail(detail)
 
     # 保存到輸出文件（覆蓋原文件）
-    with pd.ExcelWriter(output_file, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-        titles_df.to_excel(writer, sheet_name='Title', index=False)
-        updated_seasons_df.to_excel(writer, sheet_name='Seasons', index=False)
-        updated_episodes_df.to_excel(writer, sheet_name='Episodes', index=False)
+    save_video_detail(detail, output_file)
 
 # 使用示例
+# python -m others.analysis_excel                   處理 video_detail.xlsx
+# python -m others.analysis_excel catalog.xlsx [輸出.xlsx]   處理目錄工作簿內所有影音，預設寫入 catalog_processed.xlsx
 if __name__ == "__main__":
-    input_file_path = './video_detail.xlsx'
-    output_file_path = './video_detail.xlsx'
-    process_excel(input_file_path, output_file_path)
+    import sys
+    if len(sys.argv) > 1:
+        print(f"已寫入 {process_catalog_workbook(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)}")
+    else:
+        input_file_path = './video_detail.xlsx'
+        output_file_path = './video_detail.xlsx'
+        process_excel(input_file_path, output_file_path)
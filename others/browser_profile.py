@@ -0,0 +1,141 @@
+import copy
+import logging
+import os
+import time
+from selenium import webdriver
+from others.network_capture import clear_network_log
+from others.metrics import instrument_driver
+
+# Chrome 的預設設定，可以在 configs.json 的 "browser" 覆蓋，例如
+# {"browser": {"headless": true, "page_load_strategy": "none", "site_allowlists": {"primevideo": ["image"]}}}
+DEFAULT_BROWSER_PROFILE = {
+    'headless': False,
+    # normal: 等待所有資源下載完成; eager: DOM 解析完成即返回; none: 不等待
+    'page_load_strategy': 'eager',
+    # 封鎖的資源類型，見 RESOURCE_PATTERNS
+    'block_resources': ['image', 'media', 'font'],
+    # 封鎖廣告和追蹤等第三方網域，見 THIRD_PARTY_PATTERNS
+    'block_third_party': True,
+    # 額外封鎖的網址 (Chrome DevTools 的萬用字元格式)
+    'block_patterns': [],
+    # 記錄網絡回應，讓 Disney+ 等網站可以直接讀取 API 的 JSON，見 others/network_capture.py；只用來上載到 TMDB 的 Chrome 不會開啟
+    'capture_network': True,
+    # 同時載入的分頁數量，例如 Prime Video 會同時開啟多季的頁面
+    'parallel_tabs': 4,
+    # 使用固定的 Chrome 使用者資料夾，登入狀態會保留在資料夾內；同一資料夾只可以由一個 Chrome 使用，批次模式請設定 --workers 1
+    'user_data_dir': None,
+    # 每個網站不封鎖的資源類型或網址，登入流程需要的資源要放在這裡
+    'site_allowlists': {
+        'tmdb_login': ['image', '*recaptcha*', '*gstatic.com*', '*cookielaw.org*'],
+        'disneyplus_login': ['image', '*bamgrid.com*', '*disney-plus.net*', '*recaptcha*', '*gstatic.com*'],
+    },
+}
+
+RESOURCE_PATTERNS = {
+    'image': ['*.jpg', '*.jpg?*', '*.jpeg', '*.jpeg?*', '*.png', '*.png?*', '*.gif', '*.gif?*',
+              '*.webp', '*.webp?*', '*.avif', '*.avif?*', '*.svg', '*.svg?*', '*.ico', '*.ico?*'],
+    'media': ['*.mp4', '*.mp4?*', '*.webm', '*.webm?*', '*.m3u8', '*.m3u8?*', '*.mpd', '*.mpd?*', '*.m4s', '*.m4s?*', '*.mp3', '*.mp3?*'],
+    'font': ['*.woff', '*.woff?*', '*.woff2', '*.woff2?*', '*.ttf', '*.ttf?*', '*.otf', '*.otf?*', '*.eot', '*.eot?*'],
+}
+
+# 只有這些網站會讀取網絡記錄 (見 others/network_capture.py)，其他網站每次調用 apply_site_profile 都會清除記錄，避免在 chromedriver 內累積
+NETWORK_CAPTURE_SITES = {'disneyplus'}
+
+THIRD_PARTY_PATTERNS = [
+    '*doubleclick.net*', '*googletagmanager.com*', '*google-analytics.com*', '*googlesyndication.com*',
+    '*googleadservices.com*', '*facebook.net*', '*connect.facebook.com*', '*scorecardresearch.com*',
+    '*hotjar.com*', '*nr-data.net*', '*newrelic.com*', '*branch.io*', '*adobedtm.com*', '*omtrdc.net*',
+    '*demdex.net*', '*amazon-adsystem.com*', '*criteo.com*', '*criteo.net*', '*quantserve.com*',
+    '*bat.bing.com*', '*analytics.tiktok.com*', '*optimizely.com*', '*braze.com*', '*segment.io*',
+    '*cookielaw.org*', '*onetrust.com*', '*quantummetric.com*', '*mparticle.com*',
+]
+
+def load_browser_profile(configs=None):
+    profile = copy.deepcopy(DEFAULT_BROWSER_PROFILE)
+    overrides = (configs or {}).get('browser', {})
+    for key, value in overrides.items():
+        if key == 'site_allowlists':
+            profile['site_allowlists'].update(value)
+        else:
+            profile[key] = value
+    return profile
+
+def blocked_url_patterns(profile, site=None):
+    allowlist = set(profile['site_allowlists'].get(site, [])) if site else set()
+    patterns = []
+    for resource in profile['block_resources']:
+        if resource not in allowlist:
+            patterns += RESOURCE_PATTERNS.get(resource, [])
+    if profile['block_third_party']:
+        patterns += THIRD_PARTY_PATTERNS
+    patterns += profile['block_patterns']
+    return [pattern for pattern in patterns if pattern not in allowlist]
+
+# capture_network 不為 None 時覆蓋設定，例如只用來上載到 TMDB 的 Chrome 不需要記錄網絡回應
+def create_driver(profile=None, capture_network=None):
+    profile = profile or load_browser_profile()
+    if capture_network is not None:
+        profile = dict(profile, capture_network=capture_network)
+    options = webdriver.ChromeOptions()
+    options.add_argument('--log-level=3')  # 隱藏所有的 INFO 以下日誌信息
+    if profile['headless']:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    options.page_load_strategy = profile['page_load_strategy']
+    if profile['user_data_dir']:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile['user_data_dir'])}")
+    if profile['capture_network']:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    driver = instrument_driver(webdriver.Chrome(options=options))
+    driver.browser_profile = profile
+    driver.browser_site = None
+    apply_site_profile(driver)
+    return driver
+
+# 切換到某個網站前調用，按該網站的 allowlist 更新封鎖的網址
+# 不是由 create_driver 建立的 driver 不會有任何改變
+def apply_site_profile(driver, site=None):
+    profile = getattr(driver, 'browser_profile', None)
+    if profile is None:
+        return
+    if getattr(driver, 'browser_site', None) == (site or ''):
+        if site not in NETWORK_CAPTURE_SITES:
+            clear_network_log(driver)
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(profile, site)})
+        driver.browser_site = site or ''
+        # 之前網站的網絡記錄已經不需要，避免累積
+        clear_network_log(driver)
+    except Exception as e:
+        logging.warning(f"無法設定資源封鎖: {e}")
+
+# CDP 的設定只對當時的分頁有效，新開啟的分頁切換過去後調用，以目前網站的設定重新套用
+def apply_profile_to_current_tab(driver):
+    site = getattr(driver, 'browser_site', None)
+    if site is None:
+        return
+    driver.browser_site = None
+    apply_site_profile(driver, site or None)
+
+# 比較完整載入和精簡設定下每個網址的載入時間
+# python -m others.browser_profile https://www.netflix.com/hk/title/80100172 ...
+if __name__ == "__main__":
+    import sys
+    urls = sys.argv[1:]
+    full_profile = load_browser_profile({'browser': {'page_load_strategy': 'normal', 'block_resources': [], 'block_third_party': False}})
+    lean_profile = load_browser_profile({'browser': {'headless': True}})
+    for name, profile in (("完整", full_profile), ("精簡", lean_profile)):
+        driver = create_driver(profile)
+        total = 0.0
+        for url in urls:
+            start_time = time.monotonic()
+            driver.get(url)
+            driver.execute_script("return document.body.innerText.length")
+            elapsed = time.monotonic() - start_time
+            total += elapsed
+            print(f"{name}  {elapsed:6.2f} 秒  {url}")
+        driver.quit()
+        print(f"{name} 合計 {total:.2f} 秒")
@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+import logging
+from others.video_models import VideoDetail, Season, Episode
+from others.excel_export import save_video_detail, save_catalog_workbook
+
+# 以 (平台, 影片 ID, 語言) 為索引，保存所有抓取過的影音資料，可以隨時匯出成 Excel 或直接上載
+class CatalogStore:
+    def __init__(self, db_path='catalog.db'):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS titles (
+                    platform TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    is_movie INTEGER NOT NULL,
+                    source_url TEXT NOT NULL,
+                    extracted_at REAL NOT NULL,
+                    PRIMARY KEY (platform, video_id, locale)
+                );
+                CREATE TABLE IF NOT EXISTS seasons (
+                    platform TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    season_number INTEGER,
+                    name TEXT NOT NULL,
+                    description TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_seasons_title ON seasons (platform, video_id, locale, position);
+                CREATE TABLE IF NOT EXISTS episodes (
+                    platform TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    season_number INTEGER,
+                    episode_number INTEGER,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_episodes_title ON episodes (platform, video_id, locale, position);
+                CREATE INDEX IF NOT EXISTS idx_titles_extracted_at ON titles (extracted_at);
+            ''')
+
+    # 以新的抓取結果取代同一影片原有的資料
+    def save(self, platform, video_id, locale, detail, source_url=''):
+        key = (platform, str(video_id), locale)
+        with self.lock, self.conn:
+            for table in ('titles', 'seasons', 'episodes'):
+                self.conn.execute(f'DELETE FROM {table} WHERE platform = ? AND video_id = ? AND locale = ?', key)
+            self.conn.execute(
+                'INSERT INTO titles (platform, video_id, locale, title, description, is_movie, source_url, extracted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                key + (detail.title or '', detail.description or '', int(detail.is_movie), source_url, time.time()))
+            self.conn.executemany(
+                'INSERT INTO seasons (platform, video_id, locale, position, season_number, name, description) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [key + (position, season.number, season.name or '', season.description or '')
+                 for position, season in enumerate(detail.seasons)])
+            self.conn.executemany(
+                'INSERT INTO episodes (platform, video_id, locale, position, season_number, episode_number, title, description) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [key + (position, episode.season_number, episode.episode_number, episode.title or '', episode.description or '')
+                 for position, episode in enumerate(detail.episodes)])
+        logging.info(f"已保存 {platform}/{video_id} ({locale}) 到 {self.db_path}")
+
+    # 讀取一套影音的資料，找不到返回 None
+    def load(self, platform, video_id, locale):
+        key = (platform, str(video_id), locale)
+        with self.lock:
+            title_row = self.conn.execute(
+                'SELECT title, description, is_movie FROM titles WHERE platform = ? AND video_id = ? AND locale = ?', key).fetchone()
+            if title_row is None:
+                return None
+            season_rows = self.conn.execute(
+                'SELECT name, season_number, description FROM seasons WHERE platform = ? AND video_id = ? AND locale = ? ORDER BY position', key).fetchall()
+            episode_rows = self.conn.execute(
+                'SELECT season_number, episode_number, title, description FROM episodes WHERE platform = ? AND video_id = ? AND locale = ? ORDER BY position', key).fetchall()
+        return VideoDetail(title_row[0], title_row[1], bool(title_row[2]),
+                           [Season(*row) for row in season_rows],
+                           [Episode(*row) for row in episode_rows])
+
+    # 找出某影片 ID 保存過的 (平台, 影片 ID, 語言)，用於只知道 ID 的情況
+    def find(self, video_id, platform=None):
+        query = 'SELECT platform, video_id, locale FROM titles WHERE video_id = ?'
+        params = [str(video_id)]
+        if platform:
+            query += ' AND platform = ?'
+            params.append(platform)
+        with self.lock:
+            return self.conn.execute(query + ' ORDER BY extracted_at DESC', params).fetchall()
+
+    def list_titles(self, platform=None):
+        query = 'SELECT platform, video_id, locale, title, is_movie, extracted_at FROM titles'
+        params = []
+        if platform:
+            query += ' WHERE platform = ?'
+            params.append(platform)
+        with self.lock:
+            return self.conn.execute(query + ' ORDER BY extracted_at DESC', params).fetchall()
+
+    # 匯出成和 video_detail.xlsx 相同的四個工作表格式
+    def export_excel(self, platform, video_id, locale, output_path):
+        detail = self.load(platform, video_id, locale)
+        if detail is None:
+            raise KeyError(f"{platform}/{video_id} ({locale}) 不在資料庫內")
+        save_video_detail(detail, output_path)
+        return detail
+
+    # 將資料庫內所有 (或某平台的) 影音匯出成一個目錄工作簿，Title Key 為 平台:影片ID，TMDB URL 留空讓用家填寫
+    def export_catalog_workbook(self, output_path, platform=None):
+        titles = []
+        seen_keys = set()
+        for title_platform, video_id, locale, _, _, _ in self.list_titles(platform):
+            title_key = f"{title_platform}:{video_id}"
+            if title_key in seen_keys:
+                continue
+            seen_keys.add(title_key)
+            titles.append((title_key, '', self.load(title_platform, video_id, locale)))
+        save_catalog_workbook(titles, output_path)
+        return len(titles)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# 列出資料庫內所有影音，或者 python -m others.catalog_store catalog.xlsx 匯出成目錄工作簿
+if __name__ == "__main__":
+    import sys
+    store = CatalogStore()
+    if len(sys.argv) > 1:
+        print(f"已匯出 {store.export_catalog_workbook(sys.argv[1])} 套影音到 {sys.argv[1]}")
+        store.close()
+        sys.exit()
+    for platform, video_id, locale, title, is_movie, extracted_at in store.list_titles():
+        kind = "電影" if is_movie else "劇集"
+        print(f"{platform}:{video_id}  {locale}  {kind}  {title}  ({time.strftime('%Y-%m-%d %H:%M', time.localtime(extracted_at))})")
+    store.close()
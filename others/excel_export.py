@@ -0,0 +1,122 @@
+import pandas as pd
+import logging
+from others.video_models import VideoDetail, Season, Episode
+from others.metrics import timed
+
+TITLE_COLUMNS = ['TV Show Title', 'TV Show Description']
+SEASON_COLUMNS = ['Season Name', 'Season Number', 'Season Description']
+EPISODE_COLUMNS = ['Season Number', 'Episode Number', 'Episode Title', 'Episode Description']
+MOVIE_COLUMNS = ['Movie Title', 'Movie Description']
+
+# 多套影音的目錄工作簿，每個工作表以 Title Key 欄分辨屬於哪一套影音 (例如 netflix:81234567)
+CATALOG_TITLE_COLUMNS = ['Title Key', 'TMDB URL', 'Title', 'Description', 'Is Movie']
+CATALOG_SEASON_COLUMNS = ['Title Key'] + SEASON_COLUMNS
+CATALOG_EPISODE_COLUMNS = ['Title Key'] + EPISODE_COLUMNS
+
+def _text(value):
+    if value is None or pd.isna(value):
+        return ''
+    return str(value)
+
+def _number(value):
+    if value is None or pd.isna(value):
+        return None
+    return int(value)
+
+# 一次過將資料寫成四個工作表的 Excel，方便用家修改後再上載
+@timed('excel_write')
+def save_video_detail(detail, output_path):
+    if detail.is_movie:
+        title_rows, movie_rows = [], [(detail.title, detail.description)]
+    else:
+        title_rows = [(detail.title, detail.description)] if detail.title else []
+        movie_rows = []
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        pd.DataFrame(title_rows, columns=TITLE_COLUMNS).to_excel(writer, sheet_name='Title', index=False)
+        pd.DataFrame([(s.name, s.number, s.description) for s in detail.seasons], columns=SEASON_COLUMNS).to_excel(writer, sheet_name='Seasons', index=False)
+        pd.DataFrame([(e.season_number, e.episode_number, e.title, e.description) for e in detail.episodes], columns=EPISODE_COLUMNS).to_excel(writer, sheet_name='Episodes', index=False)
+        pd.DataFrame(movie_rows, columns=MOVIE_COLUMNS).to_excel(writer, sheet_name='Movies', index=False)
+    logging.info(f"資料已保存到 {output_path}")
+
+# 讀取 Excel (包括用家修改過的) 成為 VideoDetail
+# 標題和電影工作表按欄位位置讀取，兼容舊版本寫入的不同欄位名稱
+@timed('excel_read')
+def load_video_detail(excel_path):
+    sheets = pd.read_excel(excel_path, sheet_name=None)
+    detail = VideoDetail()
+
+    movies_df = sheets.get('Movies', sheets.get('Movie'))
+    title_df = sheets.get('Title')
+    if title_df is not None and not title_df.empty:
+        detail.title = _text(title_df.iloc[0, 0])
+        detail.description = _text(title_df.iloc[0, 1])
+    elif movies_df is not None and not movies_df.empty:
+        detail.title = _text(movies_df.iloc[0, 0])
+        detail.description = _text(movies_df.iloc[0, 1])
+        detail.is_movie = True
+
+    seasons_df = sheets.get('Seasons')
+    if seasons_df is not None and not seasons_df.empty:
+        detail.seasons = [Season(_text(name), _number(number), _text(description))
+                          for name, number, description in zip(seasons_df['Season Name'], seasons_df['Season Number'], seasons_df['Season Description'])]
+
+    episodes_df = sheets.get('Episodes')
+    if episodes_df is not None and not episodes_df.empty:
+        detail.episodes = [Episode(_number(season), _number(episode), _text(title), _text(description))
+                           for season, episode, title, description in zip(episodes_df['Season Number'], episodes_df['Episode Number'],
+                                                                         episodes_df['Episode Title'], episodes_df['Episode Description'])]
+    return detail
+
+# titles 為 [(Title Key, TMDB 網址, VideoDetail)]
+@timed('excel_write')
+def save_catalog_workbook(titles, output_path):
+    frames = {
+        'Titles': pd.DataFrame([(key, tmdb_url, detail.title, detail.description, detail.is_movie) for key, tmdb_url, detail in titles],
+                               columns=CATALOG_TITLE_COLUMNS),
+        'Seasons': pd.DataFrame([(key, s.name, s.number, s.description) for key, _, detail in titles for s in detail.seasons],
+                                columns=CATALOG_SEASON_COLUMNS),
+        'Episodes': pd.DataFrame([(key, e.season_number, e.episode_number, e.title, e.description) for key, _, detail in titles for e in detail.episodes],
+                                 columns=CATALOG_EPISODE_COLUMNS),
+    }
+    write_catalog_frames(frames, output_path)
+
+# 返回 {'Titles': DataFrame, 'Seasons': DataFrame, 'Episodes': DataFrame}，缺少的工作表為空的 DataFrame
+def read_catalog_frames(excel_path):
+    sheets = pd.read_excel(excel_path, sheet_name=None)
+    frames = {}
+    for sheet_name, columns in (('Titles', CATALOG_TITLE_COLUMNS), ('Seasons', CATALOG_SEASON_COLUMNS), ('Episodes', CATALOG_EPISODE_COLUMNS)):
+        frame = sheets.get(sheet_name, pd.DataFrame(columns=columns))
+        missing = [column for column in columns if column not in frame.columns]
+        if missing:
+            raise ValueError(f"{excel_path} 的 {sheet_name} 工作表缺少欄位: {', '.join(missing)}")
+        # Title Key 可能被讀成數字，統一為文字才能跨工作表對應
+        frame['Title Key'] = frame['Title Key'].map(_text)
+        frames[sheet_name] = frame
+    return frames
+
+def write_catalog_frames(frames, output_path):
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        for sheet_name in ('Titles', 'Seasons', 'Episodes'):
+            frames[sheet_name].to_excel(writer, sheet_name=sheet_name, index=False)
+    logging.info(f"目錄工作簿已保存到 {output_path}")
+
+# 讀取目錄工作簿成為 [(Title Key, TMDB 網址, VideoDetail)]，順序和 Titles 工作表相同
+@timed('excel_read')
+def load_catalog_workbook(excel_path):
+    frames = read_catalog_frames(excel_path)
+    seasons_by_key = {key: group for key, group in frames['Seasons'].groupby('Title Key', sort=False)}
+    episodes_by_key = {key: group for key, group in frames['Episodes'].groupby('Title Key', sort=False)}
+    titles = []
+    for key, tmdb_url, title, description, is_movie in frames['Titles'][CATALOG_TITLE_COLUMNS].itertuples(index=False):
+        detail = VideoDetail(_text(title), _text(description), bool(is_movie) if not pd.isna(is_movie) else False)
+        seasons_df = seasons_by_key.get(key)
+        if seasons_df is not None:
+            detail.seasons = [Season(_text(name), _number(number), _text(season_description))
+                              for name, number, season_description in zip(seasons_df['Season Name'], seasons_df['Season Number'], seasons_df['Season Description'])]
+        episodes_df = episodes_by_key.get(key)
+        if episodes_df is not None:
+            detail.episodes = [Episode(_number(season), _number(episode), _text(episode_title), _text(episode_description))
+                               for season, episode, episode_title, episode_description in zip(episodes_df['Season Number'], episodes_df['Episode Number'],
+                                                                                             episodes_df['Episode Title'], episodes_df['Episode Description'])]
+        titles.append((key, _text(tmdb_url), detail))
+    return titles
@@ -0,0 +1,87 @@
+import json
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import asdict
+from others.video_models import VideoDetail, Season, Episode
+
+# 以 (平台, 影片 ID, 語言) 為索引，暫存 extractor 的抓取結果 (未經 analysis_excel 處理)
+# 在 ttl 秒內再次處理同一影片會直接使用暫存，不用開啟瀏覽器；總大小超過 max_bytes 時先刪除最久沒有使用的項目
+# 和 CatalogStore 不同，這裡的資料會過期及被刪除，只用來避免重複抓取
+class ExtractionCache:
+    def __init__(self, db_path='extraction_cache.db', ttl=24 * 3600, max_bytes=50 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS extractions (
+                    platform TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    extracted_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (platform, video_id, locale)
+                );
+                CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions (last_used);
+            ''')
+
+    @staticmethod
+    def to_json(detail):
+        return json.dumps(asdict(detail), ensure_ascii=False)
+
+    @staticmethod
+    def from_json(data):
+        values = json.loads(data)
+        return VideoDetail(values['title'], values['description'], values['is_movie'],
+                           [Season(**season) for season in values['seasons']],
+                           [Episode(**episode) for episode in values['episodes']])
+
+    # 找不到或已過期返回 None
+    def get(self, platform, video_id, locale):
+        key = (platform, str(video_id), locale)
+        now = time.time()
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                'SELECT data, extracted_at FROM extractions WHERE platform = ? AND video_id = ? AND locale = ?', key).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self.conn.execute('DELETE FROM extractions WHERE platform = ? AND video_id = ? AND locale = ?', key)
+                return None
+            self.conn.execute('UPDATE extractions SET last_used = ? WHERE platform = ? AND video_id = ? AND locale = ?', (now,) + key)
+        return self.from_json(row[0])
+
+    def put(self, platform, video_id, locale, detail):
+        key = (platform, str(video_id), locale)
+        data = self.to_json(detail)
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO extractions (platform, video_id, locale, data, size, extracted_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                key + (data, len(data.encode('utf-8')), now, now))
+            self._evict(now)
+
+    # 刪除過期的項目，再按最後使用時間刪除至總大小不超過 max_bytes
+    def _evict(self, now):
+        self.conn.execute('DELETE FROM extractions WHERE extracted_at < ?', (now - self.ttl,))
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM extractions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute('SELECT platform, video_id, locale, size FROM extractions ORDER BY last_used').fetchall()
+        for platform, video_id, locale, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute('DELETE FROM extractions WHERE platform = ? AND video_id = ? AND locale = ?', (platform, video_id, locale))
+            total -= size
+            logging.info(f"抓取暫存超過大小上限，已刪除 {platform}/{video_id} ({locale})")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
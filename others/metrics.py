@@ -0,0 +1,156 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# 記錄每個項目 (title) 內各階段 (phase) 的耗時和次數，例如載入頁面、等待、解析、寫入 Excel、提交 TMDB 表單
+# 完成後可以寫成 JSON lines 和 Chrome trace-event 檔案 (在 chrome://tracing 或 https://ui.perfetto.dev 開啟)
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.origin = time.perf_counter()
+            self.events = []
+            self.counters = defaultdict(int)
+
+    @property
+    def current_title(self):
+        return getattr(self.local, 'title', '')
+
+    # 之後在同一線程記錄的階段都歸入這個項目
+    @contextmanager
+    def title(self, label):
+        previous = self.current_title
+        self.local.title = label
+        try:
+            with self.phase('title', label=label):
+                yield
+        finally:
+            self.local.title = previous
+
+    @contextmanager
+    def phase(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {'name': name, 'title': self.current_title, 'start': start - self.origin, 'seconds': end - start,
+                     'thread': threading.current_thread().name, 'args': args}
+            with self.lock:
+                self.events.append(event)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[(self.current_title, name)] += amount
+
+    # 每個 (項目, 階段) 的次數和總耗時，title 階段本身不計算在內
+    def totals(self, by_title=True):
+        totals = defaultdict(lambda: [0, 0.0])
+        with self.lock:
+            events = list(self.events)
+        for event in events:
+            if event['name'] == 'title':
+                continue
+            key = (event['title'] if by_title else '', event['name'])
+            totals[key][0] += 1
+            totals[key][1] += event['seconds']
+        return totals
+
+    def write_jsonl(self, path):
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        with open(path, 'w', encoding='utf-8') as jsonl_file:
+            for event in events:
+                jsonl_file.write(json.dumps({'type': 'phase', **event}, ensure_ascii=False) + '\n')
+            for (title, name), value in counters.items():
+                jsonl_file.write(json.dumps({'type': 'counter', 'title': title, 'name': name, 'value': value}, ensure_ascii=False) + '\n')
+            for (title, name), (count, seconds) in self.totals().items():
+                jsonl_file.write(json.dumps({'type': 'summary', 'title': title, 'name': name, 'count': count, 'seconds': seconds}, ensure_ascii=False) + '\n')
+
+    def write_trace(self, path):
+        with self.lock:
+            events = list(self.events)
+        thread_ids = {}
+        trace_events = []
+        for event in events:
+            thread_id = thread_ids.setdefault(event['thread'], len(thread_ids) + 1)
+            trace_events.append({'name': event['name'], 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': thread_id,
+                                 'ts': event['start'] * 1e6, 'dur': event['seconds'] * 1e6,
+                                 'args': {'title': event['title'], **event['args']}})
+        for thread_name, thread_id in thread_ids.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread_id, 'args': {'name': thread_name}})
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, trace_file, ensure_ascii=False)
+
+    # 寫入 metrics_dir/<開始時間>.jsonl 及 .trace.json，返回兩個檔案的路徑
+    def export(self, metrics_dir):
+        os.makedirs(metrics_dir, exist_ok=True)
+        prefix = os.path.join(metrics_dir, time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at)))
+        self.write_jsonl(f"{prefix}.jsonl")
+        self.write_trace(f"{prefix}.trace.json")
+        return f"{prefix}.jsonl", f"{prefix}.trace.json"
+
+    def print_summary(self):
+        totals = self.totals(by_title=False)
+        if not totals:
+            return
+        with self.lock:
+            counters = defaultdict(int)
+            for (_, name), value in self.counters.items():
+                counters[name] += value
+        print("\n各階段耗時:")
+        print(f"{'階段':<24}{'次數':>8}{'總耗時(秒)':>12}{'平均(毫秒)':>12}")
+        for (_, name), (count, seconds) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            print(f"{name:<24}{count:>8}{seconds:>12.2f}{seconds / count * 1000:>12.1f}")
+        for name, value in sorted(counters.items()):
+            print(f"{name:<24}{value:>8}")
+        with self.lock:
+            titles = [event for event in self.events if event['name'] == 'title']
+        if titles:
+            print("\n各項目耗時:")
+            for event in titles:
+                print(f"{event['seconds']:>8.2f} 秒  {event['args'].get('label', '')}")
+
+METRICS = Metrics()
+
+# 函數裝飾器，把整個函數的執行記錄為一個階段
+def timed(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with METRICS.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# 記錄 driver.get 的耗時和次數，由 create_driver 調用
+def instrument_driver(driver):
+    original_get = driver.get
+
+    def timed_get(url):
+        METRICS.count('page_loads')
+        with METRICS.phase('page_load', url=url):
+            return original_get(url)
+
+    driver.get = timed_get
+    return driver
+
+def export_metrics(metrics_dir):
+    if not metrics_dir:
+        return
+    try:
+        jsonl_path, trace_path = METRICS.export(metrics_dir)
+        print(f"耗時記錄已保存到 {jsonl_path} 及 {trace_path}")
+    except OSError as e:
+        logging.warning(f"無法保存耗時記錄: {e}")
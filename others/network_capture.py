@@ -0,0 +1,69 @@
+import base64
+import json
+import logging
+from others.wait_utils import wait_quietly
+
+# 透過 Chrome 的 performance log 讀取網頁自己向 API 取得的 JSON 回應，
+# 不用滾動頁面或逐個讀取元素。需要由 create_driver 建立並在 "browser" 設定開啟 capture_network
+
+def network_capture_enabled(driver):
+    profile = getattr(driver, 'browser_profile', None) or {}
+    return bool(profile.get('capture_network'))
+
+# 丟棄之前累積的記錄，在載入新頁面前調用，之後只會讀到新頁面的回應
+def clear_network_log(driver):
+    if not network_capture_enabled(driver):
+        return
+    try:
+        driver.get_log('performance')
+    except Exception as e:
+        logging.warning(f"無法讀取網絡記錄: {e}")
+    driver.network_pending = {}
+
+# 讀取自上次調用後完成下載、網址包含 url_keywords 其中之一的 JSON 回應，返回 [(網址, 資料), ...]
+# 回應的標頭和完成事件可能分別在兩次調用中讀到，所以未完成的請求保存在 driver.network_pending
+def capture_json_responses(driver, url_keywords):
+    pending = getattr(driver, 'network_pending', None)
+    if pending is None:
+        pending = driver.network_pending = {}
+    finished = []
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.responseReceived':
+            response = params.get('response', {})
+            url = response.get('url', '')
+            if 'json' in response.get('mimeType', '') and any(keyword in url for keyword in url_keywords):
+                pending[params['requestId']] = url
+        elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+            finished.append(params['requestId'])
+        elif method == 'Network.loadingFailed':
+            pending.pop(params.get('requestId'), None)
+
+    results = []
+    for request_id in finished:
+        url = pending.pop(request_id)
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            text = body['body']
+            if body.get('base64Encoded'):
+                text = base64.b64decode(text).decode('utf-8')
+            results.append((url, json.loads(text)))
+        except Exception as e:
+            logging.debug(f"無法讀取 {url} 的回應: {e}")
+    return results
+
+# 等待最少一個符合的回應，返回期間讀到的所有回應；超時返回空列表
+def wait_for_json_responses(driver, url_keywords, step='default'):
+    results = []
+
+    def received(d):
+        results.extend(capture_json_responses(d, url_keywords))
+        return bool(results)
+
+    wait_quietly(driver, received, step)
+    return results
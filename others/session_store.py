@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+
+# 保存各網站登入後的 cookies 和 localStorage，下次啟動時直接還原，不用重新登入
+# 檔案內含登入狀態，請勿分享；刪除檔案或加上 --fresh-login 即會重新登入
+_file_lock = threading.Lock()
+
+# 只有網頁在該網域時才可以寫入 localStorage，所以在每個新頁面的腳本執行前寫入，每個分頁只寫入一次
+_LOCAL_STORAGE_SCRIPT = '''
+(function (origin, items) {
+    if (location.origin !== origin || sessionStorage.getItem('__session_store_restored')) {
+        return;
+    }
+    for (const [key, value] of Object.entries(items)) {
+        localStorage.setItem(key, value);
+    }
+    sessionStorage.setItem('__session_store_restored', '1');
+})(%s, %s);
+'''
+
+class SessionStore:
+    # reuse_saved 為 False 時不會還原之前保存的登入狀態，但登入後仍會保存
+    def __init__(self, path='sessions.json', reuse_saved=True):
+        self.path = path
+        self.reuse_saved = reuse_saved
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as session_file:
+                return json.load(session_file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"無法讀取 {self.path}: {e}")
+            return {}
+
+    def _write(self, sessions):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as session_file:
+            json.dump(sessions, session_file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    # 讀取某網站保存的 session，沒有或所有 cookies 都已過期返回 None
+    def get(self, site):
+        if not self.reuse_saved:
+            return None
+        with _file_lock:
+            entry = self._read().get(site)
+        if not entry:
+            return None
+        now = time.time()
+        entry['cookies'] = [cookie for cookie in entry.get('cookies', []) if cookie.get('expiry', now + 1) > now]
+        return entry if entry['cookies'] else None
+
+    def put(self, site, origin, cookies, local_storage=None):
+        with _file_lock:
+            sessions = self._read()
+            sessions[site] = {'origin': origin, 'cookies': cookies, 'local_storage': local_storage or {}, 'saved_at': time.time()}
+            self._write(sessions)
+        logging.info(f"已保存 {site} 的登入狀態")
+
+    def forget(self, site):
+        with _file_lock:
+            sessions = self._read()
+            if sessions.pop(site, None) is not None:
+                self._write(sessions)
+
+    # 保存目前頁面網域的 cookies 和 localStorage，需在登入完成後、仍在該網站時調用
+    def save(self, driver, site):
+        try:
+            origin = driver.execute_script("return location.origin")
+            local_storage = driver.execute_script("return Object.assign({}, window.localStorage)")
+            self.put(site, origin, driver.get_cookies(), local_storage)
+        except Exception as e:
+            logging.warning(f"無法保存 {site} 的登入狀態: {e}")
+
+    # 把保存的 session 寫入 Chrome，不需要先打開該網站；沒有可用的 session 返回 False
+    # 還原後仍需由調用者打開網站確認登入狀態，確認失敗時應調用 forget 並重新登入
+    def restore(self, driver, site):
+        entry = self.get(site)
+        if entry is None:
+            return False
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [_cdp_cookie(cookie, entry['origin']) for cookie in entry['cookies']]})
+            if entry['local_storage']:
+                script = _LOCAL_STORAGE_SCRIPT % (json.dumps(entry['origin']), json.dumps(entry['local_storage']))
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+        except Exception as e:
+            logging.warning(f"無法還原 {site} 的登入狀態: {e}")
+            return False
+        logging.info(f"已還原 {site} 的登入狀態 ({time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['saved_at']))} 保存)")
+        return True
+
+    # 把保存的 cookies 加入 requests.Session (TMDB 的 HTTP 上載使用)
+    def restore_requests(self, session, site):
+        entry = self.get(site)
+        if entry is None:
+            return False
+        for cookie in entry['cookies']:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        return True
+
+    def save_requests(self, session, site, origin):
+        cookies = [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                    'secure': cookie.secure, **({'expiry': cookie.expires} if cookie.expires else {})}
+                   for cookie in session.cookies]
+        self.put(site, origin, cookies)
+
+# Selenium 的 cookie 格式轉換為 Chrome DevTools 的格式
+def _cdp_cookie(cookie, origin):
+    cdp_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite') if cookie.get(key) not in (None, '')}
+    if 'domain' not in cdp_cookie:
+        cdp_cookie['url'] = origin
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    return cdp_cookie
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+
+# 影音資料在記憶體中的結構，由 extractor 產生，經 analysis_excel 處理後交給 TMDBUploader 上載
+# 只有用家需要修改資料時才會寫成 Excel
+
+@dataclass(slots=True)
+class Season:
+    name: str
+    number: int
+    description: str = ''
+
+@dataclass(slots=True)
+class Episode:
+    season_number: int
+    episode_number: int
+    title: str
+    description: str = ''
+
+@dataclass(slots=True)
+class VideoDetail:
+    title: str = ''
+    description: str = ''
+    is_movie: bool = False
+    seasons: list = field(default_factory=list)
+    episodes: list = field(default_factory=list)
+
+    def is_empty(self):
+        return not self.title and not self.seasons and not self.episodes
+
+    # extractor 出錯時仍會返回只有標題和簡介的資料，這種不完整的結果不應暫存或寫入資料庫
+    def is_complete(self):
+        if self.is_movie:
+            return bool(self.title)
+        return bool(self.seasons) and bool(self.episodes)
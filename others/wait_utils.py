@@ -0,0 +1,79 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import logging
+from others.metrics import METRICS
+
+# 每個步驟最多等待的秒數，條件一成立就會立即返回
+# 可以在 configs.json 加入 "wait_timeouts": {"disneyplus_scroll": 3} 之類的設定覆蓋
+WAIT_TIMEOUTS = {
+    'default': 10,
+    'page_load': 15,
+    'login': 30,
+    'appletv_next_page': 10,
+    'disneyplus_profile': 10,
+    'disneyplus_tab': 10,
+    'disneyplus_season': 10,
+    'disneyplus_scroll': 2,
+    'primevideo_title': 10,
+    'primevideo_language': 15,
+    'primevideo_episodes': 10,
+    'tmdb_login': 10,
+    'tmdb_cookies': 3,
+    'tmdb_translation': 5,
+    'tmdb_form': 5,
+    'tmdb_submit': 5,
+}
+
+# 輪詢條件的間隔 (秒)
+POLL_FREQUENCY = 0.2
+
+def configure_timeouts(overrides):
+    for step, timeout in (overrides or {}).items():
+        WAIT_TIMEOUTS[step] = float(timeout)
+
+def get_timeout(step):
+    return WAIT_TIMEOUTS.get(step, WAIT_TIMEOUTS['default'])
+
+# 等待條件成立並返回條件的結果，超時會拋出 TimeoutException
+def wait_until(driver, condition, step='default'):
+    with METRICS.phase(f'wait:{step}'):
+        return WebDriverWait(driver, get_timeout(step), poll_frequency=POLL_FREQUENCY).until(condition)
+
+# 同 wait_until，但超時只記錄日誌並返回 None，用於「等到就好，等不到也可以繼續」的步驟
+def wait_quietly(driver, condition, step='default'):
+    try:
+        return wait_until(driver, condition, step)
+    except TimeoutException:
+        METRICS.count('wait_timeouts')
+        logging.info(f"等待 {step} 超時 ({get_timeout(step)} 秒)，繼續執行")
+        return None
+
+# DOM 解析完成即可 (配合 eager / none 的 page_load_strategy，不等待圖片等資源)
+def wait_for_page_ready(driver, step='page_load'):
+    return wait_quietly(driver, lambda d: d.execute_script("return document.readyState") in ('interactive', 'complete'), step)
+
+def wait_for_element(driver, locator, step='default'):
+    return wait_until(driver, EC.presence_of_element_located(locator), step)
+
+def wait_for_clickable(driver, locator, step='default'):
+    return wait_until(driver, EC.element_to_be_clickable(locator), step)
+
+# 等待舊的元素從頁面消失 (例如提交表單或切換頁面後)
+def wait_for_staleness(driver, element, step='default'):
+    return wait_quietly(driver, EC.staleness_of(element), step)
+
+def wait_for_invisibility(driver, locator, step='default'):
+    return wait_quietly(driver, EC.invisibility_of_element_located(locator), step)
+
+def wait_for_url_change(driver, old_url, step='default'):
+    return wait_quietly(driver, lambda d: d.current_url != old_url, step)
+
+# 等待頁面高度改變，返回新的高度；超時表示已經到底，返回原來的高度
+def wait_for_scroll_height_change(driver, last_height, step='default'):
+    new_height = wait_quietly(driver, lambda d: _changed_scroll_height(d, last_height), step)
+    return new_height if new_height else last_height
+
+def _changed_scroll_height(driver, last_height):
+    height = driver.execute_script("return document.body.scrollHeight")
+    return height if height != last_height else False
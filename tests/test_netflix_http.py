@@ -0,0 +1,54 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from benchmarks.fixtures import netflix_page
+from extractors.netflix_http import extract_netflix_titles_http
+from others.video_models import VideoDetail, Season, Episode
+
+SERIES_ID = '81000001'
+NO_EPISODES_ID = '81000002'
+MOVIE_ID = '81000003'
+
+PAGES = {
+    SERIES_ID: netflix_page(VideoDetail('劇集', '簡介', False, [Season('第 1 季', 1, '季簡介')], [Episode(1, 1, '第一集', '集簡介')])),
+    # 有標題和季數但沒有集數列表，例如未登入或其他地區的版本
+    NO_EPISODES_ID: netflix_page(VideoDetail('劇集', '簡介', False, [Season('第 1 季', 1, '季簡介')], [])),
+    MOVIE_ID: netflix_page(VideoDetail('電影', '簡介', True)),
+}
+
+@pytest.fixture(scope='module')
+def netflix_base_url():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            page = PAGES.get(self.path.rstrip('/').split('/')[-1])
+            body = (page or 'not found').encode('utf-8')
+            self.send_response(200 if page else 404)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+def title_url(video_id):
+    return f'https://www.netflix.com/hk/title/{video_id}'
+
+def test_series_with_episodes_is_parsed(netflix_base_url):
+    detail = extract_netflix_titles_http([title_url(SERIES_ID)], netflix_base_url)[title_url(SERIES_ID)]
+    assert detail is not None and not detail.is_movie
+    assert [(episode.season_number, episode.title) for episode in detail.episodes] == [(1, '第一集')]
+
+def test_series_without_episodes_falls_back_to_browser(netflix_base_url):
+    assert extract_netflix_titles_http([title_url(NO_EPISODES_ID)], netflix_base_url)[title_url(NO_EPISODES_ID)] is None
+
+def test_movie_without_episodes_is_accepted(netflix_base_url):
+    detail = extract_netflix_titles_http([title_url(MOVIE_ID)], netflix_base_url)[title_url(MOVIE_ID)]
+    assert detail is not None and detail.is_movie and detail.title == '電影'
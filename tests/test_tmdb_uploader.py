@@ -0,0 +1,47 @@
+import pytest
+from benchmarks.fixture_server import FixtureServer
+from importors.tmdb_http_uploader import TMDBHttpUploader
+from importors.upload_ledger import UploadLedger
+from others.video_models import VideoDetail, Season, Episode
+
+TV_ID = '90001'
+
+DETAIL = VideoDetail('劇集', '簡介', False, [Season('第 1 季', 1, '季簡介')], [
+    Episode(1, 1, '第一集', '第一集簡介'),
+    # 抓取時沒有取得集數，例如 Excel 內集數欄位留空
+    Episode(1, None, '沒有集數', '沒有集數的簡介'),
+    Episode(1, 2, '第二集', '第二集簡介'),
+])
+
+@pytest.fixture
+def server():
+    with FixtureServer() as fixture_server:
+        yield fixture_server
+
+def test_episode_without_number_is_reported_as_failed(server, tmp_path):
+    # 第一集已經在 TMDB 上，會和季數頁面比較而跳過
+    server.tmdb.seed_episodes(TV_ID, VideoDetail('劇集', '', False, [], [DETAIL.episodes[0]]))
+    ledger = UploadLedger(str(tmp_path / 'upload_ledger.db'))
+    uploader = TMDBHttpUploader(server.tmdb.username, server.tmdb.password, ledger=ledger, base_url=f'{server.base_url}/tmdb')
+    try:
+        results = uploader.upload_to_tmdb(f'{server.base_url}/tmdb/tv/{TV_ID}', DETAIL)
+    finally:
+        uploader.close()
+
+    episodes = {result['episode']: result for result in results if result['item'] == 'episode'}
+    assert episodes[1]['ok'] and episodes[1].get('matched')
+    assert episodes[2]['ok'] and not episodes[2]['skipped']
+    assert not episodes[None]['ok']
+    # 沒有集數的集數不會提交到季數的編輯頁面
+    assert server.tmdb.translations[('tv', TV_ID, 1, None)] == ('第 1 季', '季簡介')
+    assert ('tv', TV_ID, 1, 2) in server.tmdb.submissions
+
+def test_ledger_accepts_numbers_that_are_not_integers(tmp_path):
+    ledger = UploadLedger(str(tmp_path / 'upload_ledger.db'))
+    try:
+        ledger.record('tv', TV_ID, 1, float('nan'), 'zh-HK', '標題', '簡介')
+        assert ledger.is_unchanged('tv', TV_ID, 1, float('nan'), 'zh-HK', '標題', '簡介')
+        # 不會和季數本身的記錄混淆
+        assert not ledger.is_unchanged('tv', TV_ID, 1, None, 'zh-HK', '標題', '簡介')
+    finally:
+        ledger.close()
@@ -1,38 +1,36 @@
+import argparse
 import json
 import os
-import pandas as pd
-from selenium import webdriver
-from extractors.netflix_extractor import extract_netflix_episodes
-from others.analysis_excel import process_excel
-from importors.tmdb_uploader import TMDBUploader
-from extractors.appletv_extractor import extract_appletv_data
-from extractors.disneyplus_extractor import login_to_disneyplus, extract_disneyplus_data
-from extractors.primevideo_extractor import extract_primevideo_data
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from others.video_models import VideoDetail
+from importors.upload_ledger import UploadLedger
+from importors.upload_journal import UploadJournal, journal_path, log_failed_entries
+from importors.rate_limiter import AdaptiveRateLimiter
+from extractors.registry import find_extractor, identify_video
+from others.extraction_cache import ExtractionCache
+from others.session_store import SessionStore
+from others.metrics import METRICS, export_metrics
 import logging
 
+# selenium、pandas、bs4 及各平台的 extractor 只會在第一次用到時才 import (見 extractors.registry)，令程式可以盡快顯示第一個問題
+
 # 設置環境變量來抑制 TensorFlow Lite 的訊息
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 
-# 設置日誌級別，忽略不需要的訊息
-logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+# 設置日誌級別，顯示進度等 INFO 訊息；各 extractor 不會自行設定，級別和 import 的次序無關
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# httpx 每個請求都會記錄一行 INFO，忽略不需要的訊息
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
 # 檢查和創建 Excel 文件
-def check_create_excel():
-    if not os.path.exists('video_detail.xlsx'):
-        with pd.ExcelWriter('video_detail.xlsx') as writer:
-            pd.DataFrame(columns=['TV Show Title', 'TV Show Description']).to_excel(writer, sheet_name='Title', index=False)
-            pd.DataFrame(columns=['Season Name', 'Season Number', 'Season Description']).to_excel(writer, sheet_name='Seasons', index=False)
-            pd.DataFrame(columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description']).to_excel(writer, sheet_name='Episodes', index=False)
-            pd.DataFrame(columns=['Movie Title', 'Movie Description']).to_excel(writer, sheet_name='Movies', index=False)
-    return pd.ExcelFile('video_detail.xlsx')
-
-# 清空 Excel 文件中的數據，但保留欄位
-def clear_excel():
-    with pd.ExcelWriter('video_detail.xlsx') as writer:
-        pd.DataFrame(columns=['TV Show Title', 'TV Show Description']).to_excel(writer, sheet_name='Title', index=False)
-        pd.DataFrame(columns=['Season Name', 'Season Number', 'Season Description']).to_excel(writer, sheet_name='Seasons', index=False)
-        pd.DataFrame(columns=['Season Number', 'Episode Number', 'Episode Title', 'Episode Description']).to_excel(writer, sheet_name='Episodes', index=False)
-        pd.DataFrame(columns=['Movie Title', 'Movie Description']).to_excel(writer, sheet_name='Movies', index=False)
+def check_create_excel(excel_path='video_detail.xlsx'):
+    from others.excel_export import save_video_detail
+    if not os.path.exists(excel_path):
+        save_video_detail(VideoDetail(), excel_path)
 
 def load_configs():
     if os.path.exists('configs.json'):
@@ -72,15 +70,480 @@ def get_disneyplus_credentials(configs):
         disneyplus_password = configs['disneyplus_password']
     return disneyplus_email, disneyplus_password
 
-def main():
-    driver = None
-    tmdb_uploader = None
-    disneyplus_logged_in = False
+# 流水線模式最多等待上載的項目數量
+PIPELINE_MAX_PENDING = 2
+
+# configs.json 的 "extraction_cache" 設為 false 可以停用抓取暫存
+# "extraction_cache_ttl_hours" 為有效時間 (預設 24 小時)，"extraction_cache_max_mb" 為大小上限 (預設 50 MB)
+def open_extraction_cache(configs):
+    db_path = configs.get('extraction_cache', 'extraction_cache.db')
+    if not db_path:
+        return None
+    return ExtractionCache(db_path, ttl=configs.get('extraction_cache_ttl_hours', 24) * 3600,
+                           max_bytes=configs.get('extraction_cache_max_mb', 50) * 1024 * 1024)
+
+# configs.json 的 "tmdb_rate_limit" 為 AdaptiveRateLimiter 的設定，例如 {"rate": 1, "max_rate": 3}，設為 false 可以停用
+def open_rate_limiter(configs):
+    settings = configs.get('tmdb_rate_limit', {})
+    if settings is False:
+        return None
+    return AdaptiveRateLimiter(**(settings or {}))
+
+# 每個 worker 擁有自己的 Chrome driver 以及 TMDB / Disney+ 登入狀態
+# options 為命令列參數 (見 parse_args)
+class ImportWorker:
+    # prefetched 為批次模式預先用 HTTP 抓取的 Netflix 資料 {影音網址: VideoDetail 或 None}
+    # rate_limiter 為批次模式各 worker 共用的 TMDB 提交速率限制，沒有提供時使用自己的
+    def __init__(self, configs, options=None, tmdb_credentials=None, disneyplus_credentials=None, prefetched=None, rate_limiter=None):
+        self.configs = configs
+        self.options = options or parse_args([])
+        self.prefetched = prefetched if prefetched is not None else {}
+        # 'http' 先直接取得 Netflix 頁面，失敗才用 Chrome；'browser' 只用 Chrome
+        self.netflix_fetch = self.options.netflix_fetch or configs.get('netflix_fetch', 'http')
+        # 'browser' 用 Chrome 填寫表單，'http' 直接提交表單
+        self.tmdb_backend = self.options.tmdb_backend or configs.get('tmdb_backend', 'browser')
+        self.tmdb_credentials = tmdb_credentials
+        self.disneyplus_credentials = disneyplus_credentials
+        self.driver = None
+        self.tmdb_uploader = None
+        self.rate_limiter = rate_limiter
+        # 為 True 時上載使用自己的 Chrome，不和抓取共用 (見 UploadPipeline)
+        self.separate_upload_driver = False
+        self.catalog = None
+        self.extraction_cache = None
+        self.session_store = None
+        self.disneyplus_logged_in = False
+        # 已還原或保存過登入狀態的網站
+        self.restored_sites = set()
+        # 第一次需要 Chrome 時才載入 (見 get_browser_profile)
+        self.browser_profile = None
+
+    def get_catalog(self):
+        if self.catalog is None:
+            from others.catalog_store import CatalogStore
+            self.catalog = CatalogStore(self.configs.get('catalog_path', 'catalog.db'))
+        return self.catalog
+
+    # 從資料庫讀取，格式為 catalog:平台:影片ID 或 catalog:影片ID
+    def load_from_catalog(self, catalog_ref):
+        parts = catalog_ref.split(':', 2)[1:]
+        platform, video_id = (parts[0], parts[1]) if len(parts) == 2 else (None, parts[0])
+        matches = self.get_catalog().find(video_id, platform)
+        if not matches:
+            raise KeyError(f"資料庫內沒有 {catalog_ref[len('catalog:'):]} 的資料")
+        return self.get_catalog().load(*matches[0])
+
+    # configs.json 的 "session_store" 設為 false 可以停用
+    def get_session_store(self):
+        if self.session_store is None and self.configs.get('session_store', 'sessions.json'):
+            self.session_store = SessionStore(self.configs.get('session_store', 'sessions.json'), reuse_saved=not self.options.fresh_login)
+        return self.session_store
+
+    # 還原保存的登入狀態，再以 is_logged_in(driver) 確認仍然有效
+    def restore_session(self, driver, site, is_logged_in):
+        session_store = self.get_session_store()
+        if session_store is None or not session_store.restore(driver, site):
+            return False
+        if is_logged_in(driver):
+            logging.info(f"已使用保存的 {site} 登入狀態")
+            return True
+        logging.info(f"保存的 {site} 登入狀態已失效，重新登入")
+        session_store.forget(site)
+        return False
+
+    def get_browser_profile(self):
+        if self.browser_profile is None:
+            from others.browser_profile import load_browser_profile
+            from others.wait_utils import configure_timeouts
+            self.browser_profile = load_browser_profile(self.configs)
+            if self.options.headless:
+                self.browser_profile['headless'] = True
+            configure_timeouts(self.configs.get('wait_timeouts'))
+        return self.browser_profile
+
+    def create_driver(self, capture_network=None):
+        from others.browser_profile import create_driver
+        return create_driver(self.get_browser_profile(), capture_network)
+
+    def get_driver(self):
+        if self.driver is None:
+            self.driver = self.create_driver()
+        return self.driver
+
+    # driver 為 None 時會開啟新的 Chrome (分流上載的額外 session 使用)
+    def create_tmdb_uploader(self, driver=None):
+        if self.tmdb_credentials is None:
+            self.tmdb_credentials = get_tmdb_credentials(self.configs)
+        tmdb_username, tmdb_password = self.tmdb_credentials
+        ledger = UploadLedger(self.configs.get('upload_ledger', 'upload_ledger.db'), skip_unchanged=not self.options.force_upload)
+        if self.tmdb_backend == 'http':
+            from importors.tmdb_http_uploader import TMDBHttpUploader
+            uploader = TMDBHttpUploader(tmdb_username, tmdb_password, ledger, session_store=self.get_session_store(),
+                                        compare_with_tmdb=not self.options.force_upload)
+        else:
+            from importors.tmdb_uploader import TMDBUploader
+            # 只用來上載的 Chrome 不會讀取網絡記錄，不需要開啟
+            uploader = TMDBUploader(driver or self.create_driver(capture_network=False), tmdb_username, tmdb_password, ledger, session_store=self.get_session_store(),
+                                    compare_with_tmdb=not self.options.force_upload)
+        uploader.rate_limiter = self.get_rate_limiter()
+        return uploader
+
+    # 同一個 worker 的所有 TMDB session (包括分流上載的額外 session) 共用同一個 limiter
+    def get_rate_limiter(self):
+        if self.rate_limiter is None:
+            self.rate_limiter = open_rate_limiter(self.configs)
+        return self.rate_limiter
+
+    def upload(self, tmdb_url, detail):
+        if self.tmdb_uploader is None:
+            with METRICS.phase('tmdb_login'):
+                # 流水線模式下上載用另一個 Chrome，抓取的 Chrome 可以同時處理下一套影音
+                if self.tmdb_backend == 'http' or self.separate_upload_driver:
+                    self.tmdb_uploader = self.create_tmdb_uploader(None)
+                else:
+                    self.tmdb_uploader = self.create_tmdb_uploader(self.get_driver())
+        is_movie = "/movie/" in tmdb_url
+        journal = self.open_journal(tmdb_url)
+        self.tmdb_uploader.journal = journal
+        try:
+            with METRICS.phase('upload'):
+                if not is_movie and self.options.tmdb_sessions > 1:
+                    from importors.sharded_uploader import upload_series_sharded
+                    results = upload_series_sharded(self.tmdb_uploader, tmdb_url, detail, self.create_tmdb_uploader, self.options.tmdb_sessions)
+                else:
+                    results = self.tmdb_uploader.upload_to_tmdb(tmdb_url, detail, is_movie)
+        finally:
+            self.tmdb_uploader.journal = None
+            log_failed_entries(journal)
+            journal.close()
+        print_upload_summary(results, self.tmdb_uploader.rate_limiter)
+        return results
+
+    # 每個 TMDB 網址一個上載記錄，--resume 時會跳過記錄內已成功提交的項目
+    def open_journal(self, tmdb_url):
+        path = journal_path(self.configs.get('upload_journal_dir', 'upload_journal'), tmdb_url)
+        journal = UploadJournal(path, resume=self.options.resume)
+        if self.options.resume and journal.completed_count():
+            logging.info(f"從 {path} 繼續上載，已完成的 {journal.completed_count()} 項會跳過")
+        return journal
+
+    def get_extraction_cache(self):
+        if self.extraction_cache is None:
+            self.extraction_cache = open_extraction_cache(self.configs)
+        return self.extraction_cache
+
+    # 暫存內有未過期的抓取結果時直接使用 (不會開啟瀏覽器)，--refresh 時一定重新抓取
+    def extract(self, video_url):
+        video_key = identify_video(video_url)
+        cache = self.get_extraction_cache() if video_key else None
+        if cache and not self.options.refresh:
+            detail = cache.get(*video_key)
+            if detail is not None:
+                logging.info(f"使用暫存的抓取結果: {video_url}")
+                METRICS.count('extraction_cache_hits')
+                return detail
+        detail = self.scrape(video_url)
+        # 不完整的結果 (例如抓取集數時超時) 不會暫存，修正後再次執行會重新抓取
+        if cache and detail.is_complete():
+            cache.put(*video_key, detail)
+        elif cache:
+            logging.warning(f"抓取結果不完整，不會暫存: {video_url}")
+        return detail
+
+    # 按 extractors.registry 找出負責的 extractor，平台有 scrape_<平台> 方法時由該方法處理登入等步驟
+    def scrape(self, video_url):
+        entry = find_extractor(video_url)
+        if entry is None:
+            logging.error(f"不支援的影音網站: {video_url}")
+            return VideoDetail()
+        extractor = entry.load()
+        platform_scrape = getattr(self, f"scrape_{entry.platform}", None)
+        if platform_scrape is not None:
+            return platform_scrape(video_url, extractor)
+        return extractor(self.get_driver(), video_url)
+
+    def scrape_netflix(self, video_url, extractor):
+        if self.netflix_fetch == 'http':
+            if video_url in self.prefetched:
+                detail = self.prefetched.pop(video_url)
+            else:
+                from extractors.netflix_http import extract_netflix_episodes_http
+                detail = extract_netflix_episodes_http(video_url)
+            if detail is not None:
+                return detail
+        return extractor(self.get_driver(), video_url)
+
+    def scrape_disneyplus(self, video_url, extractor):
+        from extractors.disneyplus_extractor import login_to_disneyplus, check_disneyplus_login
+        driver = self.get_driver()
+        if not self.disneyplus_logged_in:
+            if not self.restore_session(driver, 'disneyplus', check_disneyplus_login):
+                if self.disneyplus_credentials is None:
+                    self.disneyplus_credentials = get_disneyplus_credentials(self.configs)
+                disneyplus_email, disneyplus_password = self.disneyplus_credentials
+                login_to_disneyplus(driver, disneyplus_email, disneyplus_password)
+                if self.get_session_store():
+                    self.get_session_store().save(driver, 'disneyplus')
+            self.disneyplus_logged_in = True
+        return extractor(driver, video_url)
+
+    def scrape_primevideo(self, video_url, extractor):
+        # Prime Video 不需要登入，只保存語言設定的 cookie，不用每次重新切換語言
+        driver = self.get_driver()
+        session_store = self.get_session_store()
+        first_visit = 'primevideo' not in self.restored_sites
+        if session_store and first_visit:
+            session_store.restore(driver, 'primevideo')
+        detail = extractor(driver, video_url)
+        if session_store and first_visit:
+            session_store.save(driver, 'primevideo')
+            self.restored_sites.add('primevideo')
+        return detail
+
+    # 沒有 TMDB 網址或設定了 export_excel 時，才會將資料寫成 Excel 讓用家修改
+    # pipeline 不為 None 時，上載會交給 UploadPipeline 在背景進行，不用等待上載完成
+    def process(self, video_url, tmdb_url, excel_path='video_detail.xlsx', pipeline=None):
+        label = video_url if video_url.lower() != 'excel' else f"excel:{excel_path}"
+        # 之後各階段的耗時都歸入這個項目
+        with METRICS.title(label):
+            detail = self.prepare(video_url, tmdb_url, excel_path)
+            # 處理 TMDB 上傳
+            if tmdb_url and pipeline is None:
+                self.upload(tmdb_url, detail)
+        if tmdb_url and pipeline is not None:
+            # 帳號資料要在主線程詢問用戶
+            if self.tmdb_credentials is None:
+                self.tmdb_credentials = get_tmdb_credentials(self.configs)
+            pipeline.submit(label, tmdb_url, detail)
+
+    # 取得要上載的資料 (抓取、讀取資料庫或 Excel)，沒有 TMDB 網址的 'excel' 只會建立 Excel 並返回 None
+    def prepare(self, video_url, tmdb_url, excel_path='video_detail.xlsx'):
+        from others.excel_export import load_video_detail, save_video_detail
+        from others.analysis_excel import process_video_detail
+        # 如果用戶輸入 'excel'，直接上傳現有 Excel 資料到 TMDB
+        if video_url.lower() == 'excel':
+            # 檢查和創建 Excel 文件
+            check_create_excel(excel_path)
+            return load_video_detail(excel_path) if tmdb_url else None
+
+        if video_url.lower().startswith('catalog:'):
+            # 使用資料庫內之前抓取的資料
+            detail = self.load_from_catalog(video_url)
+        else:
+            # 處理 Video URL
+            with METRICS.phase('extract'):
+                detail = process_video_detail(self.extract(video_url))
+            video_key = identify_video(video_url)
+            if video_key and detail.is_complete():
+                platform, video_id, locale = video_key
+                with METRICS.phase('catalog_save'):
+                    self.get_catalog().save(platform, video_id, locale, detail, video_url)
+
+        if not tmdb_url or self.options.export_excel:
+            save_video_detail(detail, excel_path)
+        return detail
+
+    def quit(self):
+        if self.catalog:
+            self.catalog.close()
+            self.catalog = None
+        if self.extraction_cache:
+            self.extraction_cache.close()
+            self.extraction_cache = None
+        if self.tmdb_uploader and (self.tmdb_backend == 'http' or self.tmdb_uploader.driver is not self.driver):
+            self.tmdb_uploader.close()
+        elif self.tmdb_uploader and self.tmdb_uploader.ledger:
+            self.tmdb_uploader.ledger.close()
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+# 互動模式的抓取/上載流水線：主線程抓取下一套影音的同時，背景線程用另一個 Chrome (或 HTTP session) 上載上一套
+# 佇列最多存放 max_pending 套等待上載的資料，上載追不上時 submit 會等待，不會累積太多未上載的資料
+class UploadPipeline:
+    def __init__(self, worker, max_pending=PIPELINE_MAX_PENDING):
+        self.worker = worker
+        worker.separate_upload_driver = True
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self.run, name='uploader', daemon=True)
+        self.thread.start()
+
+    def submit(self, label, tmdb_url, detail):
+        if self.queue.full():
+            print("等待之前的項目上載完成...")
+        self.queue.put((label, tmdb_url, detail))
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                label, tmdb_url, detail = job
+                with METRICS.title(label):
+                    try:
+                        self.worker.upload(tmdb_url, detail)
+                        print(f"已完成上載: {label}")
+                    except Exception as e:
+                        logging.error(f"上載 {label} 時發生錯誤: {e}")
+            finally:
+                self.queue.task_done()
+
+    # 等待所有已提交的項目上載完成
+    def close(self):
+        if not self.queue.empty():
+            print("等待上載完成...")
+        self.queue.put(None)
+        self.thread.join()
+
+# 讀取批次工作檔，每行一個「影音網址 TMDB網址」(以空格、Tab 或逗號分隔)，TMDB 網址可留空，# 開頭為註解
+def load_batch_jobs(queue_path):
+    jobs = []
+    with open(queue_path, 'r', encoding='utf-8') as queue_file:
+        for line in queue_file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = [part for part in re.split(r'[\s,]+', line) if part]
+            video_url = parts[0]
+            tmdb_url = parts[1] if len(parts) > 1 else ""
+            if tmdb_url and "themoviedb.org" not in tmdb_url:
+                logging.warning(f"忽略無效的 TMDB 網址: {tmdb_url}")
+                tmdb_url = ""
+            jobs.append((video_url, tmdb_url))
+    return jobs
+
+# 每套影音上載完成後顯示總結 (見 importors.sharded_uploader.summarize_results)
+def print_upload_summary(results, rate_limiter=None):
+    from importors.sharded_uploader import summarize_results
+    for line in summarize_results(results, rate_limiter):
+        print(line)
+
+def print_batch_summary(results):
+    print("\n批次處理結果:")
+    print(f"{'#':>4}  {'狀態':<4}  {'耗時(秒)':>8}  影音網址 / 錯誤")
+    for result in results:
+        status = "成功" if result['ok'] else "失敗"
+        print(f"{result['index']:>4}  {status:<4}  {result['elapsed']:>8.1f}  {result['video_url']}")
+        if result['error']:
+            print(f"{'':>26}{result['error']}")
+    succeeded = sum(1 for result in results if result['ok'])
+    print(f"共 {len(results)} 個項目，成功 {succeeded} 個，失敗 {len(results) - succeeded} 個")
+
+def run_batch(options):
     configs = load_configs()
+    jobs = load_batch_jobs(options.batch)
+    if not jobs:
+        print(f"{options.batch} 沒有任何工作")
+        return []
+    output_dir = options.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 需要輸入的帳號資料先在主線程取得，worker 不會再詢問用戶
+    tmdb_credentials = None
+    if any(tmdb_url for _, tmdb_url in jobs):
+        tmdb_credentials = get_tmdb_credentials(configs)
+    # 和單一網址模式一樣按 extractors.registry 判斷平台
+    platforms = {video_url: getattr(find_extractor(video_url), 'platform', None) for video_url, _ in jobs}
+    disneyplus_credentials = None
+    if 'disneyplus' in platforms.values():
+        disneyplus_credentials = get_disneyplus_credentials(configs)
+
+    # Netflix 標題頁不需要瀏覽器，先一次過用 HTTP 同時取得
+    prefetched = {}
+    netflix_urls = [video_url for video_url, _ in jobs if platforms[video_url] == 'netflix']
+    cache = open_extraction_cache(configs) if netflix_urls and not options.refresh else None
+    if cache:
+        # 暫存內已有的不用再取得
+        netflix_urls = [video_url for video_url in netflix_urls
+                        if not (identify_video(video_url) and cache.get(*identify_video(video_url)))]
+        cache.close()
+    if netflix_urls and (options.netflix_fetch or configs.get('netflix_fetch', 'http')) == 'http':
+        from extractors.netflix_http import extract_netflix_titles_http
+        prefetched = extract_netflix_titles_http(netflix_urls)
+
+    # 各 worker 使用同一個 TMDB 帳戶，提交速率一起計算
+    rate_limiter = open_rate_limiter(configs)
+
+    local = threading.local()
+    all_workers = []
+    workers_lock = threading.Lock()
+
+    def get_worker():
+        if not hasattr(local, 'worker'):
+            local.worker = ImportWorker(configs, options, tmdb_credentials, disneyplus_credentials, prefetched, rate_limiter)
+            with workers_lock:
+                all_workers.append(local.worker)
+        return local.worker
+
+    def run_job(index, video_url, tmdb_url):
+        excel_path = os.path.join(output_dir, f"video_detail_{index:03d}.xlsx")
+        start_time = time.monotonic()
+        error = ""
+        try:
+            get_worker().process(video_url, tmdb_url, excel_path)
+        except Exception as e:
+            logging.error(f"第 {index} 個項目發生錯誤: {e}")
+            error = str(e)
+        return {'index': index, 'video_url': video_url, 'tmdb_url': tmdb_url, 'excel_path': excel_path,
+                'ok': not error, 'error': error, 'elapsed': time.monotonic() - start_time}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, options.workers)) as executor:
+            futures = [executor.submit(run_job, index, video_url, tmdb_url)
+                       for index, (video_url, tmdb_url) in enumerate(jobs, start=1)]
+            results = [future.result() for future in futures]
+    finally:
+        for worker in all_workers:
+            worker.quit()
+
+    print_batch_summary(results)
+    METRICS.print_summary()
+    export_metrics(options.metrics_dir)
+    return results
+
+# 目錄工作簿模式：按 Titles 工作表的次序逐套影音上載到 TMDB，沒有 TMDB URL 的影音會略過
+def run_workbook(options):
+    from others.excel_export import load_catalog_workbook
+    titles = []
+    for title_key, tmdb_url, detail in load_catalog_workbook(options.workbook):
+        if tmdb_url and "themoviedb.org" not in tmdb_url:
+            logging.warning(f"忽略 {title_key} 無效的 TMDB 網址: {tmdb_url}")
+        elif tmdb_url:
+            titles.append((title_key, tmdb_url, detail))
+    if not titles:
+        print(f"{options.workbook} 沒有任何需要上載的影音")
+        return []
+
+    worker = ImportWorker(load_configs(), options)
+    results = []
+    try:
+        for index, (title_key, tmdb_url, detail) in enumerate(titles, start=1):
+            start_time = time.monotonic()
+            error = ""
+            with METRICS.title(title_key):
+                try:
+                    worker.upload(tmdb_url, detail)
+                except Exception as e:
+                    logging.error(f"{title_key} 發生錯誤: {e}")
+                    error = str(e)
+            results.append({'index': index, 'video_url': title_key, 'tmdb_url': tmdb_url, 'excel_path': options.workbook,
+                            'ok': not error, 'error': error, 'elapsed': time.monotonic() - start_time})
+    finally:
+        worker.quit()
+
+    print_batch_summary(results)
+    METRICS.print_summary()
+    export_metrics(options.metrics_dir)
+    return results
+
+def main(options=None):
+    worker = ImportWorker(load_configs(), options)
+    pipeline = UploadPipeline(worker) if worker.options.pipeline else None
 
     while True:
         # 問詢用戶輸入
-        video_url = input("請輸入 Video site 的 URL 或 'excel': ")
+        video_url = input("請輸入 Video site 的 URL、'excel' 或 'catalog:平台:影片ID': ")
         
         while True:
             tmdb_url = input("請輸入 TMDB 的 URL (可留空): ")
@@ -89,53 +552,9 @@ def main():
             else:
                 print("只可以輸入 TMDB 的網址或直接按 enter。請重新輸入。")
 
-        if driver is None:
-            options = webdriver.ChromeOptions()
-            options.add_argument('--log-level=3')  # 隱藏所有的 INFO 以下日誌信息
-            driver = webdriver.Chrome(options=options)
-
         while True:
             try:
-                # 檢查和創建 Excel 文件
-                check_create_excel()
-
-                # 如果用戶輸入 'excel'，直接上傳現有 Excel 資料到 TMDB
-                if video_url.lower() == 'excel':
-                    if tmdb_url:
-                        tmdb_username, tmdb_password = get_tmdb_credentials(configs)
-                        if tmdb_uploader is None:
-                            tmdb_uploader = TMDBUploader(driver, tmdb_username, tmdb_password)
-                        is_movie = "/movie/" in tmdb_url
-                        tmdb_uploader.upload_to_tmdb(tmdb_url, 'video_detail.xlsx', is_movie)
-                else:
-                    # 清空 Excel 文件中的數據
-                    clear_excel()
-
-                    # 處理 Video URL
-                    if "netflix.com" in video_url:
-                        extract_netflix_episodes(driver, video_url, 'video_detail.xlsx')
-                    elif "tv.apple.com" in video_url:
-                        extract_appletv_data(driver, video_url, 'video_detail.xlsx')
-                    elif "disneyplus.com" in video_url:
-                        disneyplus_email, disneyplus_password = get_disneyplus_credentials(configs)
-                        if not disneyplus_logged_in:
-                            login_to_disneyplus(driver, disneyplus_email, disneyplus_password)
-                            disneyplus_logged_in = True
-                        extract_disneyplus_data(driver, video_url, 'video_detail.xlsx')
-                    elif "primevideo.com" in video_url:
-                        extract_primevideo_data(driver, video_url, 'video_detail.xlsx')
-                    
-                    # 確保文件存在並有數據
-                    if os.path.exists('video_detail.xlsx'):
-                        process_excel('video_detail.xlsx', 'video_detail.xlsx')
-
-                    # 處理 TMDB 上傳
-                    if tmdb_url:
-                        tmdb_username, tmdb_password = get_tmdb_credentials(configs)
-                        if tmdb_uploader is None:
-                            tmdb_uploader = TMDBUploader(driver, tmdb_username, tmdb_password)
-                        is_movie = "/movie/" in tmdb_url
-                        tmdb_uploader.upload_to_tmdb(tmdb_url, 'video_detail.xlsx', is_movie)
+                worker.process(video_url, tmdb_url, pipeline=pipeline)
                 break
             except PermissionError as e:
                 logging.error(f"發生錯誤: {e}")
@@ -147,9 +566,38 @@ def main():
 
         continue_use = input("是否繼續? (y/n): ")
         if continue_use.lower() == 'n':
-            if driver:
-                driver.quit()
+            if pipeline:
+                pipeline.close()
+            worker.quit()
             break
 
+    METRICS.print_summary()
+    export_metrics(worker.options.metrics_dir)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="將影音網站的資料上載到 TMDB")
+    parser.add_argument('--batch', metavar='QUEUE_FILE', help="批次模式：讀取工作檔內的影音網址及 TMDB 網址，不需逐一輸入")
+    parser.add_argument('--workbook', metavar='CATALOG_XLSX', help="目錄工作簿模式：將工作簿內有 TMDB URL 的所有影音逐套上載 (見 others.excel_export.save_catalog_workbook)")
+    parser.add_argument('--workers', type=int, default=2, help="批次模式同時運行的 Chrome 數量 (預設 2)")
+    parser.add_argument('--output-dir', default='batch_output', help="批次模式每個項目的 Excel 存放位置 (預設 batch_output)")
+    parser.add_argument('--pipeline', action='store_true', help="互動模式上載到 TMDB 時，同時抓取下一套影音 (上載使用另一個 Chrome)")
+    parser.add_argument('--tmdb-sessions', type=int, default=1, help="上載劇集時同時登入 TMDB 的 session 數量 (最多 4 個，預設 1)")
+    parser.add_argument('--force-upload', action='store_true', help="即使內容和上次上載或 TMDB 現有的資料相同也重新上載到 TMDB")
+    parser.add_argument('--resume', action='store_true', help="從上次中斷或失敗的項目繼續上載，跳過 upload_journal 內已成功提交的編輯頁面")
+    parser.add_argument('--tmdb-backend', choices=['browser', 'http'], help="TMDB 上載方式：browser 用 Chrome 填寫表單，http 直接提交表單 (預設讀取 configs.json 的 tmdb_backend，否則為 browser)")
+    parser.add_argument('--refresh', action='store_true', help="不使用暫存的抓取結果，重新從影音網站抓取 (抓取後仍會更新暫存)")
+    parser.add_argument('--export-excel', action='store_true', help="上載到 TMDB 時同時將資料寫成 Excel (沒有輸入 TMDB 網址時一定會寫成 Excel)")
+    parser.add_argument('--headless', action='store_true', help="不顯示 Chrome 視窗 (亦可在 configs.json 的 browser 設定)")
+    parser.add_argument('--fresh-login', action='store_true', help="不使用 sessions.json 保存的登入狀態，重新登入各網站 (登入後仍會保存)")
+    parser.add_argument('--metrics-dir', default='metrics', help="每次執行各階段耗時的記錄 (JSON lines 及 Chrome trace) 存放位置，設為空字串即不保存 (預設 metrics)")
+    parser.add_argument('--netflix-fetch', choices=['http', 'browser'], help="Netflix 抓取方式：http 直接取得頁面 (失敗時改用 Chrome)，browser 只用 Chrome (預設讀取 configs.json 的 netflix_fetch，否則為 http)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.batch:
+        run_batch(args)
+    elif args.workbook:
+        run_workbook(args)
+    else:
+        main(args)